@@ -30,14 +30,14 @@ Usage:
                                     there is no need to escape characters (double slashes not necessary)
 
 Requirements:
-    Matching and inserting meta data from files requires the ffmpeg-python and filetype packages.
+    Matching and inserting meta data from files requires the filetype package. Common image, audio and video files are read
+    directly, any other meta data is read using ffprobe (part of FFmpeg) which must be installed and found in PATH.
     Also in order to read and write a larger variety of linked files, chardet is required to detect file encodings.
     These are optional features.
-    - https://github.com/kkroening/ffmpeg-python
     - https://github.com/h2non/filetype.py
+    - https://ffmpeg.org/download.html
     - https://github.com/chardet/chardet
     - Install Via Pip:
-        pip install ffmpeg-python
         pip install filetype
         pip install chardet
 
@@ -82,26 +82,43 @@ try:
     chardet_installed = True
 except ModuleNotFoundError:
     chardet_installed = False
+from array import array
+from bisect import bisect_left
+import codecs
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from datetime import timedelta
-try:
-    import ffmpeg
-    ffmpeg_installed = True
-except ModuleNotFoundError:
-    ffmpeg_installed = False
+from functools import lru_cache
 try:
     import filetype
     filetype_installed = True
 except ModuleNotFoundError:
     filetype_installed = False
+import hashlib
+import io
 import json
 import math
 import mimetypes
+try:
+    import numpy
+    numpy_installed = True
+except ModuleNotFoundError:
+    numpy_installed = False
 from pathlib import Path, PurePath
 import os
 import random
 import re
+try:
+    from re import _parser as regex_parser # Python 3.11+
+except ImportError:
+    import sre_parse as regex_parser
 import shutil
+ffprobe_installed = shutil.which('ffprobe') != None # Part of FFmpeg, a program not a package
+import sqlite3
+from stat import S_ISDIR, S_ISREG
+import struct
+import subprocess
 import sys
 if sys.platform == "linux" or sys.platform == "linux2":
     print('Linux')
@@ -134,6 +151,7 @@ IDENTICAL_FILE_NAMES = 9# Find identical file names (to those already renamed) i
                         ## TODO: update linked files for identical files too?
 INCLUDE_SUB_DIRS = 10   # When a directory (folder) is dropped and searched through also search any sub-directories as well for files to rename.
 PRESORT_FILES = 11      # Before renaming any group of files, sort them using the file's meta data.
+COMPILED_PRESET = 98    # Internal use only, do not use.
 TRACKED_DATA = 99       # Internal use only, do not use.
 
 ### EDIT_TYPE Options
@@ -188,6 +206,7 @@ OVERWRITE_ALL = 2
 
 # Basic Constants
 ALL = 999
+ESTIMATE = 998
 NONE = -1
 NO = -1
 NO_LIMIT = -1
@@ -244,6 +263,38 @@ FILE_META_AUDIO_YEAR = 22           # YEAR : Number
 FILE_META_AUDIO_GENRE = 23          # DATA : 'Text'
 FILE_META_AUDIO_PUBLISHER = 24      # DATA : 'Text'
 FILE_META_AUDIO_TRACK = 25          # DATA : Number
+FILE_META_DATE_TAKEN = 26           # YEAR/MONTH/... : Number  (Images with EXIF data only)
+
+### Extra file meta data is read in groups, each by a different extractor, so only what's needed is read.
+META_EXTRACTOR_TYPE = 0     # FILE_META_TYPE, FILE_META_MIME
+META_EXTRACTOR_STREAM = 1   # FILE_META_FORMAT to FILE_META_VIDEO_FRAME_RATE
+META_EXTRACTOR_AUDIO = 2    # FILE_META_AUDIO_BITRATE to FILE_META_AUDIO_CHANNEL_LAYOUT
+META_EXTRACTOR_TAGS = 3     # FILE_META_AUDIO_TITLE to FILE_META_AUDIO_TRACK
+META_EXTRACTOR_EXIF = 4     # FILE_META_DATE_TAKEN
+META_EXTRACTORS = {
+    FILE_META_TYPE : META_EXTRACTOR_TYPE,
+    FILE_META_MIME : META_EXTRACTOR_TYPE,
+    FILE_META_FORMAT : META_EXTRACTOR_STREAM,
+    FILE_META_FORMAT_LONG : META_EXTRACTOR_STREAM,
+    FILE_META_HEIGHT : META_EXTRACTOR_STREAM,
+    FILE_META_WIDTH : META_EXTRACTOR_STREAM,
+    FILE_META_LENGTH : META_EXTRACTOR_STREAM,
+    FILE_META_BIT_DEPTH : META_EXTRACTOR_STREAM,
+    FILE_META_VIDEO_BITRATE : META_EXTRACTOR_STREAM,
+    FILE_META_VIDEO_FRAME_RATE : META_EXTRACTOR_STREAM,
+    FILE_META_AUDIO_BITRATE : META_EXTRACTOR_AUDIO,
+    FILE_META_AUDIO_SAMPLE_RATE : META_EXTRACTOR_AUDIO,
+    FILE_META_AUDIO_CHANNELS : META_EXTRACTOR_AUDIO,
+    FILE_META_AUDIO_CHANNEL_LAYOUT : META_EXTRACTOR_AUDIO,
+    FILE_META_AUDIO_TITLE : META_EXTRACTOR_TAGS,
+    FILE_META_AUDIO_ALBUM : META_EXTRACTOR_TAGS,
+    FILE_META_AUDIO_ARTIST : META_EXTRACTOR_TAGS,
+    FILE_META_AUDIO_YEAR : META_EXTRACTOR_TAGS,
+    FILE_META_AUDIO_GENRE : META_EXTRACTOR_TAGS,
+    FILE_META_AUDIO_PUBLISHER : META_EXTRACTOR_TAGS,
+    FILE_META_AUDIO_TRACK : META_EXTRACTOR_TAGS,
+    FILE_META_DATE_TAKEN : META_EXTRACTOR_EXIF
+}
 
 ### META_MATCH
 EXACT_MATCH = 50        # An exact perfect match of a entire piece of text or number.
@@ -275,6 +326,40 @@ TYPE_VIDEO = 110        # Some examples files: .flv .mp4 .mpeg
 TYPE_ARCHIVE = 101      # Some examples files: .7z .rar .zip
 TYPE_DOCUMENT = 103     # Some examples files: .doc .potx .xlsx
 
+ARCHIVE_MIMES = frozenset(['application/x-7z-compressed','application/x-unix-archive','application/x-bzip2','application/vnd.ms-cab-compressed',
+                           'application/x-google-chrome-extension','application/dicom','application/vnd.debian.binary-package','application/x-executable',
+                           'application/octet-stream','application/epub+zip','application/vnd.microsoft.portable-executable','application/gzip',
+                           'application/x-iso9660-image','application/x-lzip','application/x-nintendo-nes-rom','application/pdf','application/postscript',
+                           'application/vnd.rar','application/x-rpm','application/rtf','application/vnd.sqlite3','application/x-shockwave-flash',
+                           'application/x-tar','application/x-xz','application/x-compress','application/zip','application/zstd','application/x-zip-compressed'])
+DOCUMENT_MIMES = frozenset(['application/msword','application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'application/vnd.ms-powerpoint',
+                            'application/vnd.openxmlformats-officedocument.presentationml.presentation', 'application/vnd.ms-excel',
+                            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'])
+
+### Video codecs (MP4 sample entry type or Matroska codec ID to ffprobe format names)
+VIDEO_CODECS = { b'avc1' : ('h264', 'H.264 / AVC / MPEG-4 AVC / MPEG-4 part 10'), b'avc3' : ('h264', 'H.264 / AVC / MPEG-4 AVC / MPEG-4 part 10'),
+                 b'hvc1' : ('hevc', 'H.265 / HEVC (High Efficiency Video Coding)'), b'hev1' : ('hevc', 'H.265 / HEVC (High Efficiency Video Coding)'),
+                 b'mp4v' : ('mpeg4', 'MPEG-4 part 2'), b'av01' : ('av1', 'Alliance for Open Media AV1'), b'vp09' : ('vp9', 'Google VP9'),
+                 b'vp08' : ('vp8', 'On2 VP8'), b'jpeg' : ('mjpeg', 'Motion JPEG'),
+                 'V_MPEG4/ISO/AVC' : ('h264', 'H.264 / AVC / MPEG-4 AVC / MPEG-4 part 10'),
+                 'V_MPEGH/ISO/HEVC' : ('hevc', 'H.265 / HEVC (High Efficiency Video Coding)'), 'V_MPEG4/ISO/ASP' : ('mpeg4', 'MPEG-4 part 2'),
+                 'V_MPEG4/ISO/SP' : ('mpeg4', 'MPEG-4 part 2'), 'V_MPEG2' : ('mpeg2video', 'MPEG-2 video'),
+                 'V_AV1' : ('av1', 'Alliance for Open Media AV1'), 'V_VP9' : ('vp9', 'Google VP9'), 'V_VP8' : ('vp8', 'On2 VP8'),
+                 'V_MJPEG' : ('mjpeg', 'Motion JPEG'), 'V_THEORA' : ('theora', 'Theora') }
+
+### Audio tags (ID3v2 frame ID to ffprobe tag name)
+ID3V2_FRAME_TAGS = { b'TIT2' : 'title', b'TALB' : 'album', b'TPE1' : 'artist', b'TPE2' : 'album_artist', b'TDRC' : 'date',
+                     b'TYER' : 'date', b'TCON' : 'genre', b'TPUB' : 'publisher', b'TRCK' : 'track' }
+ID3V2_2_FRAME_TAGS = { b'TT2' : 'title', b'TAL' : 'album', b'TP1' : 'artist', b'TP2' : 'album_artist', b'TYE' : 'date',
+                       b'TCO' : 'genre', b'TPB' : 'publisher', b'TRK' : 'track' }
+ID3V1_GENRES = ('Blues','Classic Rock','Country','Dance','Disco','Funk','Grunge','Hip-Hop','Jazz','Metal','New Age','Oldies','Other','Pop',
+                'R&B','Rap','Reggae','Rock','Techno','Industrial','Alternative','Ska','Death Metal','Pranks','Soundtrack','Euro-Techno',
+                'Ambient','Trip-Hop','Vocal','Jazz+Funk','Fusion','Trance','Classical','Instrumental','Acid','House','Game','Sound Clip',
+                'Gospel','Noise','AlternRock','Bass','Soul','Punk','Space','Meditative','Instrumental Pop','Instrumental Rock','Ethnic',
+                'Gothic','Darkwave','Techno-Industrial','Electronic','Pop-Folk','Eurodance','Dream','Southern Rock','Comedy','Cult',
+                'Gangsta','Top 40','Christian Rap','Pop/Funk','Jungle','Native American','Cabaret','New Wave','Psychadelic','Rave',
+                'Showtunes','Trailer','Lo-Fi','Tribal','Acid Punk','Acid Jazz','Polka','Retro','Musical','Rock & Roll','Hard Rock')
+
 ### Date and Time
 YEAR = 200
 MONTH = 201
@@ -318,6 +403,7 @@ REGEX_GROUP = 7         # Use matched regex groups from a key's text in INSERT_F
                         # Note: Group text will be taken from the last match made. Use MATCH_LIMIT and/or SEARCH_FROM_RIGHT to select which match to use.
                         # Example Regex:  match = r'(group1)nogroup(group2)'  insert = r'\1\2'.
 SEARCH_SUB_DIRS = 8     # When searching directories search sub directories as well. Only used in: IDENTICAL_FILE_NAMES
+SEARCH_BINARY_FILES = 9 # Search the contents of files that look like binary files (images, videos, archives...) instead of skipping them. Only used in: MATCH_FILE_CONTENTS
 
 ### Search or Modify Options
 EXTENSION = 10          # ADD (to the END of the file name plus extension) REPLACE (just the extension) or RENAME (the entire file name if a '.' is in text).
@@ -384,6 +470,55 @@ letter_cases = LOWER_AND_UPPER          # Use list_leters "and/or" list_capital_
 date_time_fomat = '%Y-%m-%d %H.%M.%S'       # Ex. 2022-10-07 18.34.29
 time_length_format = '{:02}.{:02}.{:02}'    # Ex. 01.07.09
 
+### Retrieving extra file meta data (see "File Meta Data" above) runs ffprobe on every file, which is slow. Use a pool of
+### workers to probe more than one file in a directory at the same time. Files are still sorted and renamed in the same order.
+### Set to 1 to probe one file at a time.
+meta_data_workers = 4
+
+### Searching file contents (MATCH_FILE_CONTENTS), especially with regular expressions, can be slow. Use a pool of processes to
+### search the contents of many files in a directory at the same time, before they are renamed one at a time in the same order.
+### Only directories with at least contents_search_min_files files left to search use it, starting processes takes time too.
+### With a rename limit, only the files that could be renamed before the limit is hit are searched at once.
+### Set to 1 to search one file at a time.
+contents_search_workers = 4
+contents_search_min_files = 50
+
+### Save extra file meta data in a cache file so the next time the same files are renamed they don't need to be probed again.
+### A cached file is only used if its size, modified time and inode (file ID) have not changed since it was cached.
+### Cache file name can be relative to this script or an absolute path.
+### Cached files older than a number of days or over a max amount of cached files are removed. Can be set to NO_LIMIT.
+### Set rebuild_meta_data_cache to True to clear the cache and start over, or set use_meta_data_cache to False to bypass it.
+use_meta_data_cache = True
+rebuild_meta_data_cache = False
+meta_data_cache_file_name = 'File Meta Data Cache.sqlite3'
+meta_data_cache_max_age = 90            # Days
+meta_data_cache_max_files = 1000000
+
+### Also save the results of file contents searches (MATCH_FILE_CONTENTS) in the same cache file, so the next time a preset is used
+### any unchanged files don't need to be read again. Results are kept for each different contents search (text and options),
+### so changing a preset's contents search only stops using that search's cached results.
+use_contents_cache = True
+
+### Only image, audio and video files are probed (ffprobe), and only for the meta data a preset needs.
+### Stop probing a file after a number of seconds (Ex. a corrupt or truncated video) and leave it's probed meta data empty.
+probe_timeout = 30                      # Seconds
+
+### Large MATCH_FILE_NAME and IGNORE_FILE_NAME text lists (not FULL_MATCH) are searched for all at once in a single
+### pass over each file name (Aho-Corasick automaton), instead of searching for each text one at a time.
+### REGEX lists search for the plain text each regular expression requires, and then only search with the regular expressions
+### that had their required text found.
+### Only lists with at least this many texts use it, smaller lists are faster searched one text at a time.
+multi_text_search_min_list_size = 100
+
+### Directories with many files can have their MATCH_FILE_META sizes, dates and numbers searched all at once as columns
+### of meta data (requires numpy), instead of one file at a time. Only the files that match are then renamed as usual.
+### Only directories with at least this many files use it.
+meta_data_column_search_min_files = 1000
+
+### Choose [ (E)stimate ] when selecting a preset to estimate how many files it will rename and how long it will take, without
+### renaming any files. The estimate is made from a random sample of files, more files are more accurate but take longer.
+estimate_sample_size = 1000
+
 ### Create a log file for each rename task ran, and include edit details or preset used.
 ### Directory name can be relative to this script or an absolute path.
 ### The amount of log files created can be limited from 0 to NO_LIMIT.
@@ -672,6 +807,15 @@ show_log_data = False
 ######## Settings End ########
 ##############################
 
+meta_data_cache_db = None
+meta_data_cache_hits = 0
+meta_data_cache_misses = 0
+contents_cache_hits = 0
+contents_cache_misses = 0
+meta_data_probe_failures = set() # Paths of files that failed to probe, checked for every file read.
+meta_data_cache_updates = [] # Files with meta data read when first used, waiting to be added to the meta data cache.
+contents_cache_updates = [] # Files with searched contents, waiting to be added to the contents cache.
+
 
 ### Check preset for missing required keys or empty required strings and inform user of preset mistakes.
 ###     (edit_details) All the details on how to proceed with the file name edits.
@@ -924,6 +1068,9 @@ def displayPreset(presets, formatted_text = True, number = -1, log_preset = Fals
         
         for option, mod in presets.items():
             
+            if option == COMPILED_PRESET:
+                continue
+            
             opt_str = presetConstantsToText(option, 'Preset Options', None, formatted_text)
             mod_str = ''
             
@@ -973,6 +1120,8 @@ def startingFileRenameProcedure(files_meta_data, edit_details, include_sub_dirs
     if not continue_renaming:
         return edit_details # Full Stop
     
+    # Read the preset only once, every file after uses the compiled preset.
+    edit_details = compilePreset(edit_details)
     edit_details_copy = edit_details
     
     # Keep tracked data from previous drops (Note: Not being used anymore, but will still return default values so keeping it in.)
@@ -987,7 +1136,12 @@ def startingFileRenameProcedure(files_meta_data, edit_details, include_sub_dirs
     random.seed(random_seed)
     
     # If there is no need to use extra meta data then don't retrieve it to save time.
-    get_extra_meta = isExtraMetaNeeded(edit_details_copy)
+    get_extra_meta = getExtraMetaNeeded(edit_details_copy)
+    compiled = edit_details[COMPILED_PRESET]
+    if compiled.meta_stat_list:
+        files_filter = lambda files: filterFilesByMeta(compiled, files, compiled.meta_stat_list)
+    else:
+        files_filter = None
     
     for meta in files_meta_data:
         
@@ -998,15 +1152,42 @@ def startingFileRenameProcedure(files_meta_data, edit_details, include_sub_dirs
             
             hard_limit_hit = False
             
-            for root, dirs, files in os.walk(dir_path):
+            for root, dirs, files in walkDirectory(dir_path):
                 
                 print(f'\n-Root: {root}\n')
                 
                 #for dir in dirs:
                     #print('--Directory: [ %s ]' % (dir))
                 
-                # Sort Files
-                files_meta = getFileMetaData(files, edit_details.get(PRESORT_FILES, None), root, get_extra_meta)
+                # Skip files with names that will never be renamed, before reading any of their meta data.
+                # Only the files left are sorted and have their extra meta data read.
+                files_to_rename = files
+                if compiled.name_search_needed:
+                    files_to_rename = [ file for file in files if not isSkippedByName(compiled, file.name) ]
+                
+                # Sort Files (Files with stat meta data that will never match are skipped before any extra meta data is read.)
+                files_meta = getFileMetaData(files_to_rename, edit_details.get(PRESORT_FILES, None), root, get_extra_meta, files_filter)
+                
+                # Search the meta data of all files left at once, before renaming them one at a time.
+                if compiled.match_file_meta_data and numpy_installed and len(files_meta) >= meta_data_column_search_min_files:
+                    keep_files = getMetaSearchMask(files_meta, compiled.meta_searches, compiled.match_file_meta_options, compiled.meta_list_order)
+                    if keep_files is not None:
+                        files_meta = [ file for file, keep_file in zip(files_meta, keep_files) if keep_file ]
+                
+                # Files skipped are counted as reviewed once the file after them is reached, the same as if they weren't skipped.
+                # (If the files are presorted, the order of the files skipped is unknown and their directory order is used.)
+                files_skipped = len(files) - len(files_meta)
+                skipped_files_reached = []
+                if files_skipped:
+                    file_positions = { file.name : position for position, file in enumerate(files) }
+                    positions = [ file_positions[file[FILE_META_PATH].name] for file in files_meta ]
+                    sorted_positions = sorted(positions)
+                    files_reached = 0
+                    for position in positions:
+                        files_reached = max(files_reached, position - bisect_left(sorted_positions, position))
+                        skipped_files_reached.append(files_reached)
+                skipped_files_reviewed = 0
+                files_contents_searched = 0
                 
                 # Prepare Edit Details and add Tracker
                 if not log_data:
@@ -1015,7 +1196,7 @@ def startingFileRenameProcedure(files_meta_data, edit_details, include_sub_dirs
                 edit_details_copy = copyEditDetails(edit_details, files_reviewed, files_renamed, individual_files_renamed, False, one_time_flags, linked_file_encodings, log_data)
                 #if debug: displayPreset(edit_details_copy, readable_preset_text)
                 
-                for file in files_meta:
+                for i, file in enumerate(files_meta):
                     #print('--File: [ %s ]' % (file[FILE_META_PATH].name))
                     
                     hard_rename_limit = getTrackedData(edit_details_copy, FILES_REVIEWED, [LIMIT])
@@ -1031,11 +1212,27 @@ def startingFileRenameProcedure(files_meta_data, edit_details, include_sub_dirs
                     if allCountLimitsHitCheck(getTrackedData(edit_details_copy)):
                         break # File count limit hit, stop and move on to next directory.
                     
+                    if files_skipped and skipped_files_reached[i] > skipped_files_reviewed:
+                        edit_details_copy = updateTrackedData(edit_details_copy, { FILES_REVIEWED : skipped_files_reached[i] - skipped_files_reviewed })
+                        skipped_files_reviewed = skipped_files_reached[i]
+                    
+                    # Search the contents of the next files at once, but no more files than could be renamed before a rename limit is hit.
+                    if compiled.match_file_contents_data and i >= files_contents_searched:
+                        renames_left = getRenamesLeft(edit_details_copy)
+                        files_contents_searched = len(files_meta) if renames_left == NO_LIMIT else i + renames_left
+                        searchFilesContents(compiled, files_meta[i:files_contents_searched])
+                    
                     edit_details_copy = updateTrackedData(edit_details_copy, { CURRENT_FILE_META : file, CURRENT_FILE_RENAME : file[FILE_META_PATH].name })
                     
                     edit_details_copy = createNewFileName(edit_details_copy)
                     edit_details_copy = updateTrackedData(edit_details_copy, { FILES_REVIEWED : +1 })
                     if debug: displayPreset(edit_details_copy, readable_preset_text)
+                else:
+                    # Files skipped after the last file, only reached if a rename limit didn't stop this directory early.
+                    edit_details_copy = updateTrackedData(edit_details_copy, { FILES_REVIEWED : files_skipped - skipped_files_reviewed })
+                
+                saveMissingFileMetaData()
+                saveSearchedFileContents()
                 
                 # Save some tracked data for next directory loop or individually grouped files.
                 files_reviewed = getTrackedData(edit_details_copy, FILES_REVIEWED, [AMOUNT])
@@ -1076,11 +1273,173 @@ def startingFileRenameProcedure(files_meta_data, edit_details, include_sub_dirs
                 
                 if debug: displayPreset(edit_details_copy, readable_preset_text)
     
+    saveMissingFileMetaData()
+    saveSearchedFileContents()
     edit_details_copy = updateTrackedData(edit_details_copy, { END_TIME : datetime.now().timestamp() })
     
     return edit_details_copy
 
 
+### Estimate how many files the edit details will rename and how long it will take, without renaming any files.
+### All the files are counted, then a random sample of them is searched the same way they would be in a real rename task.
+###     (files_meta_data) A List of directories and/or files with meta data included.
+###     (edit_details) A Dictionary of all the details on how to proceed with the file name edits.
+###     (include_sub_dirs) Search sub-directories for more files.  Boolean(True) or Boolean(False)
+###     --> Returns a [Dictionary] of estimates
+def estimateFileRenames(files_meta_data, edit_details, include_sub_dirs = False):
+    
+    edit_details = compilePreset(edit_details)
+    compiled = edit_details[COMPILED_PRESET]
+    get_extra_meta = getExtraMetaNeeded(edit_details)
+    if compiled.meta_stat_list:
+        files_filter = lambda files: filterFilesByMeta(compiled, files, compiled.meta_stat_list)
+    else:
+        files_filter = None
+    
+    # Count all the files first, without reading any meta data, so they all have the same chance of being sampled.
+    print('\nCounting Files...')
+    start_time = delay.perf_counter()
+    directories = [] # [(root, number of files)]
+    individual_files = []
+    for meta in files_meta_data:
+        if type(meta) == tuple:
+            for root, dirs, files in walkDirectory(meta[FILE_META_PATH]):
+                if files:
+                    directories.append( (root, len(files)) )
+                if not include_sub_dirs:
+                    break
+        elif type(meta) == list:
+            individual_files.extend(meta)
+    
+    total_files = sum( number_of_files for root, number_of_files in directories ) + len(individual_files)
+    listing_time = delay.perf_counter() - start_time
+    if total_files == 0:
+        print('\nNo Files Found To Estimate.')
+        return {}
+    
+    sample_indexes = sorted(random.Random().sample(range(total_files), min(estimate_sample_size, total_files)))
+    print(f'Sampling [ {len(sample_indexes)} ] of [ {total_files} ] Files...')
+    
+    files_sampled = 0
+    files_renamed = 0
+    name_search_times = []
+    meta_data_times = []
+    rename_times = []
+    
+    # Group sampled files by the directory they're in, so each directory is only read once.
+    groups = []
+    first_index = 0
+    i = 0
+    for root, number_of_files in directories:
+        offsets = []
+        while i < len(sample_indexes) and sample_indexes[i] < first_index + number_of_files:
+            offsets.append(sample_indexes[i] - first_index)
+            i += 1
+        if offsets:
+            groups.append( (root, offsets) )
+        first_index += number_of_files
+    individual_offsets = [ index - first_index for index in sample_indexes[i:] ]
+    
+    for root, offsets in groups + [(None, individual_offsets)]:
+        
+        if root == None:
+            files = [ individual_files[offset] for offset in offsets ]
+        else:
+            root, dirs, files = next(walkDirectory(root), (root, [], []))
+            files = [ files[offset] for offset in offsets if offset < len(files) ] # Skip any files deleted since counted
+        
+        if not files:
+            continue
+        files_sampled += len(files)
+        
+        # Prepare Edit Details and add Tracker (Skip SAME_MATCH_INDEX warnings, no one is renaming anything.)
+        edit_details_copy = copyEditDetails(edit_details, individual_file_group = root == None, one_time_flags = [True,False,False])
+        
+        # File Name Search
+        start_time = delay.perf_counter()
+        if compiled.name_search_needed:
+            files_to_rename = [ file for file in files if not isSkippedByName(compiled, file.name) ]
+        else:
+            files_to_rename = files
+        name_search_times.extend( [(delay.perf_counter() - start_time) / len(files)] * len(files) )
+        
+        # Meta Data
+        start_time = delay.perf_counter()
+        if root != None and files_to_rename:
+            files_to_rename = getFileMetaData(files_to_rename, None, root, get_extra_meta, files_filter)
+        meta_data_time = delay.perf_counter() - start_time
+        meta_data_times.extend( [meta_data_time / len(files)] * len(files) )
+        
+        # File Contents, Meta Data Search and New File Name
+        for file in files_to_rename:
+            start_time = delay.perf_counter()
+            edit_details_copy = updateTrackedData(edit_details_copy, { CURRENT_FILE_META : file, CURRENT_FILE_RENAME : file[FILE_META_PATH].name })
+            edit_details_copy = insertTextIntoFileName(edit_details_copy)
+            rename_times.append(delay.perf_counter() - start_time)
+            if getTrackedData(edit_details_copy, CURRENT_FILE_RENAME) != file[FILE_META_PATH].name:
+                edit_details_copy = updateTrackedData(edit_details_copy, { FILES_RENAMED : +1 }) # Move text list index forward
+                files_renamed += 1
+    
+    if files_sampled == 0:
+        print('\nNo Files Found To Estimate.')
+        return {}
+    
+    saveMissingFileMetaData()
+    saveSearchedFileContents()
+    rename_times.extend( [0] * (files_sampled - len(rename_times)) ) # Files skipped before searching
+    
+    estimates = {
+        'files' : total_files,
+        'files_sampled' : files_sampled,
+        'files_renamed' : getEstimateTotal(files_renamed, files_sampled, total_files),
+        'listing_time' : listing_time,
+        'name_search_time' : getEstimateTotal(name_search_times, files_sampled, total_files),
+        'meta_data_time' : getEstimateTotal(meta_data_times, files_sampled, total_files),
+        'rename_time' : getEstimateTotal(rename_times, files_sampled, total_files)
+    }
+    
+    total_time = [ listing_time + name_search_time + meta_data_time + rename_time for name_search_time, meta_data_time, rename_time
+                   in zip(estimates['name_search_time'], estimates['meta_data_time'], estimates['rename_time']) ]
+    
+    print(f'\nEstimate From [ {files_sampled} ] of [ {total_files} ] Files (95% Confidence Range)')
+    print('  Files Renamed:     [ %d ] (%d - %d)' % estimates['files_renamed'])
+    print('  Listing Files:     [ %.1f ] Seconds' % listing_time)
+    print('  File Name Search:  [ %.1f ] Seconds (%.1f - %.1f)' % estimates['name_search_time'])
+    print('  Reading Meta Data: [ %.1f ] Seconds (%.1f - %.1f)' % estimates['meta_data_time'])
+    print('  Searching Files:   [ %.1f ] Seconds (%.1f - %.1f)' % estimates['rename_time'])
+    print('  Total Time:        [ %.1f ] Seconds (%.1f - %.1f)' % tuple(total_time))
+    print('Note: Rename limits are not included and the time needed to rename files and update linked files is not included.')
+    
+    return estimates
+
+
+### Estimate a total for all files from a random sample of files, with a 95% confidence range.
+###     (sample) The number of sampled files that matched (uses a Wilson score interval), or a List of values from each sampled file.
+###     (sample_size) The number of files sampled.
+###     (population_size) The number of files in total.
+###     --> Returns a [Tuple] (estimate, low, high)
+def getEstimateTotal(sample, sample_size, population_size):
+    z = 1.96
+    
+    # Less uncertainty the more of the files are sampled (finite population correction).
+    fpc = math.sqrt((population_size - sample_size) / (population_size - 1)) if population_size > 1 else 0
+    
+    if type(sample) == int:
+        p = sample / sample_size
+        if fpc:
+            center = (p + z*z / (2*sample_size)) / (1 + z*z / sample_size)
+            margin = z * math.sqrt(p * (1-p) / sample_size + z*z / (4*sample_size*sample_size)) / (1 + z*z / sample_size) * fpc
+            low, high = max(0, center - margin), min(1, center + margin)
+        else:
+            low, high = p, p # All files sampled
+        return (round(p * population_size), math.floor(low * population_size), math.ceil(high * population_size))
+    
+    mean = sum(sample) / sample_size
+    variance = sum( (value - mean) ** 2 for value in sample ) / (sample_size - 1) if sample_size > 1 else 0
+    margin = z * math.sqrt(variance / sample_size) * fpc
+    return (mean * population_size, max(0, mean - margin) * population_size, (mean + margin) * population_size)
+
+
 ### Build a list of files and edit details using a log file (generated by this script) for the purpose of reverting the renames recored in that log file.
 ###     (log_file) Path to a log file.
 ###     --> Returns a [List] and [Dictionary]
@@ -1388,269 +1747,215 @@ def updateTrackedData(edit_details, update_data, append_values = True):
     return edit_details
 
 
-### Check if extra file meta data is needed. If there is no need to use extra meta data then save time by not retrieving it.
+### Check what extra file meta data is needed. If there is no need to use extra meta data then save time by not retrieving it.
+### Only the extractors needed to read the meta data used in MATCH_FILE_META, PRESORT_FILES and INSERT_META_DATA are returned.
 ###     (edit_details) All the details on how to proceed with the file name edits.
-###     --> Returns a [Boolean]
-def isExtraMetaNeeded(edit_details):
-    get_extra_meta = False
+###     --> Returns a [Set] of META_EXTRACTOR_* constants (empty if no extra meta data needed)
+def getExtraMetaNeeded(edit_details):
+    meta_needed = set()
     match_file_meta = edit_details.get(MATCH_FILE_META, None)
     insert_file_name_data = edit_details.get(INSERT_FILE_NAME, None)
     presort_files = edit_details.get(PRESORT_FILES, None)
     
-    if match_file_meta and not get_extra_meta:
+    if match_file_meta:
         if type(match_file_meta) == dict:
             match_file_meta_list = getMetaList(match_file_meta)
             for meta_data in match_file_meta_list:
-                meta = next(iter(meta_data))
-                if meta > 4:
-                    get_extra_meta = True
-                    break
+                meta_needed.add(next(iter(meta_data)))
         else:
             # Assumed FILE_META_TYPE or FILE_META_MIME
-            get_extra_meta = True
-    
-    if insert_file_name_data and not get_extra_meta:
-        # Assuming extra file meta data being inserted. (Who would add basic file property data to a file name?)
-        get_extra_meta = getOptions(insert_file_name_data, INSERT_META_DATA)
+            meta_needed.add(FILE_META_TYPE)
+    
+    if insert_file_name_data and getOptions(insert_file_name_data, INSERT_META_DATA):
+        for insert_text in getTextList(insert_file_name_data):
+            for meta_type in makeList(insert_text):
+                if type(meta_type) == int:
+                    meta_needed.add(meta_type)
+    
+    if presort_files:
+        meta_needed.add(next(iter(presort_files)))
+    
+    return set(META_EXTRACTORS[meta] for meta in meta_needed if meta in META_EXTRACTORS)
+
+
+### All the meta data from a single file that can be accessed like a Tuple using FILE_META_* constants. Ex. file[FILE_META_SIZE]
+### Extra meta data (FILE_META_TYPE and beyond) is not read from the file until it's first used, then it's remembered.
+### Each extractor only reads a group of meta data, so using FILE_META_WIDTH won't also read audio tags.
+### To keep memory use low with many files, only meta data that was found is stored and files in the same directory share a root path.
+class FileMeta:
+    __slots__ = ('root', 'name', 'size', 'accessed', 'modified', 'created', 'extra_meta', 'extracted', 'sniffed_types')
+    
+    ###     (root) The Path to the directory this file is in.
+    ###     (name) The file name.
+    ###     (file_stat) The os.stat_result of this file.
+    def __init__(self, root, name, file_stat):
+        self.root = root
+        self.name = name
+        self.size = file_stat.st_size
+        self.accessed = file_stat.st_atime
+        self.modified = file_stat.st_mtime
+        self.created = file_stat.st_ctime
+        self.extra_meta = None      # Dictionary of only the extra meta data found
+        self.extracted = 0          # Bit flags of extractors already ran
+        self.sniffed_types = ()     # File types found in file header (filetype)
+    
+    def __len__(self):
+        return FILE_META_DATE_TAKEN + 1
+    
+    def __getitem__(self, index):
+        if index == FILE_META_PATH:
+            return self.root.joinpath(self.name)
+        elif index == FILE_META_SIZE:
+            return self.size
+        elif index == FILE_META_ACCESSED:
+            return self.accessed
+        elif index == FILE_META_MODIFIED:
+            return self.modified
+        elif index == FILE_META_CREATED:
+            return self.created
+        elif index >= len(self) or index < 0:
+            raise IndexError('file meta data index out of range')
+        
+        extractor = META_EXTRACTORS[index]
+        if not self.extracted & (1 << extractor):
+            getMissingFileMetaData(self, extractor)
+        
+        return self.extra_meta.get(index) if self.extra_meta else None
+    
+    # Only show the meta data already read, don't read any more from the file just to show it.
+    def __repr__(self):
+        basic_meta = (self[FILE_META_PATH], self.size, self.accessed, self.modified, self.created)
+        extra_meta = self.extra_meta or {}
+        return repr(basic_meta + tuple( extra_meta.get(index) for index in range(FILE_META_TYPE, len(self)) ))
+    
+    ### The extractors already ran on this file.
+    ###     --> Returns a [Set]
+    @property
+    def extractors(self):
+        return set( extractor for extractor in set(META_EXTRACTORS.values()) if self.extracted & (1 << extractor) )
+    
+    def addExtractors(self, extractors):
+        for extractor in extractors:
+            self.extracted |= 1 << extractor
+    
+    ### Add extra meta data, skipping anything not found (None).
+    ###     (extra_meta) A Dictionary of FILE_META_* constants and values.
+    def updateExtraMeta(self, extra_meta):
+        for index, meta in extra_meta.items():
+            if meta != None:
+                if self.extra_meta == None:
+                    self.extra_meta = {}
+                self.extra_meta[index] = meta
+
+
+### Walk through a directory and it's sub directories (top down, in the same order as os.walk) using os.scandir.
+### Files are returned as os.DirEntry which already know their file type, and on Windows their stats too, saving
+### multiple system calls per file when getting their meta data.
+###     (dir_path) The path to a directory.
+###     --> Returns a [Generator] of Tuples (root, directory names, files as os.DirEntry)
+def walkDirectory(dir_path):
+    
+    root = os.fspath(dir_path)
+    try:
+        with os.scandir(root) as entries:
+            entries = list(entries)
+    except OSError:
+        return # Can't read directory, skip it (same as os.walk)
+    
+    dirs = []
+    files = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            dirs.append(entry)
+        else:
+            files.append(entry)
     
-    if presort_files and not get_extra_meta:
-        meta_sorted = next(iter(presort_files))
-        get_extra_meta = True if meta_sorted > 4 else False
+    yield root, [dir.name for dir in dirs], files
     
-    return get_extra_meta
+    for dir in dirs:
+        if not dir.is_symlink():
+            yield from walkDirectory(os.path.join(root, dir.name))
 
 
 ### Get all the meta data from a list of files and sort the list in various ways before renaming.
-###     (files) A List of file names or paths.
+###     (files) A List of file names or paths, or os.DirEntry from walkDirectory.
 ###     (sort_option) A Dictionary with a file sorting option.
 ###     (root) Root path if files List has only names.
-###     (get_extra_meta) If there is no need to use extra meta data then don't retrieve it to save time.
+###     (get_extra_meta) A Set of META_EXTRACTOR_* constants to read now (see getExtraMetaNeeded) or True for all.
+###                      Any other extra meta data is only read if used.
+###     (files_filter) A function given a List of FileMeta that returns which files to keep (List of Booleans), before any extra meta data is read.
+###     (extra_meta_filter) A function given a List of FileMeta that returns which files to read get_extra_meta from now (List of Booleans).
+###                         The other files are still kept and only have their extra meta data read if used, like when sorting.
 ###     --> Returns a [List]
-def getFileMetaData(files, sort_option = None, root = '', get_extra_meta = False):
+def getFileMetaData(files, sort_option = None, root = '', get_extra_meta = False, files_filter = None, extra_meta_filter = None):
     files_meta = []
     directory_list = []
     individual_file_list = []
+    individual_file_stats = []  # os.stat_result of each file in individual_file_list
+    root_path = Path(root)
     
     for file in files:
         
-        if root == '':
-            file_path = Path(file)
+        # One stat per file is all that's needed to know if it exists and what type of file it is.
+        # Entries from walkDirectory may already have their stat cached (Windows) or at least won't need any more system calls.
+        try:
+            if type(file) == os.DirEntry:
+                file_root = root_path
+                file_name = file.name
+                file_meta = file.stat()
+            else:
+                file_path = Path(file) if root == '' else Path(PurePath().joinpath(root, file))
+                file_root = file_path.parent if root == '' else root_path
+                file_name = file_path.name
+                file_meta = os.stat(file_path)
+        except OSError:
+            continue # Doesn't exist (or a broken link)
+        
+        if S_ISREG(file_meta.st_mode):
+            individual_file_list.append(FileMeta(file_root, file_name, file_meta))
+            individual_file_stats.append(file_meta)
+        elif S_ISDIR(file_meta.st_mode):
+            directory_list.append( (file_root.joinpath(file_name), file_meta.st_size, file_meta.st_atime, file_meta.st_mtime, file_meta.st_ctime) )
         else:
-            file_path = Path(PurePath().joinpath(root, file))
+            print(f'\nSkipping This: [ {file_root.joinpath(file_name)} ]')
+            print('This is not a normal file or directory.')
+    
+    if files_filter and individual_file_list:
+        keep_files = files_filter(individual_file_list)
+        individual_file_list = [ file for file, keep_file in zip(individual_file_list, keep_files) if keep_file ]
+        individual_file_stats = [ file_stat for file_stat, keep_file in zip(individual_file_stats, keep_files) if keep_file ]
+    
+    # Extra meta data is the slow part (a subprocess per file), so probe the files concurrently if allowed.
+    # The files are returned in the same order they were found in, so sorting and COUNT are unaffected.
+    # Any other extra meta data not read here will still be read later if used.
+    if filetype_installed and get_extra_meta:
         
-        if Path.exists(file_path):
-            file_meta = os.stat(file_path)
-            
-            file_meta_type, file_meta_mime, format_short, format_long, height, width, duration = None,None,None,None,None,None,None
-            bit_depth, video_bit_rate, frame_rate, audio_bit_rate, sample_rate, channels, channel_layout = None,None,None,None,None,None,None
-            title, album, artist, date, genre, publisher, track_number = None,None,None,None,None,None,None
-            
-            if ffmpeg_installed and filetype_installed and get_extra_meta:
-                if debug: print(file_path)
-                try:
-                    file_type = filetype.guess(file_path)
-                    is_audio = filetype.is_audio(file_path)
-                    is_font = filetype.is_font(file_path)
-                    is_image = filetype.is_image(file_path)
-                    is_video = filetype.is_video(file_path)
-                    is_app = None
-                    is_message = None
-                    is_model = None
-                    is_multipart = None
-                    is_text = None
-                    is_archive = filetype.is_archive(file_path)
-                    is_doc = None
-                    is_presentation = None
-                    is_spead_sheet = None
-                except:
-                    if debug: print('-FileType Failed')
-                    file_type, is_audio, is_font, is_image, is_video, is_app, is_message = None,None,None,None,None,None,None
-                    is_model, is_multipart, is_text, is_archive, is_doc, is_presentation, is_spead_sheet = None,None,None,None,None,None,None
-                
-                mime_type = mimetypes.guess_type(file_path)
-                
-                if debug:
-                    print(f'file_type: {file_type}')
-                    print(f'mime_type: ({mime_type[0]}, {mime_type[1]})')
-                
-                archive_mimes = ['application/x-7z-compressed','application/x-unix-archive','application/x-bzip2','application/vnd.ms-cab-compressed',
-                                 'application/x-google-chrome-extension','application/dicom','application/vnd.debian.binary-package','application/x-executable',
-                                 'application/octet-stream','application/epub+zip','application/vnd.microsoft.portable-executable','application/gzip',
-                                 'application/x-iso9660-image','application/x-lzip','application/x-nintendo-nes-rom','application/pdf','application/postscript',
-                                 'application/vnd.rar','application/x-rpm','application/rtf','application/vnd.sqlite3','application/x-shockwave-flash',
-                                 'application/x-tar','application/x-xz','application/x-compress','application/zip','application/zstd','application/x-zip-compressed']
-                document_mimes = ['application/msword','application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'application/vnd.ms-powerpoint',
-                                  'application/vnd.openxmlformats-officedocument.presentationml.presentation', 'application/vnd.ms-excel',
-                                  'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet']
-                
-                file_type_basic = None
-                if file_type:
-                    #print('File extension: %s' % file_type.extension)
-                    #print('File MIME type: %s' % file_type.mime)
-                    file_meta_mime = file_type.mime
-                
-                #print('is_archive: %s' % is_archive)
-                
-                # Last chance to find mime
-                if mime_type[0] and not file_meta_mime:
-                    file_meta_mime = mime_type[0]
-                
-                if file_meta_mime:
-                    
-                    file_type_basic = file_meta_mime.split('/')[0]
-                    
-                    # Basic Types
-                    if file_type_basic == 'application':
-                        file_meta_type = TYPE_APPLICATION
-                    elif is_audio or file_type_basic == 'audio':
-                        file_meta_type = TYPE_AUDIO
-                    elif is_font or file_type_basic == 'font':
-                        file_meta_type = TYPE_FONT
-                    elif is_image or file_type_basic == 'image':
-                        file_meta_type = TYPE_IMAGE
-                    elif file_type_basic == 'message':
-                        file_meta_type = TYPE_MESSAGE
-                    elif file_type_basic == 'model':
-                        file_meta_type = TYPE_MODEL
-                    elif file_type_basic == 'multipart':
-                        file_meta_type = TYPE_MULTIPART
-                    elif file_type_basic == 'text':
-                        file_meta_type = TYPE_TEXT
-                    elif is_video or file_type_basic == 'video':
-                        file_meta_type = TYPE_VIDEO
-                    
-                    # Application Types (TYPE_APPLICATION will still match these)
-                    if is_archive or file_type_basic in archive_mimes:
-                        file_meta_type = TYPE_ARCHIVE
-                    if file_type_basic in document_mimes:
-                        file_meta_type = TYPE_DOCUMENT
-                
-                if debug:
-                    # Basic Types
-                    is_app = file_type_basic == 'application'
-                    is_audio = file_type_basic == 'audio'
-                    is_font = file_type_basic == 'font'
-                    is_image = file_type_basic == 'image'
-                    is_message = file_type_basic == 'message'
-                    is_model = file_type_basic == 'model'
-                    is_multipart = file_type_basic == 'multipart'
-                    is_text = file_type_basic == 'text'
-                    is_video = file_type_basic == 'video'
-                    
-                    # Application Types
-                    if not is_archive:
-                        is_archive = file_meta_mime in archive_mimes
-                    is_doc = file_meta_mime in document_mimes
-                    
-                    print(f'file_meta_type: {file_meta_type}')
-                    print(f'file_meta_mime: {file_meta_mime}')
-                    print(f'is_app: {is_app}')
-                    print(f'is_archive: {is_archive}')
-                    print(f'is_audio: {is_audio}')
-                    print(f'is_font: {is_font}')
-                    print(f'is_image: {is_image}')
-                    print(f'is_text: {is_text}')
-                    print(f'is_doc: {is_doc}')
-                    print(f'is_spead_sheet: {is_spead_sheet}')
-                    print(f'is_presentation: {is_presentation}')
-                    print(f'is_video: {is_video}')
-                
-                probe = None
-                try:
-                    probe = ffmpeg.probe(file_path)
-                    if debug:
-                        print('-Probe Good')
-                        print(probe)
-                except ffmpeg.Error as e:
-                    if debug:
-                        #print(e.stderr)
-                        print('-Probe Failed')
-                
-                if probe:
-                    stream = probe.get('streams')
-                    format = probe.get('format')
-                    
-                    format_short = stream[0].get('codec_name')
-                    format_long = stream[0].get('codec_long_name')
-                    
-                    if file_meta_type == TYPE_IMAGE or file_meta_type == TYPE_VIDEO:
-                        height = stream[0].get('height')
-                        if not height: height = stream[0].get('coded_height')
-                        width = stream[0].get('width')
-                        if not width: width = stream[0].get('coded_width')
-                    
-                    duration = stream[0].get('duration')
-                    bit_depth = stream[0].get('bits_per_raw_sample')
-                    if bit_depth: bit_depth = int(bit_depth)
-                    
-                    if is_video:
-                        video_bit_rate = stream[0].get('bit_rate')
-                        audio_bit_rate = stream[1].get('bit_rate')
-                    elif is_audio:
-                        video_bit_rate = None
-                        audio_bit_rate = stream[0].get('bit_rate')
-                    if video_bit_rate: video_bit_rate = float(video_bit_rate) / 1000
-                    if audio_bit_rate: audio_bit_rate = float(audio_bit_rate) / 1000
-                    
-                    sample_rate = stream[1].get('sample_rate') if is_video else stream[0].get('sample_rate')
-                    if sample_rate: sample_rate = float(sample_rate) / 1000
-                    
-                    frame_rate = stream[0].get('r_frame_rate')
-                    if not frame_rate: frame_rate = frame_rate[0].get('avg_frame_rate')
-                    if frame_rate and is_video:
-                        frame_rate_split = frame_rate.split('/')
-                        frame_rate = int(frame_rate_split[0]) / int(frame_rate_split[1])
-                    
-                    channels = stream[1].get('channels') if is_video else stream[0].get('channels')
-                    if channels: channels = int(channels)
-                    channel_layout = stream[1].get('channel_layout') if is_video else stream[0].get('channel_layout')
-                    
-                    if is_audio:
-                        audio_tags = format.get('tags')
-                        title = audio_tags.get('title')
-                        album = audio_tags.get('album')
-                        artist = audio_tags.get('artist')
-                        if not artist: artist = audio_tags.get('album_artist')
-                        date = audio_tags.get('date')
-                        if date: date = int(date)
-                        genre = audio_tags.get('genre')
-                        publisher = audio_tags.get('publisher')
-                        track_number = audio_tags.get('track')
-                        if track_number: track_number = int(track_number)
-                
-                if debug:
-                    print(f'format_short: {format_short}')
-                    print(f'format_long: {format_long}')
-                    print(f'height: {height}')
-                    print(f'width: {width}')
-                    print(f'duration: {duration}')
-                    print(f'bit_depth: {bit_depth}')
-                    print(f'video_bit_rate: {video_bit_rate}')
-                    print(f'frame_rate: {frame_rate}')
-                    print(f'audio_bit_rate: {audio_bit_rate}')
-                    print(f'sample_rate: {sample_rate}')
-                    print(f'channels: {channels}')
-                    print(f'channel_layout: {channel_layout}')
-                    print(f'title: {title}')
-                    print(f'album: {album}')
-                    print(f'artist: {artist}')
-                    print(f'date: {date}')
-                    print(f'genre: {genre}')
-                    print(f'publisher: {publisher}')
-                    print(f'track_number: {track_number}')
-            
-            #if debug: input('...')
-            
-            if Path.is_file(file_path):
-                individual_file_list.append( (file_path, file_meta.st_size, file_meta.st_atime, file_meta.st_mtime, file_meta.st_ctime,
-                                              file_meta_type, file_meta_mime, format_short, format_long, height, width, duration, bit_depth,
-                                              video_bit_rate, frame_rate, audio_bit_rate, sample_rate, channels, channel_layout, title,
-                                              album, artist, date, genre, publisher, track_number) )
-            elif Path.is_dir(file_path):
-                directory_list.append( (file_path, file_meta.st_size, file_meta.st_atime, file_meta.st_mtime, file_meta.st_ctime) )
-            else:
-                print(f'\nSkipping This: [ {file_path} ]')
-                print('This is not a normal file or directory.')
+        if get_extra_meta == True:
+            get_extra_meta = set(META_EXTRACTORS.values())
+        
+        extra_meta_files = list(zip(individual_file_list, individual_file_stats))
+        if extra_meta_filter and extra_meta_files:
+            extra_meta_files = [ file_and_stat for file_and_stat, read_file in zip(extra_meta_files, extra_meta_filter(individual_file_list)) if read_file ]
+        
+        # Skip any unchanged files already cached.
+        if use_meta_data_cache and extra_meta_files:
+            getCachedFileMetaData([ file for file, file_stat in extra_meta_files ], [ file_stat for file, file_stat in extra_meta_files ], get_extra_meta)
+        
+        unread_files = [(file, file_stat) for file, file_stat in extra_meta_files if not get_extra_meta <= file.extractors]
+        if meta_data_workers > 1 and len(unread_files) > 1:
+            with ThreadPoolExecutor(max_workers=meta_data_workers) as executor:
+                list(executor.map(getExtraFileMetaData, [file for file, file_stat in unread_files], [get_extra_meta] * len(unread_files)))
+        else:
+            for file, file_stat in unread_files:
+                getExtraFileMetaData(file, get_extra_meta)
+        
+        # Files that failed to probe are not cached, so they're probed again next time.
+        if use_meta_data_cache and unread_files:
+            updateMetaDataCache([ (file, file_stat) for file, file_stat in unread_files if str(file[FILE_META_PATH]) not in meta_data_probe_failures ])
     
     if type(sort_option) == dict:
         meta_data = next(iter(sort_option))
@@ -1671,192 +1976,1763 @@ def getFileMetaData(files, sort_option = None, root = '', get_extra_meta = False
     return files_meta
 
 
-### Custom Sort function using file meta data.
-###     (file) A Tuple with the full file path and various meta data.
-###     (index) The index of which meta data to sort by.
-###     --> Returns a [String] or [Integer]
-def sortFilesByMetaData(file, index):
-    meta_data = file[index] if file[index] else -9999999999999
-    if index == 0: # File Path, Sort By Name Only.
-        meta_data = meta_data.name
-    return meta_data
-
-
-### Using the edit details create a new file name and try renaming file and updating any linked files.
-###     (edit_details) All the details on how to proceed with the file name edits.
-###     --> Returns a [Dictionary]
-def createNewFileName(edit_details):
+### Read extra meta data (type, mime, format, dimensions, audio tags, etc.) from a single file, but only what the extractors read.
+### This is thread safe so many files can be read at the same time. (See meta_data_workers)
+###     (file) A FileMeta of a single file.
+###     (extractors) A Set of META_EXTRACTOR_* constants.
+###     (probe_all) If the file needs to be probed anyway, probe all the meta data that can be probed so it's only probed once.
+###     --> Returns a [FileMeta]
+def getExtraFileMetaData(file, extractors, probe_all = False):
     
-    file_path = getTrackedData(edit_details, CURRENT_FILE_META, [FILE_META_PATH])
-    assert Path.is_file(file_path) # Error if not a file or doen't exist
-    file_name_changed = False
+    extractors = extractors - file.extractors
+    if not extractors:
+        return file
     
-    skip_file = checkForSkippedFiles(file_path, getTrackedData(edit_details, SKIPPED_FILES))
+    if filetype_installed:
+        if debug: print(file[FILE_META_PATH])
+        
+        # Other extractors need to know the file type first.
+        if META_EXTRACTOR_TYPE not in file.extractors:
+            getFileTypeMetaData(file)
+        
+        probe_extractors = extractors - {META_EXTRACTOR_TYPE}
+        
+        if 'audio' not in file.sniffed_types:
+            probe_extractors.discard(META_EXTRACTOR_TAGS) # Only read from audio files
+        
+        # Common images, videos and audio tags can be read directly (faster), anything else is probed.
+        if 'image' in file.sniffed_types and probe_extractors:
+            if getImageMetaData(file, probe_extractors):
+                probe_extractors -= {META_EXTRACTOR_STREAM, META_EXTRACTOR_AUDIO, META_EXTRACTOR_EXIF}
+        probe_extractors.discard(META_EXTRACTOR_EXIF) # Only read from images
+        
+        if 'video' in file.sniffed_types and META_EXTRACTOR_STREAM in probe_extractors:
+            if getVideoMetaData(file):
+                probe_extractors.discard(META_EXTRACTOR_STREAM)
+        
+        if META_EXTRACTOR_TAGS in probe_extractors:
+            if getAudioTagMetaData(file):
+                probe_extractors.discard(META_EXTRACTOR_TAGS)
+        
+        # Only files that can carry media meta data are probed.
+        is_media = ( 'audio' in file.sniffed_types or 'image' in file.sniffed_types or 'video' in file.sniffed_types
+                     or file[FILE_META_TYPE] == TYPE_AUDIO or file[FILE_META_TYPE] == TYPE_IMAGE or file[FILE_META_TYPE] == TYPE_VIDEO )
+        
+        # A file that failed to probe is only probed once per drop, and it's probed meta data isn't marked as read so it's not cached.
+        # Without ffprobe only the meta data read directly is available.
+        if probe_extractors and is_media and not ffprobe_installed:
+            extractors = extractors - probe_extractors
+        elif probe_extractors and is_media:
+            if probe_all:
+                probe_extractors |= {META_EXTRACTOR_STREAM, META_EXTRACTOR_AUDIO} - file.extractors
+                if 'audio' in file.sniffed_types:
+                    probe_extractors |= {META_EXTRACTOR_TAGS} - file.extractors
+                extractors = extractors | probe_extractors
+            if str(file[FILE_META_PATH]) in meta_data_probe_failures or not getProbedMetaData(file, probe_extractors):
+                extractors = extractors - probe_extractors
+        
+        if debug: print(file)
     
-    # Create The New File Name
-    if not skip_file:
-        edit_details = insertTextIntoFileName(edit_details)
-        new_file_name = getTrackedData(edit_details, CURRENT_FILE_RENAME)
-        file_name_changed = False if new_file_name == file_path.name else True
+    file.addExtractors(extractors)
+    return file
+
+
+### Read extra meta data that wasn't read ahead of time (see getFileMetaData) the first time it's used.
+### The meta data cache is used the same way it is when reading ahead, and a file is only probed once for all probed meta data.
+###     (file) A FileMeta of a single file.
+###     (extractor) The META_EXTRACTOR_* constant of the meta data being used.
+###     --> Returns a [FileMeta]
+def getMissingFileMetaData(file, extractor):
     
-    # Now Rename The File
-    if file_name_changed:
-        new_file_path = Path(file_path.parent, new_file_name)
-        edit_details = renameFileTo(new_file_path, edit_details)
-        
-        skip_file = checkForSkippedFiles(new_file_path, getTrackedData(edit_details, SKIPPED_FILES))
+    file_stat = None
+    if use_meta_data_cache:
+        try:
+            file_stat = os.stat(file[FILE_META_PATH])
+            getCachedFileMetaData([file], [file_stat], {extractor})
+        except OSError:
+            file_stat = None # Doesn't exist anymore
+    
+    if not file.extracted & (1 << extractor):
+        getExtraFileMetaData(file, {extractor}, True)
         
-        if not skip_file:
-            linked_files = getLinkedFiles(edit_details)
-            linked_files_updates = []
-            lf_backed_up = getTrackedData(edit_details, ONE_TIME_FLAGS, [LF_BACKED_UP])
-            #print('lf_backed_up: %s' % lf_backed_up)
-            
-            linked_file_encodings = getTrackedData(edit_details, LINKED_FILES_ENCODINGS)
-            i = 0
-            for file in linked_files:
-                links_updated = updateLinksInFile(file, linked_file_encodings[i], str(file_path), str(new_file_path), lf_backed_up)
-                linked_files_updates.append(links_updated)
-                i += 1
-                if links_updated:
-                    if debug: print('----Link File Updated: [ %s ]' % (file))
-                #else:
-                    #if debug: print('----Link File Not Updated: [ %s ]' % (file))
-            
-            edit_details = updateTrackedData(edit_details, { LINKED_FILES_UPDATED : linked_files_updates, ONE_TIME_FLAGS : [LF_BACKED_UP, True] })
+        # Added to the meta data cache after each directory. (See saveMissingFileMetaData)
+        if file_stat and str(file[FILE_META_PATH]) not in meta_data_probe_failures:
+            meta_data_cache_updates.append( (file, file_stat) )
     
-    else:
-        print('--File Not Renamed: %s' % (file_path))
+    return file
+
+
+### Add any files with meta data read when first used (see getMissingFileMetaData) to the meta data cache.
+###     --> Returns a [Boolean] True if cache updated.
+def saveMissingFileMetaData():
     
-    return edit_details
+    if not meta_data_cache_updates:
+        return False
+    
+    cache_updated = updateMetaDataCache(meta_data_cache_updates)
+    meta_data_cache_updates.clear()
+    return cache_updated
 
 
-### Skip any files that already had a name matching previous rename attempts (and not overwritten).
-### Note: This keeps the starting and ending COUNT exactly as typed with no skipping numbers.
-### (3,9) will always be (3,9) and not (5,9) due to files with that same name/count already existing.
-###     (file_path) The full path to a file to check.
-###     (skipped_files) A list of files flagged to skip.
-###     --> Returns a [Boolean]
-def checkForSkippedFiles(file_path, skipped_files):
-    skip_file = False
-    for file in skipped_files:
-        if file == file_path:
-            skip_file = True
-            break
-    return skip_file
+### Add any files with searched contents (see getCachedFileContentsSearchResults) to the contents cache.
+###     --> Returns a [Boolean] True if cache updated.
+def saveSearchedFileContents():
+    
+    if not contents_cache_updates:
+        return False
+    
+    cache_updated = updateContentsCache(contents_cache_updates)
+    contents_cache_updates.clear()
+    return cache_updated
 
 
-### Get the text from a Tuples() that requires an OPTION on how to handle it.
-###     (dynamic_text_data) The dynamic text Tuple.
-###     (the_dynamic_text) The dynamic text/number to insert into the regular text.
-###     (insert_file_name_options) The insert file name text modify options.
-###     --> Returns a [String]
-def getDynamicText(dynamic_text_data, the_dynamic_text, insert_file_name_options = None):
+### Read the type and mime of a single file. (META_EXTRACTOR_TYPE)
+###     (file) A FileMeta of a single file.
+###     --> Returns a [FileMeta]
+def getFileTypeMetaData(file):
     
-    if type(dynamic_text_data) != tuple:
-        return dynamic_text_data
+    file_path = file[FILE_META_PATH]
+    file_meta_type, file_meta_mime = None, None
     
-    starting_text = dynamic_text_data[STARTING_TEXT]
-    middle_text = ''
+    try:
+        # Read the file header only once and check all file types using it.
+        file_header = filetype.utils.get_signature_bytes(file_path)
+        file_type = filetype.guess(file_header)
+        is_audio = filetype.is_audio(file_header)
+        is_font = filetype.is_font(file_header)
+        is_image = filetype.is_image(file_header)
+        is_video = filetype.is_video(file_header)
+        is_app = None
+        is_message = None
+        is_model = None
+        is_multipart = None
+        is_text = None
+        is_archive = filetype.is_archive(file_header)
+        is_doc = None
+        is_presentation = None
+        is_spead_sheet = None
+    except:
+        if debug: print('-FileType Failed')
+        file_type, is_audio, is_font, is_image, is_video, is_app, is_message = None,None,None,None,None,None,None
+        is_model, is_multipart, is_text, is_archive, is_doc, is_presentation, is_spead_sheet = None,None,None,None,None,None,None
     
-    digits = len(str(the_dynamic_text))
-    min_digits = getSpecificOption(insert_file_name_options, MINIMUM_DIGITS, 0)
-    min_digits -= digits - 1
+    file.sniffed_types = tuple( sniffed_type for sniffed_type, is_type in [('archive', is_archive), ('audio', is_audio), ('font', is_font),
+                                                                          ('image', is_image), ('video', is_video)] if is_type )
     
-    while min_digits > 1:
-        middle_text += '0'
-        min_digits -= 1
+    mime_type = guessMimeType(''.join(Path(file_path).suffixes[-2:]))
     
-    middle_text += str(the_dynamic_text)
-    if REGEX in insert_file_name_options: # ':' used to separate plain text from the RE used. (Could a ':' cause problems with RE?)
-        middle_text = ':'+middle_text+':' # ':' will be removed later
-    ending_text = dynamic_text_data[ENDING_TEXT] if len(dynamic_text_data) > 2 else ''
-    dynamic_text = starting_text + middle_text + ending_text
+    if debug:
+        print(f'file_type: {file_type}')
+        print(f'mime_type: ({mime_type[0]}, {mime_type[1]})')
     
-    return dynamic_text
-
-
-### Get all text needed to make a proper search.
-###     (search_data) All the search or match data.
-###     (ignore_data) All the ignore data.
-###     (file_path) The file path with a file name that will be searched through.
-###     --> Returns a [List] and [String] and [List] and [String]
-def getSearchData(search_data, ignore_data, file_path):
+    file_type_basic = None
+    if file_type:
+        #print('File extension: %s' % file_type.extension)
+        #print('File MIME type: %s' % file_type.mime)
+        file_meta_mime = file_type.mime
+    #print('is_archive: %s' % is_archive)
+    
+    # Last chance to find mime
+    if mime_type[0] and not file_meta_mime:
+        file_meta_mime = mime_type[0]
     
-    match_file_name_list = getTextList(search_data)
-    ignore_file_name_list = getTextList(ignore_data, [])
-    match_file_name_options = getOptions(search_data)
-    ignore_file_name_options = getOptions(ignore_data)
-    searchable_match_file_name = [file_path.name]
-    searchable_ignore_file_name = [file_path.name]
+    if file_meta_mime:
+        
+        file_type_basic = file_meta_mime.split('/')[0]
+        
+        # Basic Types
+        if file_type_basic == 'application':
+            file_meta_type = TYPE_APPLICATION
+        elif is_audio or file_type_basic == 'audio':
+            file_meta_type = TYPE_AUDIO
+        elif is_font or file_type_basic == 'font':
+            file_meta_type = TYPE_FONT
+        elif is_image or file_type_basic == 'image':
+            file_meta_type = TYPE_IMAGE
+        elif file_type_basic == 'message':
+            file_meta_type = TYPE_MESSAGE
+        elif file_type_basic == 'model':
+            file_meta_type = TYPE_MODEL
+        elif file_type_basic == 'multipart':
+            file_meta_type = TYPE_MULTIPART
+        elif file_type_basic == 'text':
+            file_meta_type = TYPE_TEXT
+        elif is_video or file_type_basic == 'video':
+            file_meta_type = TYPE_VIDEO
+        
+        # Application Types (TYPE_APPLICATION will still match these)
+        if is_archive or file_type_basic in ARCHIVE_MIMES:
+            file_meta_type = TYPE_ARCHIVE
+        if file_type_basic in DOCUMENT_MIMES:
+            file_meta_type = TYPE_DOCUMENT
+    
+    if debug:
+        # Basic Types
+        is_app = file_type_basic == 'application'
+        is_audio = file_type_basic == 'audio'
+        is_font = file_type_basic == 'font'
+        is_image = file_type_basic == 'image'
+        is_message = file_type_basic == 'message'
+        is_model = file_type_basic == 'model'
+        is_multipart = file_type_basic == 'multipart'
+        is_text = file_type_basic == 'text'
+        is_video = file_type_basic == 'video'
+        
+        # Application Types
+        if not is_archive:
+            is_archive = file_meta_mime in ARCHIVE_MIMES
+        is_doc = file_meta_mime in DOCUMENT_MIMES
+        
+        print(f'file_meta_type: {file_meta_type}')
+        print(f'file_meta_mime: {file_meta_mime}')
+        print(f'is_app: {is_app}')
+        print(f'is_archive: {is_archive}')
+        print(f'is_audio: {is_audio}')
+        print(f'is_font: {is_font}')
+        print(f'is_image: {is_image}')
+        print(f'is_text: {is_text}')
+        print(f'is_doc: {is_doc}')
+        print(f'is_spead_sheet: {is_spead_sheet}')
+        print(f'is_presentation: {is_presentation}')
+        print(f'is_video: {is_video}')
+    
+    file.updateExtraMeta( { FILE_META_TYPE : file_meta_type, FILE_META_MIME : file_meta_mime } )
+    file.addExtractors( {META_EXTRACTOR_TYPE} )
+    return file
+
+
+### Read the format, stream and audio tag meta data of a single file using ffprobe. (META_EXTRACTOR_STREAM/AUDIO/TAGS)
+### Only the entries and streams needed by the extractors are asked for, and ffprobe is stopped after probe_timeout seconds.
+###     (file) A FileMeta of a single file, with it's type already read.
+###     (extractors) A Set of META_EXTRACTOR_* constants, only the meta data of these extractors is read.
+###     --> Returns a [Boolean] True if file was probed.
+def getProbedMetaData(file, extractors):
+    
+    file_path = file[FILE_META_PATH]
+    file_meta_type = file[FILE_META_TYPE]
+    is_audio = 'audio' in file.sniffed_types
+    is_video = 'video' in file.sniffed_types
+    
+    stream_entries = []
+    if META_EXTRACTOR_STREAM in extractors:
+        stream_entries += ['codec_name', 'codec_long_name', 'height', 'coded_height', 'width', 'coded_width', 'duration',
+                           'bits_per_raw_sample', 'bit_rate', 'r_frame_rate', 'avg_frame_rate']
+    if META_EXTRACTOR_AUDIO in extractors:
+        stream_entries += ['bit_rate', 'sample_rate', 'channels', 'channel_layout']
+    
+    show_entries = []
+    if stream_entries:
+        show_entries.append('stream=' + ','.join(dict.fromkeys(stream_entries)))
+    if META_EXTRACTOR_TAGS in extractors:
+        show_entries.append('format_tags=title,album,artist,album_artist,date,genre,publisher,track')
+    
+    # The first stream, or the first audio stream if only audio meta data is needed.
+    select_streams = None
+    if META_EXTRACTOR_STREAM in extractors and META_EXTRACTOR_AUDIO not in extractors:
+        select_streams = '0'
+    elif META_EXTRACTOR_AUDIO in extractors and META_EXTRACTOR_STREAM not in extractors:
+        select_streams = 'a:0'
+    
+    probe_command = ['ffprobe', '-v', 'error', '-print_format', 'json', '-show_entries', ':'.join(show_entries)]
+    if select_streams:
+        probe_command += ['-select_streams', select_streams]
+    probe_command.append(str(file_path))
+    
+    probe = None
+    try:
+        probe_results = subprocess.run(probe_command, capture_output=True, timeout=probe_timeout)
+        if probe_results.returncode == 0:
+            probe = json.loads(probe_results.stdout.decode('utf-8'))
+            if debug:
+                print('-Probe Good')
+                print(probe)
+        elif debug:
+            #print(probe_results.stderr)
+            print('-Probe Failed')
+    except subprocess.TimeoutExpired:
+        print(f'\nWARNING: Probing file timed out after {probe_timeout} seconds: [ {file_path} ]')
+    except (OSError, ValueError) as e:
+        if debug: print(f'-Probe Failed: {e}')
+    
+    if not probe:
+        meta_data_probe_failures.add(str(file_path))
+        return False
     
-    TEXT_LIST, OPTIONS, SEARCHABLE_NAME = 0,1,2
-    data_loop = [[match_file_name_list, match_file_name_options, searchable_match_file_name],
-                 [ignore_file_name_list, ignore_file_name_options, searchable_ignore_file_name]]
+    stream = probe.get('streams', [])
+    format = probe.get('format', {})
+    first_stream = stream[0] if len(stream) > 0 else {}
+    if select_streams == 'a:0' or not is_video:
+        audio_stream = first_stream
+    else:
+        audio_stream = stream[1] if len(stream) > 1 else {}
     
-    for data in data_loop:
+    if META_EXTRACTOR_STREAM in extractors:
+        format_short = first_stream.get('codec_name')
+        format_long = first_stream.get('codec_long_name')
         
-        # Default MATCH_CASE
-        if NO_MATCH_CASE in data[OPTIONS]:
-            
-            i = 0
-            while i < len(data[TEXT_LIST]):
-                text = data[TEXT_LIST].pop(i)
-                data[TEXT_LIST].insert(i, text.casefold())
-                i += 1
-            
-            data[SEARCHABLE_NAME][0] = file_path.name.casefold()
+        height, width = None, None
+        if file_meta_type == TYPE_IMAGE or file_meta_type == TYPE_VIDEO:
+            height = first_stream.get('height')
+            if not height: height = first_stream.get('coded_height')
+            width = first_stream.get('width')
+            if not width: width = first_stream.get('coded_width')
         
-        if EXTENSION in data[OPTIONS]:
-            
-            if REGEX not in data[OPTIONS]:
-                i = 0
-                while i < len(data[TEXT_LIST]):
-                    if data[TEXT_LIST][i] != '' and data[TEXT_LIST][i].find('.') != 0:
-                        text = data[TEXT_LIST].pop(i)
-                        data[TEXT_LIST].insert(i, '.'+text) # Add a '.' if missing
-                    i += 1
-            
-            if NO_MATCH_CASE in data[OPTIONS]:
-                ext = file_path.suffix
-                data[SEARCHABLE_NAME][0] = ext.casefold()
-            else:
-                data[SEARCHABLE_NAME][0] = file_path.suffix
+        duration = first_stream.get('duration')
+        bit_depth = first_stream.get('bits_per_raw_sample')
+        if bit_depth: bit_depth = int(bit_depth)
+        
+        video_bit_rate = first_stream.get('bit_rate') if is_video else None
+        if video_bit_rate: video_bit_rate = float(video_bit_rate) / 1000
+        
+        frame_rate = first_stream.get('r_frame_rate')
+        if not frame_rate or frame_rate == '0/0': frame_rate = first_stream.get('avg_frame_rate')
+        if frame_rate and is_video:
+            numerator, slash, denominator = frame_rate.partition('/')
+            frame_rate = int(numerator) / int(denominator) if slash and int(denominator) else None # '0/0' if unknown
+        
+        file.updateExtraMeta( { FILE_META_FORMAT : format_short, FILE_META_FORMAT_LONG : format_long, FILE_META_HEIGHT : height,
+                                  FILE_META_WIDTH : width, FILE_META_LENGTH : duration, FILE_META_BIT_DEPTH : bit_depth,
+                                  FILE_META_VIDEO_BITRATE : video_bit_rate, FILE_META_VIDEO_FRAME_RATE : frame_rate } )
+    
+    if META_EXTRACTOR_AUDIO in extractors:
+        audio_bit_rate = None
+        if is_video or is_audio:
+            audio_bit_rate = audio_stream.get('bit_rate')
+        if audio_bit_rate: audio_bit_rate = float(audio_bit_rate) / 1000
+        
+        sample_rate = audio_stream.get('sample_rate')
+        if sample_rate: sample_rate = float(sample_rate) / 1000
+        
+        channels = audio_stream.get('channels')
+        if channels: channels = int(channels)
+        channel_layout = audio_stream.get('channel_layout')
+        
+        file.updateExtraMeta( { FILE_META_AUDIO_BITRATE : audio_bit_rate, FILE_META_AUDIO_SAMPLE_RATE : sample_rate,
+                                  FILE_META_AUDIO_CHANNELS : channels, FILE_META_AUDIO_CHANNEL_LAYOUT : channel_layout } )
+    
+    if META_EXTRACTOR_TAGS in extractors and is_audio:
+        audio_tags = format.get('tags', {})
+        title = audio_tags.get('title')
+        album = audio_tags.get('album')
+        artist = audio_tags.get('artist')
+        if not artist: artist = audio_tags.get('album_artist')
+        date = getTagNumber(audio_tags.get('date'))
+        genre = audio_tags.get('genre')
+        publisher = audio_tags.get('publisher')
+        track_number = getTagNumber(audio_tags.get('track'))
+        
+        file.updateExtraMeta( { FILE_META_AUDIO_TITLE : title, FILE_META_AUDIO_ALBUM : album, FILE_META_AUDIO_ARTIST : artist,
+                                  FILE_META_AUDIO_YEAR : date, FILE_META_AUDIO_GENRE : genre, FILE_META_AUDIO_PUBLISHER : publisher,
+                                  FILE_META_AUDIO_TRACK : track_number } )
     
-    return match_file_name_list, searchable_match_file_name[0], ignore_file_name_list, searchable_ignore_file_name[0]
+    return True
 
 
-### Search current file name for specific text. Return -1 or 0+ (search_index).
-###     (match_file_name_list) List of text to match.
-###     (searchable_match_file_name) Searchable file name String.
-###     (match_file_name_options) The match file name text search options.
-###     (insert_file_name_options) The insert file name text modify options.
-###     --> Returns a [Integer] and [Boolean] and [List]
-def getFileNameSearchResults(match_file_name_list, searchable_match_file_name, match_file_name_options, insert_file_name_options):
-    search_index, i = -1, -1
-    edit_extension = False
-    compiled_match_data = []
+### Read the format, dimensions, bit depth and date taken of a single image without ffprobe. (META_EXTRACTOR_STREAM/AUDIO/EXIF)
+### Supported images: PNG, JPEG, GIF, BMP, WebP. All other files (or images that can't be read) still need to be probed.
+###     (file) A FileMeta of a single file, with it's type already read.
+###     (extractors) A Set of META_EXTRACTOR_* constants.
+###     --> Returns a [Boolean] True if image was read.
+def getImageMetaData(file, extractors):
     
-    match_all = MATCH_ALL_INDEXES in match_file_name_options
-    search_from_right = SEARCH_FROM_RIGHT in match_file_name_options
-    match_limit = getSpecificOption(match_file_name_options, MATCH_LIMIT, ALL)
-    match_limit = ALL if match_limit <= NO_LIMIT else match_limit # NO_LIMIT(-1) == ALL(999)
+    try:
+        image_meta = readImageHeader(file[FILE_META_PATH], META_EXTRACTOR_EXIF in extractors)
+    except (OSError, struct.error, IndexError, ValueError):
+        image_meta = None
+    
+    if not image_meta:
+        if debug: print('-Image Header Failed')
+        return False
     
-    full_match = FULL_MATCH in match_file_name_options
-    regex = REGEX in match_file_name_options
+    format_short, format_long, height, width, bit_depth, date_taken = image_meta
     
-    match_extension = EXTENSION in match_file_name_options
-    modify_extension = EXTENSION in insert_file_name_options
+    # Same meta data as ffprobe (still images have no length, bitrates or audio)
+    if META_EXTRACTOR_STREAM in extractors:
+        if file[FILE_META_TYPE] != TYPE_IMAGE:
+            height, width = None, None
+        file.updateExtraMeta( { FILE_META_FORMAT : format_short, FILE_META_FORMAT_LONG : format_long, FILE_META_HEIGHT : height,
+                                FILE_META_WIDTH : width, FILE_META_BIT_DEPTH : bit_depth } )
     
-    for match_file_name_text in match_file_name_list:
-        i += 1
+    if META_EXTRACTOR_EXIF in extractors:
+        file.updateExtraMeta( { FILE_META_DATE_TAKEN : date_taken } )
+    
+    file.addExtractors(extractors & {META_EXTRACTOR_STREAM, META_EXTRACTOR_AUDIO, META_EXTRACTOR_EXIF})
+    return True
+
+
+### Read an image's header, only reading the first few small parts of a file needed.
+###     (file_path) The full path to an image file.
+###     (read_exif) Also search for the EXIF date and time the image was taken.
+###     --> Returns a [Tuple] (format, format long, height, width, bit depth, date taken) or None if not a supported image.
+def readImageHeader(file_path, read_exif = False):
+    
+    date_taken = None
+    
+    with open(file_path, 'rb') as image:
+        header = image.read(32)
         
-        if regex:
-            # Make a regular expression match.
-            re_pattern = re.compile(match_file_name_text)
-            if match_extension:
-                re_matches = re_pattern.fullmatch(searchable_match_file_name) # A perfect match
-                edit_extension = True
+        if header.startswith(b'\x89PNG\r\n\x1a\n'):
+            width, height, bit_depth = struct.unpack('>IIB', header[16:25])
+            
+            # EXIF is stored in an "eXIf" chunk before the image data "IDAT".
+            if read_exif:
+                image.seek(8)
+                while True:
+                    chunk_header = image.read(8)
+                    if len(chunk_header) < 8: break
+                    chunk_size, chunk_type = struct.unpack('>I4s', chunk_header)
+                    if chunk_type == b'eXIf':
+                        date_taken = getExifDateTaken(image.read(chunk_size))
+                        break
+                    if chunk_type == b'IDAT' or chunk_type == b'IEND': break
+                    image.seek(chunk_size + 4, os.SEEK_CUR) # + CRC
+            
+            return ('png', 'PNG (Portable Network Graphics) image', height, width, bit_depth, date_taken)
+        
+        elif header.startswith(b'\xff\xd8'):
+            
+            # Go through each JPEG segment until the frame header (SOF) is found, EXIF (APP1) is always before it.
+            image.seek(2)
+            while True:
+                marker = image.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF: return None
+                while marker[1] == 0xFF: # Padding
+                    marker = marker[1:] + image.read(1)
+                
+                if 0xD0 <= marker[1] <= 0xD9 or marker[1] == 0x01: # No segment size
+                    if marker[1] == 0xD9: return None # End of image
+                    continue
+                
+                segment_size = struct.unpack('>H', image.read(2))[0] - 2
+                
+                if marker[1] in (0xC0,0xC1,0xC2,0xC3,0xC5,0xC6,0xC7,0xC9,0xCA,0xCB,0xCD,0xCE,0xCF):
+                    bit_depth, height, width = struct.unpack('>BHH', image.read(5))
+                    return ('mjpeg', 'Motion JPEG', height, width, bit_depth, date_taken)
+                
+                elif marker[1] == 0xDA: # Image data started before a frame header found
+                    return None
+                
+                elif marker[1] == 0xE1 and read_exif and not date_taken:
+                    segment = image.read(segment_size)
+                    if segment.startswith(b'Exif\x00\x00'):
+                        date_taken = getExifDateTaken(segment[6:])
+                
+                else:
+                    image.seek(segment_size, os.SEEK_CUR)
+        
+        elif header.startswith(b'GIF87a') or header.startswith(b'GIF89a'):
+            width, height, packed_fields = struct.unpack('<HHB', header[6:11])
+            bit_depth = ((packed_fields >> 4) & 7) + 1 # Color resolution
+            return ('gif', 'CompuServe GIF (Graphics Interchange Format)', height, width, bit_depth, date_taken)
+        
+        elif header.startswith(b'BM'):
+            dib_header_size = struct.unpack('<I', header[14:18])[0]
+            if dib_header_size == 12: # OS/2
+                width, height, planes, bit_count = struct.unpack('<HHHH', header[18:26])
+            else:
+                width, height, planes, bit_count = struct.unpack('<iiHH', header[18:30])
+            bit_depth = bit_count if bit_count < 24 else 8 # Per color
+            return ('bmp', 'BMP (Windows and OS/2 bitmap)', abs(height), width, bit_depth, date_taken)
+        
+        elif header.startswith(b'RIFF') and header[8:12] == b'WEBP':
+            chunk_type = header[12:16]
+            if chunk_type == b'VP8X':
+                width = int.from_bytes(header[24:27], 'little') + 1
+                height = int.from_bytes(header[27:30], 'little') + 1
+            elif chunk_type == b'VP8 ' and header[23:26] == b'\x9d\x01\x2a':
+                width, height = struct.unpack('<HH', header[26:30])
+                width, height = width & 0x3FFF, height & 0x3FFF
+            elif chunk_type == b'VP8L' and header[20] == 0x2F:
+                bits = int.from_bytes(header[21:25], 'little')
+                width = (bits & 0x3FFF) + 1
+                height = ((bits >> 14) & 0x3FFF) + 1
+            else:
+                return None
+            
+            # EXIF is stored in an "EXIF" chunk, only found in extended (VP8X) WebP images.
+            if read_exif and chunk_type == b'VP8X':
+                image.seek(12)
+                while True:
+                    chunk_header = image.read(8)
+                    if len(chunk_header) < 8: break
+                    chunk_type, chunk_size = struct.unpack('<4sI', chunk_header)
+                    if chunk_type == b'EXIF':
+                        exif = image.read(chunk_size)
+                        date_taken = getExifDateTaken(exif[6:] if exif.startswith(b'Exif\x00\x00') else exif)
+                        break
+                    image.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR) # Padded to even size
+            
+            return ('webp', 'WebP', height, width, 8, date_taken)
+    
+    return None
+
+
+### Find the date and time an image was taken (DateTimeOriginal) in EXIF data.
+###     (exif) The EXIF data, starting with it's TIFF header.
+###     --> Returns a [Float] timestamp or None if not found.
+def getExifDateTaken(exif):
+    
+    byte_order = '<' if exif[:2] == b'II' else '>'
+    
+    try:
+        ifd0_offset = struct.unpack(byte_order + 'I', exif[4:8])[0]
+        exif_ifd_offset = findExifTag(exif, byte_order, ifd0_offset, 0x8769) # Exif IFD Pointer
+        if not exif_ifd_offset:
+            return None
+        
+        date_offset = findExifTag(exif, byte_order, exif_ifd_offset, 0x9003) # DateTimeOriginal
+        if not date_offset:
+            return None
+        
+        date_text = exif[date_offset:date_offset+19].decode('ascii')
+        return datetime.strptime(date_text, '%Y:%m:%d %H:%M:%S').timestamp()
+    
+    except (struct.error, ValueError, OverflowError):
+        return None # Corrupt EXIF data or unknown date (Ex. '0000:00:00 00:00:00')
+
+
+### Search an EXIF IFD (list of tags) for a specific tag.
+###     (exif) The EXIF data, starting with it's TIFF header.
+###     (byte_order) '<' little endian or '>' big endian.
+###     (ifd_offset) Where the IFD starts in the EXIF data.
+###     (tag_to_find) The tag ID.
+###     --> Returns a [Integer] The tag's value (or offset to value) or None if not found.
+def findExifTag(exif, byte_order, ifd_offset, tag_to_find):
+    tag_amount = struct.unpack(byte_order + 'H', exif[ifd_offset:ifd_offset+2])[0]
+    for n in range(tag_amount):
+        tag_entry = ifd_offset + 2 + n * 12
+        tag, tag_type, count, value = struct.unpack(byte_order + 'HHII', exif[tag_entry:tag_entry+12])
+        if tag == tag_to_find:
+            return value
+    return None
+
+
+### Read the format, dimensions, length, bitrate and frame rate of a single video without ffprobe. (META_EXTRACTOR_STREAM)
+### Supported videos: MP4/MOV and Matroska/WebM, when the first track is a video track with a known codec.
+### All other files (or videos that can't be read) still need to be probed.
+###     (file) A FileMeta of a single file, with it's type already read.
+###     --> Returns a [Boolean] True if video was read.
+def getVideoMetaData(file):
+    
+    try:
+        video_meta = readVideoHeader(file[FILE_META_PATH])
+    except (OSError, struct.error, IndexError, ValueError, ZeroDivisionError):
+        video_meta = None
+    
+    if not video_meta:
+        if debug: print('-Video Header Failed')
+        return False
+    
+    format_short, format_long, height, width, duration, bit_depth, video_bit_rate, frame_rate = video_meta
+    
+    # Same meta data as ffprobe
+    if file[FILE_META_TYPE] != TYPE_IMAGE and file[FILE_META_TYPE] != TYPE_VIDEO:
+        height, width = None, None
+    if duration != None: duration = f'{duration:.6f}'
+    if video_bit_rate: video_bit_rate = video_bit_rate / 1000
+    
+    file.updateExtraMeta( { FILE_META_FORMAT : format_short, FILE_META_FORMAT_LONG : format_long, FILE_META_HEIGHT : height,
+                            FILE_META_WIDTH : width, FILE_META_LENGTH : duration, FILE_META_BIT_DEPTH : bit_depth,
+                            FILE_META_VIDEO_BITRATE : video_bit_rate, FILE_META_VIDEO_FRAME_RATE : frame_rate } )
+    file.addExtractors( {META_EXTRACTOR_STREAM} )
+    return True
+
+
+### Read a video's container header, seeking past the media data.
+###     (file_path) The full path to a video file.
+###     --> Returns a [Tuple] (format, format long, height, width, length, bit depth, bitrate, frame rate) or None if not supported.
+def readVideoHeader(file_path):
+    
+    with open(file_path, 'rb') as video:
+        header = video.read(12)
+        video.seek(0)
+        
+        if header[4:8] in [b'ftyp', b'moov', b'mdat', b'free', b'wide']:
+            return readMp4Header(video)
+        elif header.startswith(b'\x1a\x45\xdf\xa3'):
+            return readMatroskaHeader(video)
+    
+    return None
+
+
+### Read the first track of a MP4/MOV file, found in the "moov" atom.
+###     (video) An opened MP4/MOV file.
+###     --> Returns a [Tuple] or None
+def readMp4Header(video):
+    
+    # Find the "moov" atom, which can be before or after the media data "mdat".
+    moov = None
+    while not moov:
+        atom_header = video.read(8)
+        if len(atom_header) < 8:
+            return None
+        atom_size, atom_type = struct.unpack('>I4s', atom_header)
+        header_size = 8
+        if atom_size == 1: # 64-bit size
+            atom_size = struct.unpack('>Q', video.read(8))[0]
+            header_size = 16
+        elif atom_size == 0: # Last atom, to the end of file
+            atom_size = os.fstat(video.fileno()).st_size - video.tell() + 8
+        if atom_size < header_size:
+            return None
+        
+        if atom_type == b'moov':
+            moov = video.read(atom_size - header_size)
+        else:
+            video.seek(atom_size - header_size, os.SEEK_CUR)
+    
+    trak = findMp4Atom(moov, [b'trak'])
+    mdia = findMp4Atom(trak, [b'mdia']) if trak else None
+    if not mdia:
+        return None
+    
+    hdlr = findMp4Atom(mdia, [b'hdlr'])
+    if not hdlr or hdlr[8:12] != b'vide': # First track isn't a video track
+        return None
+    
+    mdhd = findMp4Atom(mdia, [b'mdhd'])
+    if mdhd[0] == 1: # Version 1 (64-bit times)
+        timescale, duration = struct.unpack('>IQ', mdhd[20:32])
+    else:
+        timescale, duration = struct.unpack('>II', mdhd[12:20])
+    
+    stbl = findMp4Atom(mdia, [b'minf', b'stbl'])
+    stsd = findMp4Atom(stbl, [b'stsd'])
+    codec_tag = stsd[12:16]
+    codec = VIDEO_CODECS.get(codec_tag)
+    if not codec:
+        return None
+    
+    # Visual sample entry: width and height, followed by it's own atoms (avcC, hvcC...)
+    sample_entry = stsd[8 : 8+struct.unpack('>I', stsd[8:12])[0]]
+    width, height = struct.unpack('>HH', sample_entry[32:36])
+    codec_config = findMp4Atom(sample_entry[86:], [b'avcC']) or findMp4Atom(sample_entry[86:], [b'hvcC'])
+    bit_depth = getVideoCodecBitDepth(codec[0], codec_config)
+    
+    length = duration / timescale if timescale else None
+    
+    # Frame rate: a single sample duration means a constant frame rate.
+    frame_rate = None
+    stts = findMp4Atom(stbl, [b'stts'])
+    if stts:
+        stts_entries = struct.unpack('>I', stts[4:8])[0]
+        if stts_entries == 1:
+            sample_delta = struct.unpack('>I', stts[12:16])[0]
+            frame_rate = timescale / sample_delta if sample_delta else None
+    
+    # Bitrate: The size of all the video samples over the length of the video.
+    video_bit_rate = None
+    stsz = findMp4Atom(stbl, [b'stsz'])
+    if stsz and length:
+        sample_size, sample_count = struct.unpack('>II', stsz[4:12])
+        if sample_size:
+            video_size = sample_size * sample_count
+        else:
+            video_size = sum(struct.unpack(f'>{sample_count}I', stsz[12 : 12+sample_count*4]))
+        video_bit_rate = round(video_size * 8 / length)
+        if not frame_rate:
+            frame_rate = sample_count / length
+    
+    return (codec[0], codec[1], height, width, length, bit_depth, video_bit_rate, frame_rate)
+
+
+### Find an atom (box) inside another atom's data.
+###     (data) The data inside an atom.
+###     (atom_path) A List of atom types to search down through. Ex. [b'minf', b'stbl']
+###     --> Returns [Bytes] the data inside the atom found or None
+def findMp4Atom(data, atom_path):
+    
+    for atom_type in atom_path:
+        i = 0
+        found = None
+        
+        while i + 8 <= len(data):
+            atom_size, this_atom_type = struct.unpack('>I4s', data[i:i+8])
+            if atom_size < 8: break
+            if this_atom_type == atom_type:
+                found = data[ i+8 : i+atom_size ]
+                break
+            i += atom_size
+        
+        if found == None:
+            return None
+        data = found
+    
+    return data
+
+
+### Read the first track of a Matroska/WebM file, found in the "Segment" element's "Info" and "Tracks" elements.
+###     (video) An opened Matroska/WebM file.
+###     --> Returns a [Tuple] or None
+def readMatroskaHeader(video):
+    
+    # EBML header
+    element_id, element_size = readEbmlElementHeader(video)
+    video.seek(element_size, os.SEEK_CUR)
+    
+    element_id, element_size = readEbmlElementHeader(video)
+    if element_id != 0x18538067: # Segment
+        return None
+    
+    info, tracks = None, None
+    while info == None or tracks == None:
+        element_id, element_size = readEbmlElementHeader(video)
+        if element_id == None or element_id == 0x1F43B675: # Cluster (media data)
+            break
+        if element_size == None: # Unknown size
+            return None
+        
+        if element_id == 0x1549A966: # Info
+            info = readEbmlElements(video.read(element_size))
+        elif element_id == 0x1654AE6B: # Tracks
+            tracks = readEbmlElements(video.read(element_size), True)
+        else:
+            video.seek(element_size, os.SEEK_CUR)
+    
+    if not tracks:
+        return None
+    
+    track = readEbmlElements(tracks[0xAE][0]) if 0xAE in tracks else {} # First TrackEntry
+    if getEbmlUnsignedInteger(track.get(0x83, b'')) != 1: # TrackType: Video
+        return None
+    
+    codec = VIDEO_CODECS.get(track.get(0x86, b'').decode('ascii', errors='replace').rstrip('\x00'))
+    if not codec:
+        return None
+    
+    track_video = readEbmlElements(track.get(0xE0, b''))
+    width = getEbmlUnsignedInteger(track_video.get(0xB0, b''))
+    height = getEbmlUnsignedInteger(track_video.get(0xBA, b''))
+    bit_depth = getVideoCodecBitDepth(codec[0], track.get(0x63A2))
+    
+    frame_duration = getEbmlUnsignedInteger(track.get(0x23E383, b'')) # DefaultDuration in nanoseconds
+    frame_rate = 1000000000 / frame_duration if frame_duration else None
+    
+    length = None
+    if info and 0x4489 in info: # Duration
+        timestamp_scale = getEbmlUnsignedInteger(info.get(0x2AD7B1, b'')) or 1000000
+        duration_data = info[0x4489]
+        duration = struct.unpack('>f' if len(duration_data) == 4 else '>d', duration_data)[0]
+        length = duration * timestamp_scale / 1000000000
+    
+    # Matroska has no stream bitrate in it's header, same as ffprobe.
+    return (codec[0], codec[1], height, width, length, bit_depth, None, frame_rate)
+
+
+### Read the ID and data size of an EBML element (Matroska).
+###     (video) An opened Matroska file, at the start of an element.
+###     --> Returns a [Tuple] (ID, size), (ID, None) if the size is unknown or (None, None) at the end of the file.
+def readEbmlElementHeader(video):
+    
+    element_id = readEbmlVariableInteger(video, True)
+    if element_id == None:
+        return (None, None)
+    element_size = readEbmlVariableInteger(video)
+    return (element_id, element_size)
+
+
+### Read an EBML variable length integer.
+###     (video) An opened Matroska file.
+###     (keep_marker) Keep the length marker bit (element IDs).
+###     --> Returns a [Integer] or None at the end of the file or if all the value bits are set (unknown size).
+def readEbmlVariableInteger(video, keep_marker = False):
+    
+    first_byte = video.read(1)
+    if not first_byte or first_byte[0] == 0:
+        return None
+    
+    length = 8 - first_byte[0].bit_length() + 1
+    data = first_byte + video.read(length - 1)
+    value = int.from_bytes(data, 'big')
+    
+    if keep_marker:
+        return value
+    
+    value &= (1 << (7 * length)) - 1
+    if value == (1 << (7 * length)) - 1:
+        return None
+    return value
+
+
+### Read all the child elements of an EBML element.
+###     (data) The data inside an element.
+###     (all_values) Keep every value of an element ID in a List, not just the first.
+###     --> Returns a [Dictionary] {ID : data}
+def readEbmlElements(data, all_values = False):
+    
+    elements = {}
+    reader = io.BytesIO(data)
+    
+    while True:
+        element_id, element_size = readEbmlElementHeader(reader)
+        if element_id == None or element_size == None:
+            break
+        element_data = reader.read(element_size)
+        if all_values:
+            elements.setdefault(element_id, []).append(element_data)
+        elif element_id not in elements:
+            elements[element_id] = element_data
+    
+    return elements
+
+
+### Convert EBML unsigned integer data.
+###     (data) Bytes
+###     --> Returns a [Integer] or None if no data.
+def getEbmlUnsignedInteger(data):
+    return int.from_bytes(data, 'big') if data else None
+
+
+### Get the bit depth of H.264 and H.265 video from their codec configuration (avcC or hvcC).
+###     (format_short) The short format name. Ex. 'h264'
+###     (codec_config) The codec configuration data.
+###     --> Returns a [Integer] or None if unknown.
+def getVideoCodecBitDepth(format_short, codec_config):
+    
+    if not codec_config:
+        return None
+    
+    if format_short == 'hevc' and len(codec_config) > 17:
+        return (codec_config[17] & 0x07) + 8
+    
+    if format_short == 'h264' and len(codec_config) > 5:
+        # Only the High profiles have a bit depth set after the SPS and PPS lists, all others are 8 bit.
+        if codec_config[1] not in [100, 110, 122, 144, 244]:
+            return 8
+        i = 6
+        for n in range(codec_config[5] & 0x1F): # SPS
+            i += 2 + struct.unpack('>H', codec_config[i:i+2])[0]
+        pps_amount = codec_config[i]
+        i += 1
+        for n in range(pps_amount): # PPS
+            i += 2 + struct.unpack('>H', codec_config[i:i+2])[0]
+        return (codec_config[i+1] & 0x07) + 8 if len(codec_config) > i+1 else 8
+    
+    return None
+
+
+### Read the audio tags (title, album, artist, etc.) of a single audio file without ffprobe. (META_EXTRACTOR_TAGS)
+### Supported tags: ID3v2 and ID3v1 (MP3), FLAC and Ogg (Vorbis and Opus) comments. Any other audio files still need to be probed.
+###     (file) A FileMeta of a single file.
+###     --> Returns a [Boolean] True if audio tags were read.
+def getAudioTagMetaData(file):
+    
+    try:
+        audio_tags = readAudioTags(file[FILE_META_PATH])
+    except (OSError, struct.error, IndexError, ValueError):
+        audio_tags = None
+    
+    if audio_tags == None:
+        if debug: print('-Audio Tags Failed')
+        return False
+    
+    if debug: print(audio_tags)
+    
+    # Same tags as ffprobe
+    title = audio_tags.get('title')
+    album = audio_tags.get('album')
+    artist = audio_tags.get('artist')
+    if not artist: artist = audio_tags.get('album_artist')
+    date = getTagNumber(audio_tags.get('date'))
+    genre = audio_tags.get('genre')
+    publisher = audio_tags.get('publisher')
+    track_number = getTagNumber(audio_tags.get('track'))
+    
+    file.updateExtraMeta( { FILE_META_AUDIO_TITLE : title, FILE_META_AUDIO_ALBUM : album, FILE_META_AUDIO_ARTIST : artist,
+                            FILE_META_AUDIO_YEAR : date, FILE_META_AUDIO_GENRE : genre, FILE_META_AUDIO_PUBLISHER : publisher,
+                            FILE_META_AUDIO_TRACK : track_number } )
+    file.addExtractors( {META_EXTRACTOR_TAGS} )
+    return True
+
+
+### Get the number a tag starts with, ignoring the rest of the tag.
+###     (tag) A tag's text or None. Ex. '2004', '2004-05-01', '3' or '3/12'
+###     --> Returns a [Integer] or None if the tag doesn't start with a number.
+def getTagNumber(tag):
+    number = re.match(r'\s*(\d+)', tag or '')
+    return int(number.group(1)) if number else None
+
+
+### Read the tags in an audio file, using the same tag names ffprobe uses.
+###     (file_path) The full path to an audio file.
+###     --> Returns a [Dictionary] of tags or None if tags can't be read in this type of file.
+def readAudioTags(file_path):
+    
+    with open(file_path, 'rb') as audio:
+        header = audio.read(10)
+        audio_tags = {}
+        
+        # MP3 (or FLAC) starting with ID3v2 tags
+        if header.startswith(b'ID3'):
+            tag_size = getSyncSafeInteger(header[6:10])
+            audio_tags = readID3v2Tags(header, audio.read(tag_size))
+            if audio.read(4) == b'fLaC':
+                return readFlacTags(audio)
+        
+        elif header.startswith(b'fLaC'):
+            audio.seek(4)
+            return readFlacTags(audio)
+        
+        elif header.startswith(b'OggS'):
+            audio.seek(0)
+            return readOggTags(audio)
+        
+        elif len(header) < 2 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+            return None # Not MPEG audio (MP3)
+        
+        # ID3v1 tags at the end of a file are only used if there are no ID3v2 tags.
+        if not audio_tags:
+            audio.seek(0, os.SEEK_END)
+            if audio.tell() >= 128:
+                audio.seek(-128, os.SEEK_END)
+                audio_tags = readID3v1Tags(audio.read(128))
+    
+    return audio_tags
+
+
+### Read ID3v2 (version 2.2, 2.3 and 2.4) tags.
+###     (header) The 10 byte ID3v2 header.
+###     (tag_data) All the tag data after the header.
+###     --> Returns a [Dictionary]
+def readID3v2Tags(header, tag_data):
+    
+    audio_tags = {}
+    version = header[3]
+    flags = header[5]
+    
+    if flags & 0x80 and version < 4: # Unsynchronisation
+        tag_data = tag_data.replace(b'\xff\x00', b'\xff')
+    
+    i = 0
+    if flags & 0x40 and version > 2: # Extended header
+        i = getSyncSafeInteger(tag_data[0:4]) if version == 4 else struct.unpack('>I', tag_data[0:4])[0] + 4
+    
+    frame_tags = ID3V2_2_FRAME_TAGS if version == 2 else ID3V2_FRAME_TAGS
+    frame_header_size = 6 if version == 2 else 10
+    
+    while i + frame_header_size <= len(tag_data):
+        
+        if version == 2:
+            frame_id = tag_data[i:i+3]
+            frame_size = int.from_bytes(tag_data[i+3:i+6], 'big')
+            frame_flags = 0
+        else:
+            frame_id = tag_data[i:i+4]
+            frame_size = getSyncSafeInteger(tag_data[i+4:i+8]) if version == 4 else struct.unpack('>I', tag_data[i+4:i+8])[0]
+            frame_flags = struct.unpack('>H', tag_data[i+8:i+10])[0]
+        
+        if frame_id[0] == 0:
+            break # Padding, no more frames
+        
+        frame = tag_data[ i+frame_header_size : i+frame_header_size+frame_size ]
+        i += frame_header_size + frame_size
+        
+        tag = frame_tags.get(frame_id)
+        if not tag or tag in audio_tags:
+            continue
+        
+        if version == 4:
+            if frame_flags & 0x000C: continue # Compressed or encrypted
+            if frame_flags & 0x0001: frame = frame[4:] # Data length indicator
+            if frame_flags & 0x0002: frame = frame.replace(b'\xff\x00', b'\xff') # Unsynchronisation
+        elif version == 3 and frame_flags & 0x00C0:
+            continue # Compressed or encrypted
+        
+        if not frame:
+            continue
+        
+        # Text encoding: 0 = ISO-8859-1, 1 = UTF-16 (BOM), 2 = UTF-16BE, 3 = UTF-8
+        text_encoding = ['latin-1', 'utf-16', 'utf-16-be', 'utf-8'][frame[0]] if frame[0] < 4 else 'latin-1'
+        text = frame[1:].decode(text_encoding, errors='replace').split('\x00')[0].strip()
+        if text:
+            audio_tags[tag] = text
+    
+    # Genres can be an ID3v1 genre number. Ex. '(17)' or '17' = 'Rock'
+    genre_number = re.fullmatch(r'\(?(\d+)\)?', audio_tags.get('genre', ''))
+    if genre_number and int(genre_number.group(1)) < len(ID3V1_GENRES):
+        audio_tags['genre'] = ID3V1_GENRES[int(genre_number.group(1))]
+    
+    return audio_tags
+
+
+### Read ID3v1 (and ID3v1.1) tags.
+###     (tag_data) The last 128 bytes of a file.
+###     --> Returns a [Dictionary]
+def readID3v1Tags(tag_data):
+    
+    audio_tags = {}
+    if not tag_data.startswith(b'TAG'):
+        return audio_tags
+    
+    for tag, start, end in [('title', 3, 33), ('artist', 33, 63), ('album', 63, 93), ('date', 93, 97)]:
+        text = tag_data[start:end].decode('latin-1').strip('\x00 ')
+        if text:
+            audio_tags[tag] = text
+    
+    if tag_data[125] == 0 and tag_data[126] != 0:
+        audio_tags['track'] = str(tag_data[126])
+    if tag_data[127] < len(ID3V1_GENRES):
+        audio_tags['genre'] = ID3V1_GENRES[tag_data[127]]
+    
+    return audio_tags
+
+
+### Read the Vorbis comment metadata block in a FLAC file.
+###     (audio) An opened FLAC file, at the start of the first metadata block.
+###     --> Returns a [Dictionary]
+def readFlacTags(audio):
+    
+    while True:
+        block_header = audio.read(4)
+        if len(block_header) < 4:
+            break
+        
+        block_type = block_header[0] & 0x7F
+        block_size = int.from_bytes(block_header[1:4], 'big')
+        if block_type == 4: # VORBIS_COMMENT
+            return readVorbisComments(audio.read(block_size))
+        
+        if block_header[0] & 0x80: # Last metadata block
+            break
+        audio.seek(block_size, os.SEEK_CUR)
+    
+    return {}
+
+
+### Read the Vorbis comments in an Ogg Vorbis or Opus file, found in the 2nd packet of the stream.
+###     (audio) An opened Ogg file.
+###     --> Returns a [Dictionary] or None if not Vorbis or Opus.
+def readOggTags(audio):
+    
+    packets = [b'']
+    pages_read = 0
+    
+    while len(packets) < 3 and pages_read < 100:
+        page_header = audio.read(27)
+        if len(page_header) < 27 or not page_header.startswith(b'OggS'):
+            break
+        pages_read += 1
+        
+        segment_table = audio.read(page_header[26])
+        for segment_size in segment_table:
+            packets[-1] += audio.read(segment_size)
+            if segment_size < 255: # End of packet
+                packets.append(b'')
+    
+    if len(packets) < 3:
+        return None
+    
+    comment_packet = packets[1]
+    if comment_packet.startswith(b'\x03vorbis'):
+        return readVorbisComments(comment_packet[7:])
+    elif comment_packet.startswith(b'OpusTags'):
+        return readVorbisComments(comment_packet[8:])
+    
+    return None
+
+
+### Read Vorbis comments (used by FLAC and Ogg).
+###     (comment_data) Comment data starting with the vendor string.
+###     --> Returns a [Dictionary]
+def readVorbisComments(comment_data):
+    
+    audio_tags = {}
+    vendor_size = struct.unpack('<I', comment_data[0:4])[0]
+    i = 4 + vendor_size
+    comment_amount = struct.unpack('<I', comment_data[i:i+4])[0]
+    i += 4
+    
+    for n in range(comment_amount):
+        comment_size = struct.unpack('<I', comment_data[i:i+4])[0]
+        comment = comment_data[ i+4 : i+4+comment_size ].decode('utf-8', errors='replace')
+        i += 4 + comment_size
+        
+        tag, separator, text = comment.partition('=')
+        tag = tag.lower()
+        if tag == 'albumartist': tag = 'album_artist'
+        if tag == 'tracknumber': tag = 'track'
+        if separator and text and tag not in audio_tags:
+            audio_tags[tag] = text
+    
+    return audio_tags
+
+
+### Convert a sync safe integer (ID3v2, 7 bits per byte) to a normal integer.
+###     (data) 4 bytes.
+###     --> Returns a [Integer]
+def getSyncSafeInteger(data):
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+### Guess a file's MIME type from it's extension(s). Results are remembered so each extension is only looked up once.
+### Note: mimetypes only uses the last extension and an encoding extension before it, so only pass the last two extensions.
+###     (file_extensions) A file's last two extensions joined together. Ex. '.tar.gz'
+###     --> Returns a [Tuple] (MIME type, encoding)
+@lru_cache(maxsize=4096)
+def guessMimeType(file_extensions):
+    return mimetypes.guess_type('file' + file_extensions)
+
+
+### Open the meta data cache file (only once) creating it if it doesn't exist and remove any old or excess cached files.
+###     --> Returns a [sqlite3.Connection] or None if cache file can't be opened.
+def openMetaDataCache():
+    global meta_data_cache_db
+    
+    if meta_data_cache_db:
+        return meta_data_cache_db
+    
+    if Path(meta_data_cache_file_name).is_absolute():
+        cache_file_path = Path(meta_data_cache_file_name)
+    else:
+        cache_file_path = Path(PurePath().joinpath(Path(__file__).parent, meta_data_cache_file_name))
+    
+    try:
+        db = sqlite3.connect(cache_file_path)
+        db.execute('CREATE TABLE IF NOT EXISTS file_meta (path TEXT PRIMARY KEY, size INTEGER, modified INTEGER, inode INTEGER, cached REAL, meta TEXT)')
+        db.execute('CREATE TABLE IF NOT EXISTS contents_cache (path TEXT, search TEXT, size INTEGER, modified INTEGER, inode INTEGER, cached REAL, results TEXT, PRIMARY KEY (path, search))')
+        
+        if rebuild_meta_data_cache:
+            db.execute('DELETE FROM file_meta')
+            db.execute('DELETE FROM contents_cache')
+        
+        if meta_data_cache_max_age != NO_LIMIT:
+            oldest_time = datetime.now().timestamp() - timedelta(days=meta_data_cache_max_age).total_seconds()
+            db.execute('DELETE FROM file_meta WHERE cached < ?', (oldest_time,))
+            db.execute('DELETE FROM contents_cache WHERE cached < ?', (oldest_time,))
+        
+        if meta_data_cache_max_files != NO_LIMIT:
+            db.execute('DELETE FROM file_meta WHERE path NOT IN (SELECT path FROM file_meta ORDER BY cached DESC LIMIT ?)', (meta_data_cache_max_files,))
+            db.execute('DELETE FROM contents_cache WHERE rowid NOT IN (SELECT rowid FROM contents_cache ORDER BY cached DESC LIMIT ?)', (meta_data_cache_max_files,))
+        
+        db.commit()
+    
+    except sqlite3.Error as e:
+        print(f'\nWARNING: Meta data cache could not be opened, continuing without it: [ {cache_file_path} ]')
+        print(e)
+        return None
+    
+    meta_data_cache_db = db
+    return meta_data_cache_db
+
+
+### Get the cached extra meta data of a list of files, if those files haven't changed since last cached.
+###     (files) A List of FileMeta.
+###     (file_stats) A List of each file's os.stat_result, in the same order.
+###     (extractors) A Set of META_EXTRACTOR_* constants needed, used to count cache hits and misses.
+###     --> Returns a [Boolean] True if cache was read.
+def getCachedFileMetaData(files, file_stats, extractors):
+    global meta_data_cache_hits, meta_data_cache_misses
+    
+    db = openMetaDataCache()
+    if not db:
+        return False
+    
+    for file, file_stat in zip(files, file_stats):
+        cached = db.execute('SELECT size, modified, inode, meta FROM file_meta WHERE path = ?', (str(file[FILE_META_PATH]),)).fetchone()
+        cached_meta = json.loads(cached[3]) if cached and cached[:3] == (file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino) else None
+        if type(cached_meta) == dict: # Not cached by an older version
+            file.addExtractors(cached_meta['extractors'])
+            file.sniffed_types = tuple(cached_meta['sniffed_types'])
+            file.updateExtraMeta( { int(index) : meta for index, meta in cached_meta['meta'].items() } )
+        
+        if extractors <= file.extractors:
+            meta_data_cache_hits += 1
+        else:
+            meta_data_cache_misses += 1
+    
+    return True
+
+
+### Add newly read files to the meta data cache, replacing any out of date cached files.
+###     (file_stats) A List of Tuples with a FileMeta and it's os.stat_result.
+###     --> Returns a [Boolean] True if cache updated.
+def updateMetaDataCache(file_stats):
+    
+    db = openMetaDataCache()
+    if not db:
+        return False
+    
+    cached_time = datetime.now().timestamp()
+    cache_rows = []
+    
+    for file, file_stat in file_stats:
+        cached_meta = { 'extractors' : sorted(file.extractors), 'sniffed_types' : file.sniffed_types, 'meta' : file.extra_meta or {} }
+        cache_rows.append( (str(file[FILE_META_PATH]), file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino, cached_time, json.dumps(cached_meta)) )
+    
+    try:
+        db.executemany('INSERT OR REPLACE INTO file_meta VALUES (?, ?, ?, ?, ?, ?)', cache_rows)
+        db.commit()
+    except sqlite3.Error as e:
+        print('\nWARNING: Failed to update meta data cache.')
+        print(e)
+        return False
+    
+    return True
+
+
+### Get the cached contents search results of a list of files, if those files haven't changed since last cached.
+###     (files) A List of FileMeta.
+###     (file_stats) A List of each file's os.stat_result, in the same order.
+###     (contents_search_key) The contents search the results are from. (See compilePreset)
+###     --> Returns a [Dictionary] {file path : (contents list index, List of ContentsMatch)} of only the cached files.
+def getCachedContentsResults(files, file_stats, contents_search_key):
+    global contents_cache_hits, contents_cache_misses
+    
+    contents_results = {}
+    db = openMetaDataCache()
+    if not db:
+        return contents_results
+    
+    for file, file_stat in zip(files, file_stats):
+        file_path = file[FILE_META_PATH]
+        cached = db.execute('SELECT size, modified, inode, results FROM contents_cache WHERE path = ? AND search = ?',
+                            (str(file_path), contents_search_key)).fetchone()
+        if cached and cached[:3] == (file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino):
+            contents_list_index, groups_text_list = json.loads(cached[3])
+            contents_results[file_path] = (contents_list_index, [ ContentsMatch(tuple(groups_text)) for groups_text in groups_text_list ])
+            contents_cache_hits += 1
+        else:
+            contents_cache_misses += 1
+    
+    return contents_results
+
+
+### Add newly searched files to the contents cache, replacing any out of date cached files.
+###     (cache_updates) A List of Tuples with a file path, it's os.stat_result, the contents search key (see compilePreset),
+###                     the contents list index and a List of ContentsMatch.
+###     --> Returns a [Boolean] True if cache updated.
+def updateContentsCache(cache_updates):
+    
+    db = openMetaDataCache()
+    if not db:
+        return False
+    
+    cached_time = datetime.now().timestamp()
+    cache_rows = []
+    
+    for file_path, file_stat, contents_search_key, contents_list_index, compiled_match_contents_data in cache_updates:
+        cached_results = [ contents_list_index, [ contents_match.groups_text for contents_match in compiled_match_contents_data ] ]
+        cache_rows.append( (str(file_path), contents_search_key, file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino, cached_time, json.dumps(cached_results)) )
+    
+    try:
+        db.executemany('INSERT OR REPLACE INTO contents_cache VALUES (?, ?, ?, ?, ?, ?, ?)', cache_rows)
+        db.commit()
+    except sqlite3.Error as e:
+        print('\nWARNING: Failed to update contents cache.')
+        print(e)
+        return False
+    
+    return True
+
+
+### Custom Sort function using file meta data.
+###     (file) A Tuple with the full file path and various meta data.
+###     (index) The index of which meta data to sort by.
+###     --> Returns a [String] or [Integer]
+def sortFilesByMetaData(file, index):
+    meta_data = file[index] if file[index] else -9999999999999
+    if index == 0: # File Path, Sort By Name Only.
+        meta_data = meta_data.name
+    return meta_data
+
+
+### Using the edit details create a new file name and try renaming file and updating any linked files.
+###     (edit_details) All the details on how to proceed with the file name edits.
+###     --> Returns a [Dictionary]
+def createNewFileName(edit_details):
+    
+    file_path = getTrackedData(edit_details, CURRENT_FILE_META, [FILE_META_PATH])
+    assert Path.is_file(file_path) # Error if not a file or doen't exist
+    file_name_changed = False
+    
+    skip_file = checkForSkippedFiles(file_path, getTrackedData(edit_details, SKIPPED_FILES))
+    
+    # Create The New File Name
+    if not skip_file:
+        edit_details = insertTextIntoFileName(edit_details)
+        new_file_name = getTrackedData(edit_details, CURRENT_FILE_RENAME)
+        file_name_changed = False if new_file_name == file_path.name else True
+    
+    # Now Rename The File
+    if file_name_changed:
+        new_file_path = Path(file_path.parent, new_file_name)
+        edit_details = renameFileTo(new_file_path, edit_details)
+        
+        skip_file = checkForSkippedFiles(new_file_path, getTrackedData(edit_details, SKIPPED_FILES))
+        
+        if not skip_file:
+            linked_files = getLinkedFiles(edit_details)
+            linked_files_updates = []
+            lf_backed_up = getTrackedData(edit_details, ONE_TIME_FLAGS, [LF_BACKED_UP])
+            #print('lf_backed_up: %s' % lf_backed_up)
+            
+            linked_file_encodings = getTrackedData(edit_details, LINKED_FILES_ENCODINGS)
+            i = 0
+            for file in linked_files:
+                links_updated = updateLinksInFile(file, linked_file_encodings[i], str(file_path), str(new_file_path), lf_backed_up)
+                linked_files_updates.append(links_updated)
+                i += 1
+                if links_updated:
+                    if debug: print('----Link File Updated: [ %s ]' % (file))
+                #else:
+                    #if debug: print('----Link File Not Updated: [ %s ]' % (file))
+            
+            edit_details = updateTrackedData(edit_details, { LINKED_FILES_UPDATED : linked_files_updates, ONE_TIME_FLAGS : [LF_BACKED_UP, True] })
+    
+    else:
+        print('--File Not Renamed: %s' % (file_path))
+    
+    return edit_details
+
+
+### Skip any files that already had a name matching previous rename attempts (and not overwritten).
+### Note: This keeps the starting and ending COUNT exactly as typed with no skipping numbers.
+### (3,9) will always be (3,9) and not (5,9) due to files with that same name/count already existing.
+###     (file_path) The full path to a file to check.
+###     (skipped_files) A list of files flagged to skip.
+###     --> Returns a [Boolean]
+def checkForSkippedFiles(file_path, skipped_files):
+    skip_file = False
+    for file in skipped_files:
+        if file == file_path:
+            skip_file = True
+            break
+    return skip_file
+
+
+### Get the text from a Tuples() that requires an OPTION on how to handle it.
+###     (dynamic_text_data) The dynamic text Tuple.
+###     (the_dynamic_text) The dynamic text/number to insert into the regular text.
+###     (insert_file_name_options) The insert file name text modify options.
+###     --> Returns a [String]
+def getDynamicText(dynamic_text_data, the_dynamic_text, insert_file_name_options = None):
+    
+    if type(dynamic_text_data) != tuple:
+        return dynamic_text_data
+    
+    starting_text = dynamic_text_data[STARTING_TEXT]
+    middle_text = ''
+    
+    digits = len(str(the_dynamic_text))
+    min_digits = getSpecificOption(insert_file_name_options, MINIMUM_DIGITS, 0)
+    min_digits -= digits - 1
+    
+    while min_digits > 1:
+        middle_text += '0'
+        min_digits -= 1
+    
+    middle_text += str(the_dynamic_text)
+    if REGEX in insert_file_name_options: # ':' used to separate plain text from the RE used. (Could a ':' cause problems with RE?)
+        middle_text = ':'+middle_text+':' # ':' will be removed later
+    ending_text = dynamic_text_data[ENDING_TEXT] if len(dynamic_text_data) > 2 else ''
+    dynamic_text = starting_text + middle_text + ending_text
+    
+    return dynamic_text
+
+
+### A preset compiled into everything needed to search and rename each file, so the preset is only read once per rename task.
+### Search text lists are already case folded and extension normalized, regular expressions compiled and options resolved.
+class CompiledPreset:
+    __slots__ = ('match_file_name_list', 'match_file_name_patterns', 'match_file_name_options', 'match_no_case', 'match_extension',
+                 'match_regex', 'match_full', 'match_all', 'match_from_right', 'match_limit_index', 'match_limit', 'match_same_index',
+                 'match_file_name_matcher', 'match_file_name_index', 'ignore_file_name_list', 'ignore_file_name_patterns',
+                 'ignore_file_name_matcher', 'ignore_file_name_index', 'ignore_no_case', 'ignore_extension', 'ignore_regex', 'ignore_full',
+                 'ignore_match_all', 'match_file_contents_data', 'match_file_contents_list', 'match_file_contents_options',
+                 'contents_match_limit_index', 'contents_same_index', 'match_file_meta_data', 'match_file_meta_list',
+                 'match_file_meta_options', 'meta_same_index', 'meta_searches', 'meta_list_order', 'meta_stat_list', 'insert_file_name_data', 'insert_file_name_list', 'insert_file_name_options',
+                 'insert_regex', 'insert_extension', 'insert_custom', 'insert_no_repeat', 'insert_no_add_dupes', 'placement',
+                 'is_text_list', 'text_list_size', 'name_search_needed', 'skipped_extensions',
+                 'contents_results', 'contents_search_key')
+
+
+### Compile a preset (edit details) once before renaming any files.
+###     (edit_details) All the details on how to proceed with the file name edits.
+###     --> Returns a [Dictionary] A copy of edit_details with the COMPILED_PRESET key added.
+def compilePreset(edit_details):
+    
+    compiled = CompiledPreset()
+    
+    match_file_name_data = edit_details.get(MATCH_FILE_NAME, '') # '' will always match
+    ignore_file_name_data = edit_details.get(IGNORE_FILE_NAME, None)
+    insert_file_name_data = edit_details[INSERT_FILE_NAME]
+    
+    # Match File Name
+    match_file_name_options = getOptions(match_file_name_data)
+    compiled.match_file_name_options = match_file_name_options
+    compiled.match_no_case = NO_MATCH_CASE in match_file_name_options
+    compiled.match_extension = EXTENSION in match_file_name_options
+    compiled.match_regex = REGEX in match_file_name_options
+    compiled.match_full = FULL_MATCH in match_file_name_options
+    compiled.match_all = MATCH_ALL_INDEXES in match_file_name_options
+    compiled.match_from_right = SEARCH_FROM_RIGHT in match_file_name_options
+    compiled.match_same_index = SAME_MATCH_INDEX in match_file_name_options
+    compiled.match_limit_index = getSpecificOption(match_file_name_options, MATCH_LIMIT, NO_LIMIT)
+    compiled.match_limit = ALL if compiled.match_limit_index <= NO_LIMIT else compiled.match_limit_index # NO_LIMIT(-1) == ALL(999)
+    compiled.match_file_name_list, compiled.match_file_name_patterns = compileSearchTextList(
+        getTextList(match_file_name_data), compiled.match_no_case, compiled.match_extension, compiled.match_regex )
+    compiled.match_file_name_matcher, compiled.match_file_name_index = None, None
+    if (compiled.match_regex or not compiled.match_full) and len(compiled.match_file_name_list) >= multi_text_search_min_list_size:
+        if compiled.match_regex:
+            compiled.match_file_name_matcher = MultiTextMatcher([ getRegexRequiredText(text) for text in compiled.match_file_name_list ])
+        else:
+            compiled.match_file_name_matcher = MultiTextMatcher(compiled.match_file_name_list)
+    elif not compiled.match_regex and compiled.match_full:
+        compiled.match_file_name_index = indexTextList(compiled.match_file_name_list)
+    
+    # Ignore File Name
+    ignore_file_name_options = getOptions(ignore_file_name_data)
+    compiled.ignore_no_case = NO_MATCH_CASE in ignore_file_name_options
+    compiled.ignore_extension = EXTENSION in ignore_file_name_options
+    compiled.ignore_regex = REGEX in ignore_file_name_options
+    compiled.ignore_full = FULL_MATCH in ignore_file_name_options
+    compiled.ignore_match_all = MATCH_ALL_IGNORE_INDEXES in ignore_file_name_options
+    compiled.ignore_file_name_list, compiled.ignore_file_name_patterns = compileSearchTextList(
+        getTextList(ignore_file_name_data, []), compiled.ignore_no_case, compiled.ignore_extension, compiled.ignore_regex )
+    compiled.ignore_file_name_matcher, compiled.ignore_file_name_index = None, None
+    if ( (compiled.ignore_regex or not (compiled.ignore_full or compiled.ignore_extension))
+         and len(compiled.ignore_file_name_list) >= multi_text_search_min_list_size ):
+        if compiled.ignore_regex:
+            compiled.ignore_file_name_matcher = MultiTextMatcher([ getRegexRequiredText(text) for text in compiled.ignore_file_name_list ])
+        else:
+            compiled.ignore_file_name_matcher = MultiTextMatcher(compiled.ignore_file_name_list)
+    elif not compiled.ignore_regex and (compiled.ignore_full or compiled.ignore_extension): # Extensions are always a full match
+        compiled.ignore_file_name_index = indexTextList(compiled.ignore_file_name_list)
+    
+    # Match File Contents
+    compiled.match_file_contents_data = edit_details.get(MATCH_FILE_CONTENTS, None)
+    compiled.match_file_contents_list = getTextList(compiled.match_file_contents_data)
+    compiled.match_file_contents_options = getOptions(compiled.match_file_contents_data)
+    compiled.contents_match_limit_index = getSpecificOption(compiled.match_file_contents_options, MATCH_LIMIT, NO_LIMIT)
+    compiled.contents_same_index = SAME_MATCH_INDEX in compiled.match_file_contents_options
+    compiled.contents_results = {} # {file path : contents search results} (See searchFilesContents)
+    
+    # Match File Meta
+    compiled.match_file_meta_data = edit_details.get(MATCH_FILE_META, None)
+    compiled.match_file_meta_list = getMetaList(compiled.match_file_meta_data)
+    compiled.match_file_meta_options = getOptions(compiled.match_file_meta_data)
+    compiled.meta_same_index = SAME_MATCH_INDEX in compiled.match_file_meta_options
+    compiled.meta_searches = compileMetaSearches(compiled.match_file_meta_list, compiled.match_file_meta_options)
+    
+    # Search the cheapest meta data first: stat meta data (size, dates), then file types, then probed meta data.
+    # The order can only be changed when every meta data must match, else the first match found would change.
+    # Stat meta data that must match is also checked before any extra meta data is read (see getFileMetaData).
+    compiled.meta_list_order = None
+    compiled.meta_stat_list = None
+    if compiled.match_file_meta_data and compiled.match_file_meta_list:
+        meta_costs = [ getMetaDataCost(meta_data) for meta_data in compiled.match_file_meta_list ]
+        if MATCH_ALL_INDEXES in compiled.match_file_meta_options and not compiled.meta_same_index:
+            meta_list_order = sorted(range(len(meta_costs)), key=lambda i: meta_costs[i])
+            if meta_list_order != list(range(len(meta_costs))):
+                compiled.meta_list_order = meta_list_order
+            compiled.meta_stat_list = [ metaSearch for metaSearch, cost in zip(compiled.meta_searches, meta_costs) if cost == 0 ] or None
+        elif max(meta_costs) == 0:
+            compiled.meta_stat_list = compiled.meta_searches
+    
+    # Insert File Name
+    insert_file_name_options = getOptions(insert_file_name_data)
+    compiled.insert_file_name_data = insert_file_name_data
+    compiled.insert_file_name_list = getTextList(insert_file_name_data) # Always a List
+    compiled.insert_file_name_options = insert_file_name_options
+    compiled.insert_regex = REGEX in insert_file_name_options
+    compiled.insert_extension = EXTENSION in insert_file_name_options
+    compiled.insert_custom = CUSTOM in insert_file_name_options
+    compiled.insert_no_repeat = NO_REPEAT_TEXT_LIST in insert_file_name_options
+    compiled.insert_no_add_dupes = NO_ADD_DUPES in insert_file_name_options
+    compiled.placement = getPlacement(insert_file_name_data) if type(insert_file_name_data) == dict else getPlacement({})
+    
+    # Identify this contents search in the contents cache, anything that changes its results changes the key.
+    contents_search = (compiled.match_file_contents_list, compiled.match_file_contents_options, compiled.insert_regex)
+    compiled.contents_search_key = hashlib.sha1(repr(contents_search).encode('utf-8')).hexdigest()
+    
+    compiled.text_list_size = 1
+    if type(insert_file_name_data) == dict:
+        compiled.is_text_list = True if type(insert_file_name_data.get(TEXT)) == list else False
+        if compiled.is_text_list:
+            compiled.text_list_size = len(insert_file_name_data.get(TEXT))
+    elif type(insert_file_name_data) == list:
+        compiled.is_text_list = True
+        compiled.text_list_size = len(insert_file_name_data)
+    else:
+        compiled.is_text_list = False
+    
+    # Files that can't be renamed because of their name alone are skipped before any of their meta data is read.
+    # Note: A match_file_name_list of only empty strings will match every file name.
+    match_name_needed = compiled.match_extension or any(compiled.match_file_name_list)
+    compiled.name_search_needed = match_name_needed or bool(compiled.ignore_file_name_list)
+    
+    # If only file extensions are matched (or ignored), files can be skipped using their extension alone.
+    if ( compiled.name_search_needed
+         and (compiled.match_extension or not match_name_needed)
+         and (compiled.ignore_extension or not compiled.ignore_file_name_list) ):
+        compiled.skipped_extensions = {} # {extension : skip file}
+    else:
+        compiled.skipped_extensions = None
+    
+    edit_details = edit_details.copy()
+    edit_details[COMPILED_PRESET] = compiled
+    return edit_details
+
+
+### Get the cost of reading the meta data a single MATCH_FILE_META search needs.
+###     (meta_data) A single meta data search from a match_file_meta_list.
+###     --> Returns a [Integer] 0 = stat meta data, 1 = file type, 2 = probed or read from file headers
+def getMetaDataCost(meta_data):
+    if type(meta_data) == dict:
+        select_meta_data = next(iter(meta_data))
+    else:
+        select_meta_data = FILE_META_TYPE # or FILE_META_MIME
+    
+    extractor = META_EXTRACTORS.get(select_meta_data, None)
+    if extractor == None:
+        return 0
+    elif extractor == META_EXTRACTOR_TYPE:
+        return 1
+    return 2
+
+
+### Find which files could still be renamed after searching their meta data (MATCH_FILE_META).
+### Many files are searched all at once if possible (see meta_data_column_search_min_files), else one at a time.
+###     (compiled) The CompiledPreset.
+###     (files) A List of FileMeta.
+###     (meta_searches) The compiled meta searches to use, all (default) or only some. (See compileMetaSearches)
+###     --> Returns a [List] of Booleans or [numpy.ndarray], True for each file to keep
+def filterFilesByMeta(compiled, files, meta_searches = None):
+    if meta_searches == None:
+        meta_searches = compiled.meta_searches
+        meta_list_order = compiled.meta_list_order
+    else:
+        meta_list_order = None
+    
+    if numpy_installed and len(files) >= meta_data_column_search_min_files:
+        keep_files = getMetaSearchMask(files, meta_searches, compiled.match_file_meta_options, meta_list_order)
+        if keep_files is not None:
+            return keep_files
+    
+    return [ getMetaSearchResults(file, meta_searches, compiled.match_file_meta_options, meta_list_order) > -1 for file in files ]
+
+
+### Check if a file will never be renamed using only it's name (MATCH_FILE_NAME and IGNORE_FILE_NAME).
+### When a preset only matches (or ignores) file extensions, each extension is only searched once per rename task.
+###     (compiled) The CompiledPreset.
+###     (file_name) A file name.
+###     --> Returns a [Boolean]
+def isSkippedByName(compiled, file_name):
+    
+    file_path = PurePath(file_name)
+    
+    if compiled.skipped_extensions != None:
+        skip_file = compiled.skipped_extensions.get(file_path.suffix)
+        if skip_file != None:
+            return skip_file
+    
+    searchable_match_file_name, searchable_ignore_file_name = getSearchData(compiled, file_path)
+    skip_file = getFileNameSearchResults(compiled, searchable_match_file_name)[0] == -1
+    if not skip_file and compiled.ignore_file_name_list:
+        skip_file = getFileNameIgnoreResults(compiled, searchable_ignore_file_name)
+    
+    if compiled.skipped_extensions != None:
+        compiled.skipped_extensions[file_path.suffix] = skip_file
+    
+    return skip_file
+
+
+### Prepare a list of text to search for, the same way every file name will be made searchable.
+###     (text_list) List of text to search for.
+###     (no_match_case) Case fold all text.
+###     (match_extension) Add a '.' to the start of all (non regular expression) text if missing.
+###     (regex) Compile all text into regular expressions.
+###     --> Returns a [List] of text and a [List] of compiled regular expressions (or None if not regex)
+def compileSearchTextList(text_list, no_match_case, match_extension, regex):
+    
+    search_text_list = []
+    for text in text_list:
+        
+        # Default MATCH_CASE
+        if no_match_case:
+            text = text.casefold()
+        
+        if match_extension and not regex:
+            if text != '' and text.find('.') != 0:
+                text = '.'+text # Add a '.' if missing
+        
+        search_text_list.append(text)
+    
+    search_patterns = [re.compile(text) for text in search_text_list] if regex else None
+    
+    return search_text_list, search_patterns
+
+
+### Index a list of text for full matches, so a file name can be looked up instead of compared to every text in the list.
+###     (text_list) List of text to search for.
+###     --> Returns a [Dictionary] {text : [list indexes]}
+def indexTextList(text_list):
+    text_list_index = {}
+    for i, text in enumerate(text_list):
+        text_list_index.setdefault(text, []).append(i)
+    return text_list_index
+
+
+### Get the longest plain text a regular expression can't match without, so regular expressions that can't possibly match a
+### file name don't need to be searched with. Ex. r'S(\d+)E(\d+) - Finale' = ' - Finale'
+###     (regex_text) A regular expression (text).
+###     --> Returns a [String] or '' if there is no required text.
+def getRegexRequiredText(regex_text):
+    
+    try:
+        parsed_regex = regex_parser.parse(regex_text)
+    except re.error:
+        return ''
+    
+    if parsed_regex.state.flags & re.IGNORECASE:
+        return ''
+    
+    # Only plain text at the top level is required, everything else (groups, repeats, alternatives...) may not be.
+    required_text, text = '', ''
+    for op, value in parsed_regex:
+        if op == regex_parser.LITERAL:
+            text += chr(value)
+            if len(text) > len(required_text):
+                required_text = text
+        else:
+            text = ''
+    
+    return required_text
+
+
+### Find every text in a list found in a file name with a single pass over the file name (Aho-Corasick automaton).
+### The automaton is built once per rename task and remembers the list index of every text, including duplicates.
+class MultiTextMatcher:
+    __slots__ = ('transitions', 'fail', 'output_link', 'outputs', 'always_found')
+    
+    CHARACTERS = 0x110000 # All unicode characters, used to combine a node and character into one transition key
+    
+    ###     (text_list) List of text to search for.
+    def __init__(self, text_list):
+        self.transitions = {}           # {node * CHARACTERS + character : next node}
+        self.outputs = {}               # {node : [list indexes of texts ending at this node]}
+        self.always_found = []          # List indexes of empty texts, found in any file name
+        parents, characters, node_depths = array('l', [0]), array('l', [0]), array('l', [0])
+        nodes_by_depth = [[]]
+        
+        # Build a tree (trie) of all the texts.
+        for i, text in enumerate(text_list):
+            if text == '':
+                self.always_found.append(i)
+                continue
+            node = 0
+            for char in text:
+                key = node * self.CHARACTERS + ord(char)
+                next_node = self.transitions.get(key)
+                if next_node == None:
+                    next_node = len(parents)
+                    self.transitions[key] = next_node
+                    parents.append(node)
+                    characters.append(ord(char))
+                    node_depths.append(node_depths[node] + 1)
+                    if len(nodes_by_depth) <= node_depths[next_node]:
+                        nodes_by_depth.append([])
+                    nodes_by_depth[node_depths[next_node]].append(next_node)
+                node = next_node
+            self.outputs.setdefault(node, []).append(i)
+        
+        # Link each node to the longest suffix also in the tree (in order of depth so suffixes are always linked first).
+        self.fail = array('l', [0]) * len(parents)
+        self.output_link = array('l', [0]) * len(parents)
+        for depth in range(2, len(nodes_by_depth)):
+            for node in nodes_by_depth[depth]:
+                character = characters[node]
+                fail_node = self.fail[parents[node]]
+                while fail_node and fail_node * self.CHARACTERS + character not in self.transitions:
+                    fail_node = self.fail[fail_node]
+                fail_node = self.transitions.get(fail_node * self.CHARACTERS + character, 0)
+                self.fail[node] = fail_node
+                self.output_link[node] = fail_node if fail_node in self.outputs else self.output_link[fail_node]
+    
+    ### Find all the texts in a file name.
+    ###     (file_name) Searchable file name String.
+    ###     --> Returns a [Set] of list indexes
+    def search(self, file_name):
+        found = set(self.always_found)
+        transitions, fail, output_link, outputs = self.transitions, self.fail, self.output_link, self.outputs
+        
+        node = 0
+        for char in file_name:
+            character = ord(char)
+            while node and node * self.CHARACTERS + character not in transitions:
+                node = fail[node]
+            node = transitions.get(node * self.CHARACTERS + character, 0)
+            
+            match_node = node if node in outputs else output_link[node]
+            while match_node:
+                found.update(outputs[match_node])
+                match_node = output_link[match_node]
+        
+        return found
+
+
+### Get a file name made searchable for matching and ignoring text.
+###     (compiled) The CompiledPreset.
+###     (file_path) The file path with a file name that will be searched through.
+###     --> Returns a [String] and [String]
+def getSearchData(compiled, file_path):
+    
+    searchable_file_names = []
+    for no_match_case, match_extension in [(compiled.match_no_case, compiled.match_extension),
+                                           (compiled.ignore_no_case, compiled.ignore_extension)]:
+        
+        searchable_file_name = file_path.suffix if match_extension else file_path.name
+        if no_match_case:
+            searchable_file_name = searchable_file_name.casefold()
+        searchable_file_names.append(searchable_file_name)
+    
+    return searchable_file_names[0], searchable_file_names[1]
+
+
+### Search current file name for specific text. Return -1 or 0+ (search_index).
+###     (compiled) The CompiledPreset with the list of text to match and options.
+###     (searchable_match_file_name) Searchable file name String.
+###     --> Returns a [Integer] and [Boolean] and [List]
+def getFileNameSearchResults(compiled, searchable_match_file_name):
+    search_index = -1
+    edit_extension = False
+    compiled_match_data = []
+    
+    match_all = compiled.match_all
+    search_from_right = compiled.match_from_right
+    match_limit = compiled.match_limit
+    
+    full_match = compiled.match_full
+    regex = compiled.match_regex
+    
+    match_extension = compiled.match_extension
+    modify_extension = compiled.insert_extension
+    
+    # Full matches are looked up and large text lists are searched all at once first, then only the texts found (or regular
+    # expressions with their required text found) need to be searched for again (in list order).
+    # Note: A perfect extension match stops the search early, even when matching all, so every text is searched for in order.
+    texts_found = None
+    if not (match_all and match_extension):
+        if compiled.match_file_name_index != None:
+            texts_found = compiled.match_file_name_index.get(searchable_match_file_name, [])
+        elif compiled.match_file_name_matcher:
+            texts_found = sorted(compiled.match_file_name_matcher.search(searchable_match_file_name))
+    
+    if texts_found != None:
+        if match_all and len(texts_found) < len(compiled.match_file_name_list):
+            return search_index, edit_extension, compiled_match_data # Not all matched, skip rename
+        list_indexes = texts_found
+    else:
+        list_indexes = range(len(compiled.match_file_name_list))
+    
+    for i in list_indexes:
+        match_file_name_text = compiled.match_file_name_list[i]
+        
+        if regex:
+            # Make a regular expression match.
+            re_pattern = compiled.match_file_name_patterns[i]
+            if match_extension:
+                re_matches = re_pattern.fullmatch(searchable_match_file_name) # A perfect match
+                edit_extension = True
             else:
                 re_matches = re_pattern.search(searchable_match_file_name) # Any match
             
@@ -1878,7 +3754,7 @@ def getFileNameSearchResults(match_file_name_list, searchable_match_file_name, m
             compiled_match_data.reverse()
             
             # Remove string index matches made if above match limit (lists are reversed).
-            if REGEX in insert_file_name_options:
+            if compiled.insert_regex:
                 ignore = len(compiled_match_data) - match_limit
                 while ignore > 0:
                     if search_from_right:
@@ -1943,23 +3819,43 @@ def getFileNameSearchResults(match_file_name_list, searchable_match_file_name, m
 
 
 ### Search file name for matching text and if found ignore or skip current file rename.
-###     (ignore_file_name_list) List of text to ignore.
+###     (compiled) The CompiledPreset with the list of text to ignore and options.
 ###     (searchable_ignore_file_name) Searchable file name String.
-###     (ignore_file_name_options) The ignore file name text search options.
 ###     --> Returns a [Boolean]
-def getFileNameIgnoreResults(ignore_file_name_list, searchable_ignore_file_name, ignore_file_name_options):
-    
-    full_match = FULL_MATCH in ignore_file_name_options
-    match_all_ignore = MATCH_ALL_IGNORE_INDEXES in ignore_file_name_options
-    regex_search = REGEX in ignore_file_name_options
-    match_extension = EXTENSION in ignore_file_name_options
+def getFileNameIgnoreResults(compiled, searchable_ignore_file_name):
+    
+    full_match = compiled.ignore_full
+    match_all_ignore = compiled.ignore_match_all
+    regex_search = compiled.ignore_regex
+    match_extension = compiled.ignore_extension
+    
+    # Full matches are looked up and large text lists are searched all at once.
+    texts_found = None
+    if compiled.ignore_file_name_index != None:
+        texts_found = compiled.ignore_file_name_index.get(searchable_ignore_file_name, [])
+    elif compiled.ignore_file_name_matcher:
+        texts_found = compiled.ignore_file_name_matcher.search(searchable_ignore_file_name)
+    
+    if texts_found != None and not regex_search:
+        if match_all_ignore:
+            return len(texts_found) == len(compiled.ignore_file_name_list)
+        return len(texts_found) > 0
+    
+    # Only regular expressions with their required text found still need to be searched with (in list order).
+    if texts_found != None:
+        if match_all_ignore and len(texts_found) < len(compiled.ignore_file_name_list):
+            return False
+        list_indexes = sorted(texts_found)
+    else:
+        list_indexes = range(len(compiled.ignore_file_name_list))
     
     ignore_match = False
-    for ignore_file_name_text in ignore_file_name_list:
+    for i in list_indexes:
+        ignore_file_name_text = compiled.ignore_file_name_list[i]
         
         if match_extension:
             if regex_search:
-                if re.fullmatch(ignore_file_name_text, searchable_ignore_file_name):
+                if compiled.ignore_file_name_patterns[i].fullmatch(searchable_ignore_file_name):
                     ignore_match = True
                 else:
                     ignore_match = False
@@ -1969,569 +3865,446 @@ def getFileNameIgnoreResults(ignore_file_name_list, searchable_ignore_file_name,
                 ignore_match = False
         else:
             if regex_search:
-                if re.search(ignore_file_name_text, searchable_ignore_file_name):
+                if compiled.ignore_file_name_patterns[i].search(searchable_ignore_file_name):
                     ignore_match = True
                 else:
                     ignore_match = False
-            elif full_match:
-                if searchable_ignore_file_name == ignore_file_name_text:
-                    ignore_match = True
-                else:
-                    ignore_match = False
-            elif searchable_ignore_file_name.find(ignore_file_name_text) > -1:
-                ignore_match = True
-            else:
-                ignore_match = False
-        
-        # If match_all_ignore keep going/looping
-        if ignore_match and not match_all_ignore: break
-        if not ignore_match and match_all_ignore: break
-    
-    return ignore_match
-
-
-### Search current file meta data for any specific meta data in edit_details. Return -1 or 0+ (meta_list_index).
-###     (file_meta_data) The current file's meta data.
-###     (match_file_meta_list) The meta search and match data.
-###     (match_file_meta_options) The match file meta data search options.
-###     --> Returns a [Integer]
-def getMetaSearchResults(file_meta_data, match_file_meta_list, match_file_meta_options):
-    no_match_case = NO_MATCH_CASE in match_file_meta_options
-    same_match_meta_index = SAME_MATCH_INDEX in match_file_meta_options
-    match_all = MATCH_ALL_INDEXES in match_file_meta_options
-    
-    meta_list_index, i = -1, -1
-    for meta_data in match_file_meta_list:
-        i += 1
-        match_failed = False
-        match_skipped = False
-        
-        # Check if single entry (FILE_META_TYPE or FILE_META_MIME search)
-        if type(meta_data) == int:
-            select_meta_data = FILE_META_TYPE
-            how_to_match = EXACT_MATCH
-            meta_data = { DATA : meta_data }
-        elif type(meta_data) == str:
-            select_meta_data = FILE_META_MIME
-            how_to_match = LOOSE_MATCH
-            meta_data = { DATA : meta_data }
-        else:
-            select_meta_data = next(iter(meta_data))
-            how_to_match = meta_data[select_meta_data]
-        
-        operator = meta_data.get(OPERATOR, OR)
-        
-        if select_meta_data == FILE_META_SIZE:
-            #print('File Size Meta')
-            file_meta_size = file_meta_data[select_meta_data]
-            
-            # Separate file size out into GB / MB / KB / Bytes
-            file_bytes = math.floor(math.remainder(file_meta_size, KILOBYTE)) if file_meta_size > KILOBYTE else file_meta_size
-            file_kb = math.floor(math.remainder(file_meta_size, MEGABYTE) / KILOBYTE)
-            file_mb = math.floor(math.remainder(file_meta_size, GIGABYTE) / MEGABYTE)
-            file_gb = math.floor(math.remainder(file_meta_size, GIGABYTE*KILOBYTE) / GIGABYTE)
-            #print(f'file_bytes: {file_bytes}')
-            #print(f'file_kb: {file_kb}')
-            #print(f'file_mb: {file_mb}')
-            #print(f'file_gb: {file_gb}')
-            
-            # Get file size lists to match
-            '''match_bytes = meta_data.get(BYTES, None)
-            match_kb = meta_data.get(KB, None)
-            match_mb = meta_data.get(MB, None)
-            match_gb = meta_data.get(GB, None)'''
-            match_bytes_list = getList(meta_data, BYTES, None)
-            match_kb_list = getList(meta_data, KB, None)
-            match_mb_list = getList(meta_data, MB, None)
-            match_gb_list = getList(meta_data, GB, None)
-            
-            x = 0
-            match_file_size_list_max = max(len(match_bytes_list),len(match_kb_list),len(match_mb_list),len(match_gb_list))
-            while x < match_file_size_list_max:
-                
-                if operator == OR:
-                    match_failed, match_skipped = False,False
-                
-                if match_bytes_list == None:
-                    match_bytes = None
-                else:
-                    match_bytes = match_bytes_list[x] if x < len(match_bytes_list) else 0
-                if match_kb_list == None:
-                    match_kb = None
-                else:
-                    match_kb = match_kb_list[x] if x < len(match_kb_list) else 0
-                if match_mb_list == None:
-                    match_mb = None
-                else:
-                    match_mb = match_mb_list[x] if x < len(match_mb_list) else 0
-                if match_gb_list == None:
-                    match_gb = None
-                else:
-                    match_gb = match_gb_list[x] if x < len(match_gb_list) else 0
-                
-                file_size_match = 0
-                if match_gb: file_size_match += match_gb * GIGABYTE
-                if match_mb: file_size_match += match_mb * MEGABYTE
-                if match_kb: file_size_match += match_kb * KILOBYTE
-                if match_bytes: file_size_match += match_bytes
-                
-                if debug: print(f'file_meta_size (bytes): {file_meta_size}')
-                if debug: print(f'file_size_match (bytes): {file_size_match}')
-                
-                # Check if file meta matches all meta data in preset or break on first match found if same_match_meta_index
-                if how_to_match == EXACT_MATCH:
-                    if match_gb and match_gb != file_gb:
-                        match_failed = True
-                    elif match_mb and match_mb != file_mb:
-                        match_failed = True
-                    elif match_kb and match_kb != file_kb:
-                        match_failed = True
-                    elif match_bytes and match_bytes != file_bytes:
-                        match_failed = True
-                
-                elif how_to_match == SKIP_EXACT_MATCH:
-                    if match_gb and match_gb == file_gb:
-                        match_skipped = True
-                    elif match_mb and match_mb == file_mb:
-                        match_skipped = True
-                    elif match_kb and match_kb == file_kb:
-                        match_skipped = True
-                    elif match_bytes and match_bytes == file_bytes:
-                        match_skipped = True
-                
-                elif how_to_match == LOOSE_MATCH or how_to_match == SKIP_LOOSE_MATCH:
-                    match_meta_number_high = file_size_match + (file_size_match * 0.05)
-                    match_meta_number_low = file_size_match - (file_size_match * 0.05)
-                    
-                    if how_to_match == LOOSE_MATCH:
-                        if file_meta_size > match_meta_number_high or file_meta_size < match_meta_number_low:
-                            match_failed = True
-                    
-                    elif how_to_match == SKIP_LOOSE_MATCH:
-                        if file_meta_size < match_meta_number_high or file_meta_size > match_meta_number_low:
-                            match_skipped = True
-                
-                elif how_to_match == LESS_THAN:
-                    if file_size_match < file_meta_size:
-                        match_failed = True
-                
-                elif how_to_match == MORE_THAN:
-                    if file_size_match > file_meta_size:
-                        match_failed = True
-                
-                x += 1
-                #print(f'match_failed: {match_failed}, match_skipped: {match_skipped}')
-                if match_failed or match_skipped:
-                    if operator == AND: x = 9999
-                if not match_failed and not match_skipped:
-                    if operator == OR: x = 9999
-            
-            # IF...
-            if match_failed:
-                if same_match_meta_index or not match_all: continue
-                else:
-                    meta_list_index = -1
-                    break
-            if match_skipped and match_all:
-                meta_list_index = -1
-                break
-            elif match_skipped and not match_all:
-                continue
-            
-            # ELSE... A Match Was Made
-            meta_list_index = i
-            if same_match_meta_index or not match_all: break
-            else: continue # To Match All
-        
-        if (select_meta_data == FILE_META_ACCESSED
-         or select_meta_data == FILE_META_MODIFIED
-         or select_meta_data == FILE_META_CREATED
-         or select_meta_data == FILE_META_LENGTH
-         or select_meta_data == FILE_META_AUDIO_YEAR): # or FILE_META_METADATA
-            #print('Time Meta')
-            
-            file_meta_timestamp = file_meta_data[select_meta_data]
-            file_meta_date_time = datetime.fromtimestamp(file_meta_timestamp)
-            #timestamp_now = getTrackedData(edit_details, LOG_DATA, [START_TIME])
-            timestamp_now = datetime.now().timestamp()
-            '''
-            year = meta_data.get(YEAR, None)
-            if not year: year = meta_data.get(DATA, None)
-            month = meta_data.get(MONTH, None)
-            #if month: month = int(month) ## TODO: force int on number if user entered them as strings?
-            day = meta_data.get(DAY, None)
-            hour = meta_data.get(HOUR, None)
-            minute = meta_data.get(MINUTE, None)
-            second = meta_data.get(SECOND, None)
-            millisecond = meta_data.get(MILLISECOND, None)
-            microsecond = meta_data.get(MICROSECOND, None)
-            '''
-            
-            years = getList(meta_data, YEAR, None)
-            if not years: years = getList(meta_data, DATA, None)
-            months = getList(meta_data, MONTH, None)
-            #if month: month = int(month) ## TODO: force int on number if user entered them as strings?
-            days = getList(meta_data, DAY, None)
-            hours = getList(meta_data, HOUR, None)
-            minutes = getList(meta_data, MINUTE, None)
-            seconds = getList(meta_data, SECOND, None)
-            milliseconds = getList(meta_data, MILLISECOND, None)
-            microseconds = getList(meta_data, MICROSECOND, None)
-            
-            time_items_length = max(len(years),len(months),len(days),len(hours),len(minutes),len(seconds),len(milliseconds),len(microseconds))
-            
-            x = 0
-            while x < time_items_length:
-                
-                if operator == OR:
-                    match_failed, match_skipped = False,False
-                
-                if years == None:
-                    year = None
-                else:
-                    year = years[x] if x < len(years) else 0
-                if months == None:
-                    month = None
-                else:
-                    month = months[x] if x < len(months) else 0
-                if days == None:
-                    day = None
-                else:
-                    day = days[x] if x < len(days) else 0
-                if hours == None:
-                    hour = None
-                else:
-                    hour = hours[x] if x < len(hours) else 0
-                if minutes == None:
-                    minute = None
-                else:
-                    minute = minutes[x] if x < len(minutes) else 0
-                if seconds == None:
-                    second = None
-                else:
-                    second = seconds[x] if x < len(seconds) else 0
-                if milliseconds == None:
-                    millisecond = None
-                else:
-                    millisecond = milliseconds[x] if x < len(milliseconds) else 0
-                if microseconds == None:
-                    microsecond = None
+            elif full_match:
+                if searchable_ignore_file_name == ignore_file_name_text:
+                    ignore_match = True
                 else:
-                    microsecond = microseconds[x] if x < len(microseconds) else 0
-                
-                # Get length of time for comparison to today's date.
-                match_time_delta = 0
-                if year:
-                    match_time_delta += year * 31536000
-                if month:
-                    match_time_delta += month * 30 * 86400
-                if day:
-                    match_time_delta += day * 86400
-                if hour:
-                    match_time_delta += hour * 3600
-                if minute:
-                    match_time_delta += minute * 60
-                if second:
-                    match_time_delta += second
-                if millisecond:
-                    match_time_delta += millisecond / 1000
-                elif microsecond:
-                    match_time_delta += microsecond / 1000 / 1000
-                if debug: print(f'match_time_delta: {match_time_delta}')
-                
-                # Check if file meta matches all meta data in preset or break on first match found if same_match_meta_index
-                if how_to_match == EXACT_MATCH:
-                    if year and year != file_meta_date_time.year:
-                        match_failed = True
-                    if month and month != file_meta_date_time.month:
-                        match_failed = True
-                    if day and day != file_meta_date_time.day:
-                        match_failed = True
-                    if hour and hour != file_meta_date_time.hour:
-                        match_failed = True
-                    if minute and minute != file_meta_date_time.minute:
-                        match_failed = True
-                    if second and second != file_meta_date_time.second:
-                        match_failed = True
-                    if millisecond and millisecond != file_meta_date_time.microsecond:
-                        match_failed = True
-                    if microsecond and microsecond != file_meta_date_time.microsecond:
-                        match_failed = True
-                
-                elif how_to_match == SKIP_EXACT_MATCH:
-                    if year and year == file_meta_date_time.year:
-                        match_skipped = True
-                    if month and month == file_meta_date_time.month:
-                        match_skipped = True
-                    if day and day == file_meta_date_time.day:
-                        match_skipped = True
-                    if hour and hour == file_meta_date_time.hour:
-                        match_skipped = True
-                    if minute and minute == file_meta_date_time.minute:
-                        match_skipped = True
-                    if second and second == file_meta_date_time.second:
-                        match_skipped = True
-                    if millisecond and millisecond == file_meta_date_time.microsecond:
-                        match_skipped = True
-                    if microsecond and microsecond == file_meta_date_time.microsecond:
-                        match_skipped = True
-                
-                elif how_to_match == LOOSE_MATCH or how_to_match == SKIP_LOOSE_MATCH:
-                    time_length = timestamp_now - file_meta_timestamp
-                    match_time_delta_high = time_length + (time_length * 0.05)
-                    match_time_delta_low = time_length - (time_length * 0.05)
-                    
-                    if how_to_match == LOOSE_MATCH:
-                        if time_length > match_time_delta_high and time_length < match_time_delta_low:
-                            match_failed = True
-                    
-                    elif how_to_match == SKIP_LOOSE_MATCH:
-                        if time_length < match_time_delta_high and time_length > match_time_delta_low:
-                            match_skipped = True
-                
-                elif how_to_match == BEFORE: # or LESS_THAN
-                    if match_time_delta < file_meta_timestamp:
-                        match_failed = True
-                
-                elif how_to_match == AFTER: # or MORE_THAN
-                    if match_time_delta > file_meta_timestamp:
-                        match_failed = True
-                
-                elif how_to_match == WITHIN_THE_PAST:
-                    if timestamp_now - file_meta_timestamp > match_time_delta:
-                        match_failed = True
-                
-                elif how_to_match == OLDER_THAN:
-                    if timestamp_now - file_meta_timestamp < match_time_delta:
-                        match_failed = True
-                
-                x += 1
-                #print(f'match_failed: {match_failed}, match_skipped: {match_skipped}')
-                if match_failed or match_skipped:
-                    if operator == AND: x = 9999
-                if not match_failed and not match_skipped:
-                    if operator == OR: x = 9999
+                    ignore_match = False
+            elif searchable_ignore_file_name.find(ignore_file_name_text) > -1:
+                ignore_match = True
+            else:
+                ignore_match = False
+        
+        # If match_all_ignore keep going/looping
+        if ignore_match and not match_all_ignore: break
+        if not ignore_match and match_all_ignore: break
+    
+    return ignore_match
+
+
+### Compile every MATCH_FILE_META search once per rename task, so each file only needs a few comparisons.
+###     (match_file_meta_list) The meta search and match data.
+###     (match_file_meta_options) The match file meta data search options.
+###     --> Returns a [List] of meta search Functions (see compileMetaSearch)
+def compileMetaSearches(match_file_meta_list, match_file_meta_options):
+    no_match_case = NO_MATCH_CASE in match_file_meta_options
+    timestamp_now = datetime.now().timestamp()
+    return [ compileMetaSearch(meta_data, no_match_case, timestamp_now) for meta_data in match_file_meta_list ]
+
+
+### Compile a single meta data search into a Function that is given a file's meta data and returns (match_failed, match_skipped).
+### Sizes, numbers, dates and lengths of time are turned into ranges of raw meta data values [low, high], one range per list index.
+### Ex. { FILE_META_SIZE : LESS_THAN, KB : (7, 8) } = Sizes from 0 to 7168 bytes or from 0 to 8192 bytes.
+###     (meta_data) A single meta data search from a match_file_meta_list.
+###     (no_match_case) Case fold all text.
+###     (timestamp_now) The time used to find how long ago a file was created, modified, etc.
+###     --> Returns a [Function] or None if the meta data can't be searched
+def compileMetaSearch(meta_data, no_match_case, timestamp_now):
+    
+    # Check if single entry (FILE_META_TYPE or FILE_META_MIME search)
+    if type(meta_data) == int:
+        select_meta_data = FILE_META_TYPE
+        how_to_match = EXACT_MATCH
+        meta_data = { DATA : meta_data }
+    elif type(meta_data) == str:
+        select_meta_data = FILE_META_MIME
+        how_to_match = LOOSE_MATCH
+        meta_data = { DATA : meta_data }
+    else:
+        select_meta_data = next(iter(meta_data))
+        how_to_match = meta_data[select_meta_data]
+    
+    operator = meta_data.get(OPERATOR, OR)
+    skip_match = how_to_match == SKIP_EXACT_MATCH or how_to_match == SKIP_LOOSE_MATCH
+    exact_match = how_to_match == EXACT_MATCH or how_to_match == SKIP_EXACT_MATCH
+    loose_match = how_to_match == LOOSE_MATCH or how_to_match == SKIP_LOOSE_MATCH
+    no_meta_fails = False # If the file doesn't have this meta data it always fails to match
+    ranges = []
+    matches = [] # Functions that check if a file's meta data value is a match, used when ranges won't work
+    
+    if select_meta_data == FILE_META_SIZE:
+        
+        getValue = lambda file_meta_data: file_meta_data[FILE_META_SIZE]
+        
+        # Separate file size lists out into GB / MB / KB / Bytes
+        match_bytes_list = getList(meta_data, BYTES, None)
+        match_kb_list = getList(meta_data, KB, None)
+        match_mb_list = getList(meta_data, MB, None)
+        match_gb_list = getList(meta_data, GB, None)
+        size_lists = ( (match_bytes_list, 1), (match_kb_list, KILOBYTE), (match_mb_list, MEGABYTE), (match_gb_list, GIGABYTE) )
+        
+        for x in range(max( len(size_list) for size_list, size_unit in size_lists )):
             
-            # IF...
-            if match_failed:
-                if same_match_meta_index or not match_all: continue
-                else:
-                    meta_list_index = -1
-                    break
-            if match_skipped and match_all:
-                meta_list_index = -1
-                break
-            elif match_skipped and not match_all:
-                continue
+            file_size_match = 0
+            match_size_parts = [] # [(size_unit, match_size)]
+            for size_list, size_unit in size_lists:
+                match_size = size_list[x] if x < len(size_list) else 0
+                if match_size:
+                    file_size_match += match_size * size_unit
+                    match_size_parts.append( (size_unit, match_size) )
             
-            # ELSE... A Match Was Made
-            meta_list_index = i
-            if same_match_meta_index or not match_all: break
-            else: continue # To Match All
+            # Each part of the file size is matched on its own. Ex. KB : 7 = 7 KB, 1 MB 7 KB, 2 MB 7 KB, etc.
+            if how_to_match == EXACT_MATCH:
+                matches.append(lambda value, match_size_parts=match_size_parts:
+                               all( getFileSizePart(value, size_unit) == match_size for size_unit, match_size in match_size_parts ))
+            elif how_to_match == SKIP_EXACT_MATCH:
+                matches.append(lambda value, match_size_parts=match_size_parts:
+                               any( getFileSizePart(value, size_unit) == match_size for size_unit, match_size in match_size_parts ))
+            elif how_to_match == LOOSE_MATCH:
+                ranges.append( (file_size_match - (file_size_match * 0.05), file_size_match + (file_size_match * 0.05)) )
+            elif how_to_match == SKIP_LOOSE_MATCH:
+                matches.append(lambda value, low=file_size_match - (file_size_match * 0.05), high=file_size_match + (file_size_match * 0.05):
+                               value < high or value > low)
+            elif how_to_match == LESS_THAN:
+                ranges.append( (-math.inf, file_size_match) )
+            elif how_to_match == MORE_THAN:
+                ranges.append( (file_size_match, math.inf) )
+            else:
+                ranges.append( (-math.inf, math.inf) )
+    
+    elif (select_meta_data == FILE_META_ACCESSED
+       or select_meta_data == FILE_META_MODIFIED
+       or select_meta_data == FILE_META_CREATED
+       or select_meta_data == FILE_META_LENGTH
+       or select_meta_data == FILE_META_AUDIO_YEAR
+       or select_meta_data == FILE_META_DATE_TAKEN): # or FILE_META_METADATA
+        
+        no_meta_fails = True # No date found, Ex. a photo without EXIF data
+        getValue = lambda file_meta_data: getMetaTimestamp(file_meta_data[select_meta_data], exact_match)
+        
+        years = getList(meta_data, YEAR, None)
+        if not years: years = getList(meta_data, DATA, None)
+        months = getList(meta_data, MONTH, None)
+        days = getList(meta_data, DAY, None)
+        hours = getList(meta_data, HOUR, None)
+        minutes = getList(meta_data, MINUTE, None)
+        seconds = getList(meta_data, SECOND, None)
+        milliseconds = getList(meta_data, MILLISECOND, None) # or MICROSECOND (compared to the file's microseconds)
+        time_lists = (years, months, days, hours, minutes, seconds, milliseconds)
         
-        if select_meta_data == FILE_META_TYPE:
-            #print('Integer Constant Meta')
+        for x in range(max( len(time_list) for time_list in time_lists )):
             
-            file_meta_constant = file_meta_data[select_meta_data]
-            file_meta_constant = None if file_meta_constant == '' else file_meta_constant
-            match_meta_constants = meta_data.get(DATA, None)
-            #match_meta_constants = None if match_meta_constants == '' else match_meta_constants
-            if type(match_meta_constants) != tuple or type(match_meta_constants) != list: # Make it a List
-                match_meta_constants = [match_meta_constants]
+            year, month, day, hour, minute, second, millisecond = ( time_list[x] if x < len(time_list) else 0 for time_list in time_lists )
             
-            for match_meta_constant in match_meta_constants:
-                match_meta_constant = None if match_meta_constant == '' else match_meta_constant
-                
-                # If searching for TYPE_APPLICATION, force match all custom sub catigories too.
-                if match_meta_constant == TYPE_APPLICATION:
-                    if file_meta_constant == TYPE_ARCHIVE:
-                        match_meta_constant = TYPE_ARCHIVE
-                    elif file_meta_constant == TYPE_DOCUMENT:
-                        match_meta_constant = TYPE_DOCUMENT
-                
-                if how_to_match == EXACT_MATCH or how_to_match == LOOSE_MATCH: # Only EXACT_MATCH works here
-                    if file_meta_constant != match_meta_constant:
-                        match_failed = True
-                elif how_to_match == SKIP_EXACT_MATCH or how_to_match == SKIP_LOOSE_MATCH: # Only SKIP_EXACT_MATCH works here
-                    if file_meta_constant == match_meta_constant:
-                        match_skipped = True
-                
-                if match_failed or match_skipped:
-                    if operator == AND: break
-                if not match_failed and not match_skipped:
-                    if operator == OR: break
+            # Get length of time for comparison to today's date.
+            match_time_delta = 0
+            if year: match_time_delta += year * 31536000
+            if month: match_time_delta += month * 30 * 86400
+            if day: match_time_delta += day * 86400
+            if hour: match_time_delta += hour * 3600
+            if minute: match_time_delta += minute * 60
+            if second: match_time_delta += second
+            if millisecond: match_time_delta += millisecond / 1000
+            if debug: print(f'match_time_delta: {match_time_delta}')
             
-            # IF...
-            if match_failed:
-                if same_match_meta_index or not match_all: continue
+            if exact_match:
+                match_date_time = ( ('year', year), ('month', month), ('day', day), ('hour', hour), ('minute', minute), ('second', second),
+                                    ('microsecond', millisecond) )
+                match_date_time = tuple( (name, number) for name, number in match_date_time if number )
+                if how_to_match == EXACT_MATCH:
+                    matches.append(lambda value, match_date_time=match_date_time: all( getattr(value, name) == number for name, number in match_date_time ))
                 else:
-                    meta_list_index = -1
-                    break
-            if match_skipped and match_all:
-                meta_list_index = -1
-                break
-            elif match_skipped and not match_all:
-                continue
+                    matches.append(lambda value, match_date_time=match_date_time: any( getattr(value, name) == number for name, number in match_date_time ))
             
-            # ELSE... A Match Was Made
-            meta_list_index = i
-            if same_match_meta_index or not match_all: break
-            else: continue # To Match All
-        
-        if (select_meta_data == FILE_META_HEIGHT            or select_meta_data == FILE_META_WIDTH
-         or select_meta_data == FILE_META_BIT_DEPTH         or select_meta_data == FILE_META_VIDEO_BITRATE
-         or select_meta_data == FILE_META_VIDEO_FRAME_RATE  or select_meta_data == FILE_META_AUDIO_BITRATE
-         or select_meta_data == FILE_META_AUDIO_SAMPLE_RATE or select_meta_data == FILE_META_AUDIO_CHANNELS
-         or select_meta_data == FILE_META_AUDIO_TRACK):
-            #print('Simple Number Meta')
+            elif loose_match: # Any time in the past
+                ranges.append( (-math.inf, timestamp_now) )
             
-            file_meta_number = file_meta_data[select_meta_data]
-            file_meta_number = 0 if not file_meta_number else file_meta_number
-            #print(f'file_meta_number: {file_meta_number}')
-            match_meta_numbers = meta_data.get(DATA, 0)
-            #print(f'match_meta_numbers: {match_meta_numbers}')
-            #match_meta_numbers = 0 if not match_meta_numbers else match_meta_numbers
-            if type(match_meta_numbers) != tuple and type(match_meta_numbers) != list: # Make it a List
-                match_meta_numbers = [match_meta_numbers]
+            elif how_to_match == BEFORE: # or LESS_THAN
+                ranges.append( (-math.inf, match_time_delta) )
             
-            for match_meta_number in match_meta_numbers:
-                match_meta_number = 0 if not match_meta_number else match_meta_number
-                #print(f'match_meta_number: {match_meta_number}')
-                
-                if operator == OR:
-                    match_failed, match_skipped = False,False
-                
-                if how_to_match == EXACT_MATCH:
-                    if file_meta_number != match_meta_number:
-                        match_failed = True
-                
-                elif how_to_match == SKIP_EXACT_MATCH:
-                    if file_meta_number == match_meta_number:
-                        match_skipped = True
-                
-                elif how_to_match == LOOSE_MATCH or how_to_match == SKIP_LOOSE_MATCH:
-                    
-                    match_meta_number_high = match_meta_number + (match_meta_number * 0.05)
-                    match_meta_number_low = match_meta_number - (match_meta_number * 0.05)
-                    
-                    if how_to_match == LOOSE_MATCH:
-                        if file_meta_number > match_meta_number_high or file_meta_number < match_meta_number_low:
-                            match_failed = True
-                    
-                    elif how_to_match == SKIP_LOOSE_MATCH:
-                        if file_meta_number < match_meta_number_high and file_meta_number > match_meta_number_low:
-                            match_skipped = True
-                
-                elif how_to_match == LESS_THAN:
-                    if file_meta_number < match_meta_number:
-                        match_failed = True
-                
-                elif how_to_match == MORE_THAN:
-                    if file_meta_number > match_meta_number:
-                        match_failed = True
-                
-                #print(f'match_failed: {match_failed}, match_skipped: {match_skipped}')
-                if match_failed or match_skipped:
-                    if operator == AND: break # This is not even needed, it's going to fail no matter what, 2 different numbers can't both match 1 number
-                if not match_failed and not match_skipped:
-                    if operator == OR: break
+            elif how_to_match == AFTER: # or MORE_THAN
+                ranges.append( (match_time_delta, math.inf) )
             
-            # IF...
-            if match_failed:
-                if same_match_meta_index or not match_all: continue
-                else:
-                    meta_list_index = -1
-                    break
-            if match_skipped and match_all:
-                meta_list_index = -1
-                break
-            elif match_skipped and not match_all:
-                continue
+            elif how_to_match == WITHIN_THE_PAST:
+                ranges.append( (timestamp_now - match_time_delta, math.inf) )
             
-            # ELSE... A Match Was Made
-            meta_list_index = i
-            if same_match_meta_index or not match_all: break
-            else: continue # To Match All
-        
-        if (select_meta_data == FILE_META_MIME              or select_meta_data == FILE_META_FORMAT
-         or select_meta_data == FILE_META_FORMAT_LONG       or select_meta_data == FILE_META_AUDIO_CHANNEL_LAYOUT
-         or select_meta_data == FILE_META_AUDIO_TITLE       or select_meta_data == FILE_META_AUDIO_ALBUM
-         or select_meta_data == FILE_META_AUDIO_ARTIST      or select_meta_data == FILE_META_AUDIO_GENRE
-         or select_meta_data == FILE_META_AUDIO_PUBLISHER):
-            #print('Text Meta')
+            elif how_to_match == OLDER_THAN:
+                ranges.append( (-math.inf, timestamp_now - match_time_delta) )
             
-            file_meta_text = file_meta_data[select_meta_data]
-            file_meta_text = None if file_meta_text == '' else file_meta_text
-            if no_match_case and file_meta_text:
-                file_meta_text = file_meta_text.casefold()
-            match_meta_text_group = meta_data.get(DATA, None)
-            #match_meta_text_group = None if match_meta_text_group == '' else match_meta_text_group
+            else:
+                ranges.append( (-math.inf, math.inf) )
+        
+        # Dates are only checked as datetimes here, so don't search them as a column of timestamps.
+        if exact_match and not matches:
+            matches.append(lambda value: not skip_match) # No date, nothing to match or skip
+    
+    elif select_meta_data == FILE_META_TYPE:
+        
+        getValue = lambda file_meta_data: file_meta_data[FILE_META_TYPE] or None
+        
+        for match_meta_constant in [meta_data.get(DATA, None)]:
+            match_meta_constant = None if match_meta_constant == '' else match_meta_constant
             
-            if type(match_meta_text_group) != tuple and type(match_meta_text_group) != list: # Make it a List
-                match_meta_text_group = [match_meta_text_group]
+            # If searching for TYPE_APPLICATION, force match all custom sub catigories too.
+            if match_meta_constant == TYPE_APPLICATION:
+                match_meta_constants = (TYPE_APPLICATION, TYPE_ARCHIVE, TYPE_DOCUMENT)
+            else:
+                match_meta_constants = (match_meta_constant,)
             
-            for match_meta_text in match_meta_text_group:
-                match_meta_text = None if match_meta_text == '' else match_meta_text
-                
-                if no_match_case and match_meta_text:
-                    match_meta_text = match_meta_text.casefold()
-                
-                if operator == OR:
-                    match_failed, match_skipped = False,False
-                
-                if how_to_match == EXACT_MATCH:
-                    if file_meta_text != match_meta_text:
-                        match_failed = True
-                elif how_to_match == LOOSE_MATCH:
-                    if file_meta_text and file_meta_text.find(match_meta_text) == -1:
-                        match_failed = True
-                elif how_to_match == SKIP_EXACT_MATCH:
-                    if file_meta_text == match_meta_text:
-                        match_skipped = True
-                elif how_to_match == SKIP_LOOSE_MATCH:
-                    if file_meta_text and file_meta_text.find(match_meta_text) > -1:
-                        match_skipped = True
-                
-                if match_failed or match_skipped:
-                    if operator == AND: break
-                if not match_failed and not match_skipped:
-                    if operator == OR: break
+            if exact_match or loose_match: # Only EXACT_MATCH works here
+                matches.append(lambda value, match_meta_constants=match_meta_constants: value in match_meta_constants)
+            else:
+                matches.append(lambda value: True)
+    
+    elif (select_meta_data == FILE_META_HEIGHT            or select_meta_data == FILE_META_WIDTH
+       or select_meta_data == FILE_META_BIT_DEPTH         or select_meta_data == FILE_META_VIDEO_BITRATE
+       or select_meta_data == FILE_META_VIDEO_FRAME_RATE  or select_meta_data == FILE_META_AUDIO_BITRATE
+       or select_meta_data == FILE_META_AUDIO_SAMPLE_RATE or select_meta_data == FILE_META_AUDIO_CHANNELS
+       or select_meta_data == FILE_META_AUDIO_TRACK):
+        
+        getValue = lambda file_meta_data: getMetaNumber(file_meta_data[select_meta_data])
+        
+        for match_meta_number in makeList(meta_data.get(DATA, 0)):
+            match_meta_number = 0 if not match_meta_number else match_meta_number
+            
+            if exact_match:
+                ranges.append( (match_meta_number, match_meta_number) )
+            elif loose_match:
+                match_meta_number_high = match_meta_number + (match_meta_number * 0.05)
+                match_meta_number_low = match_meta_number - (match_meta_number * 0.05)
+                ranges.append( (match_meta_number_low, match_meta_number_high) )
+            elif how_to_match == LESS_THAN: # Numbers less than match_meta_number fail to match
+                ranges.append( (match_meta_number, math.inf) )
+            elif how_to_match == MORE_THAN: # Numbers more than match_meta_number fail to match
+                ranges.append( (-math.inf, match_meta_number) )
+            else:
+                ranges.append( (-math.inf, math.inf) )
+    
+    elif (select_meta_data == FILE_META_MIME              or select_meta_data == FILE_META_FORMAT
+       or select_meta_data == FILE_META_FORMAT_LONG       or select_meta_data == FILE_META_AUDIO_CHANNEL_LAYOUT
+       or select_meta_data == FILE_META_AUDIO_TITLE       or select_meta_data == FILE_META_AUDIO_ALBUM
+       or select_meta_data == FILE_META_AUDIO_ARTIST      or select_meta_data == FILE_META_AUDIO_GENRE
+       or select_meta_data == FILE_META_AUDIO_PUBLISHER):
+        
+        if no_match_case:
+            getValue = lambda file_meta_data: (file_meta_data[select_meta_data] or '').casefold() or None
+        else:
+            getValue = lambda file_meta_data: file_meta_data[select_meta_data] or None
+        
+        for match_meta_text in makeList(meta_data.get(DATA, None)) or [None]:
+            match_meta_text = None if match_meta_text == '' else match_meta_text
+            if no_match_case and match_meta_text:
+                match_meta_text = match_meta_text.casefold()
             
-            # IF...
-            if match_failed:
-                if same_match_meta_index or not match_all: continue
+            if exact_match:
+                matches.append(lambda value, match_meta_text=match_meta_text: value == match_meta_text)
+            elif how_to_match == LOOSE_MATCH: # Files without this meta data are not checked
+                matches.append(lambda value, match_meta_text=match_meta_text or '': not value or value.find(match_meta_text) > -1)
+            elif how_to_match == SKIP_LOOSE_MATCH:
+                matches.append(lambda value, match_meta_text=match_meta_text or '': bool(value) and value.find(match_meta_text) > -1)
+            else:
+                matches.append(lambda value: True)
+    
+    else:
+        return None
+    
+    # Searches with only ranges can also search the meta data of many files at once. (See getMetaSearchMask)
+    if not matches:
+        column_search = (select_meta_data, getValue, ranges, operator == AND, skip_match, how_to_match == SKIP_LOOSE_MATCH, no_meta_fails)
+    else:
+        column_search = None
+    
+    for low, high in ranges:
+        if how_to_match == SKIP_LOOSE_MATCH:
+            matches.append(lambda value, low=low, high=high: low < value < high)
+        else:
+            matches.append(lambda value, low=low, high=high: low <= value <= high)
+    
+    if operator == AND:
+        hasMatch = all
+    else:
+        hasMatch = lambda match_results: not matches or any(match_results)
+    
+    def metaSearch(file_meta_data):
+        value = getValue(file_meta_data)
+        if value == None and no_meta_fails:
+            return True, False
+        # Skipped meta data "matches" when a file's meta data doesn't match it.
+        if hasMatch( match(value) != skip_match for match in matches ):
+            return False, False
+        return (False, True) if skip_match else (True, False)
+    
+    metaSearch.column_search = column_search
+    
+    return metaSearch
+
+
+### Search the meta data of many files at once, with each meta data in a column (numpy array). The same as using getMetaSearchResults
+### on every file, except only the files that match are returned, not which meta_list_index matched.
+###     (files) A List of FileMeta.
+###     (meta_searches) The compiled meta searches. (See compileMetaSearches)
+###     (match_file_meta_options) The match file meta data search options.
+###     (meta_list_order) Optional order (list indexes) to search the meta_searches in, only used with MATCH_ALL_INDEXES.
+###     --> Returns a [numpy.ndarray] of Booleans (True if a file matched) or None if a meta search can't be done with columns
+def getMetaSearchMask(files, meta_searches, match_file_meta_options, meta_list_order = None):
+    same_match_meta_index = SAME_MATCH_INDEX in match_file_meta_options
+    match_all = MATCH_ALL_INDEXES in match_file_meta_options
+    
+    if any( metaSearch != None and metaSearch.column_search == None for metaSearch in meta_searches ):
+        return None
+    
+    if meta_list_order == None:
+        meta_list_order = range(len(meta_searches))
+    
+    meta_list_index = numpy.full(len(files), -1)
+    searching = numpy.ones(len(files), dtype=bool) # Files still searching, the same as not breaking out of the loop
+    meta_columns = {} # {select_meta_data : numpy.ndarray} Reuse columns of the same meta data
+    
+    for i in meta_list_order:
+        
+        if meta_searches[i] == None:
+            continue # Unknown meta data
+        
+        select_meta_data, getValue, ranges, match_all_ranges, skip_match, skip_loose_match, no_meta_fails = meta_searches[i].column_search
+        
+        meta_column = meta_columns.get(select_meta_data)
+        if meta_column is None:
+            meta_column = numpy.array([ getValue(file) for file in files ], dtype=float) # None = NaN
+            meta_columns[select_meta_data] = meta_column
+        
+        # Skipped meta data "matches" when a file's meta data doesn't match it.
+        if ranges:
+            range_matches = []
+            for low, high in ranges:
+                if skip_loose_match:
+                    in_range = (low < meta_column) & (meta_column < high)
                 else:
-                    meta_list_index = -1
-                    break
-            if match_skipped and match_all:
+                    in_range = (low <= meta_column) & (meta_column <= high)
+                range_matches.append(in_range != skip_match)
+            matched = numpy.logical_and.reduce(range_matches) if match_all_ranges else numpy.logical_or.reduce(range_matches)
+        else:
+            matched = numpy.ones(len(files), dtype=bool)
+        
+        match_failed = ~matched if not skip_match else numpy.zeros(len(files), dtype=bool)
+        match_skipped = ~matched if skip_match else numpy.zeros(len(files), dtype=bool)
+        if no_meta_fails:
+            no_meta = numpy.isnan(meta_column)
+            match_failed |= no_meta
+            match_skipped &= ~no_meta
+            matched &= ~no_meta
+        
+        # IF...
+        if not (same_match_meta_index or not match_all):
+            meta_list_index[searching & match_failed] = -1
+            searching &= ~match_failed
+        if match_all:
+            meta_list_index[searching & match_skipped] = -1
+            searching &= ~match_skipped
+        
+        # ELSE... A Match Was Made
+        matched &= searching
+        meta_list_index[matched] = numpy.maximum(meta_list_index[matched], i)
+        if same_match_meta_index or not match_all:
+            searching &= ~matched
+    
+    return meta_list_index > -1
+
+
+### Get a timestamp (or length of time) from the file's meta data.
+###     (file_meta_timestamp) A timestamp, length of time or year (FILE_META_AUDIO_YEAR).
+###     (as_date_time) Return a datetime instead of a timestamp.
+###     --> Returns a [Float] or [datetime] or None if no date found
+def getMetaTimestamp(file_meta_timestamp, as_date_time = False):
+    if file_meta_timestamp == None or file_meta_timestamp == '':
+        return None
+    try:
+        file_meta_timestamp = float(file_meta_timestamp) # Media lengths may be text
+        if as_date_time:
+            return datetime.fromtimestamp(file_meta_timestamp)
+    except (ValueError, OverflowError, OSError):
+        return None
+    return file_meta_timestamp
+
+
+### Get a single part of a file size, the same way sizes are separated out into GB / MB / KB / Bytes.
+###     (file_size) The file size in bytes.
+###     (size_unit) 1 (Bytes), KILOBYTE, MEGABYTE or GIGABYTE.
+###     --> Returns a [Integer]
+def getFileSizePart(file_size, size_unit):
+    if size_unit == 1:
+        return math.floor(math.remainder(file_size, KILOBYTE)) if file_size > KILOBYTE else file_size
+    return math.floor(math.remainder(file_size, size_unit * KILOBYTE) / size_unit)
+
+
+### Get a number from the file's meta data.
+###     (file_meta_number) A number (or text number) or None.
+###     --> Returns a [Number]
+def getMetaNumber(file_meta_number):
+    if not file_meta_number:
+        return 0
+    if type(file_meta_number) == str:
+        try:
+            return float(file_meta_number)
+        except ValueError:
+            return 0
+    return file_meta_number
+
+
+### Search current file meta data for any specific meta data in edit_details. Return -1 or 0+ (meta_list_index).
+###     (file_meta_data) The current file's meta data.
+###     (meta_searches) The compiled meta searches. (See compileMetaSearches)
+###     (match_file_meta_options) The match file meta data search options.
+###     (meta_list_order) Optional order (list indexes) to search the meta_searches in, only used with MATCH_ALL_INDEXES.
+###     --> Returns a [Integer]
+def getMetaSearchResults(file_meta_data, meta_searches, match_file_meta_options, meta_list_order = None):
+    same_match_meta_index = SAME_MATCH_INDEX in match_file_meta_options
+    match_all = MATCH_ALL_INDEXES in match_file_meta_options
+    
+    if meta_list_order == None:
+        meta_list_order = range(len(meta_searches))
+    
+    meta_list_index = -1
+    for i in meta_list_order:
+        
+        metaSearch = meta_searches[i]
+        if metaSearch == None:
+            continue # Unknown meta data
+        
+        match_failed, match_skipped = metaSearch(file_meta_data)
+        
+        # IF...
+        if match_failed:
+            if same_match_meta_index or not match_all: continue
+            else:
                 meta_list_index = -1
                 break
-            elif match_skipped and not match_all: ## Test
-                continue
-            
-            # ELSE... A Match Was Made
-            meta_list_index = i
-            if same_match_meta_index or not match_all: break
-            else: continue # To Match All
+        if match_skipped and match_all:
+            meta_list_index = -1
+            break
+        elif match_skipped and not match_all:
+            continue
+        
+        # ELSE... A Match Was Made
+        meta_list_index = max(meta_list_index, i)
+        if same_match_meta_index or not match_all: break
+        else: continue # To Match All
     
     if debug: print(f'meta_list_index: {meta_list_index}')
     
     return meta_list_index
 
 
-### Search current file's contents for any specific text. Return -1 or 0+ (contents_list_index).
+### Search current file's contents for any specific text. Return -1 or 0+ (contents_list_index), or -2 if the file couldn't be read.
 ###     (file_path) The path to the file to search through.
 ###     (match_file_contents_list) The file contents to search for.
 ###     (match_file_contents_options) The match file contents search options.
 ###     (insert_file_name_options) The insert file name text modify options.
+###     (sniffed_types) The file types found in this file's header (FileMeta.sniffed_types), used to skip files already known to be binary files.
 ###     --> Returns a [Integer] and [List]
-def getFileContentsSearchResults(file_path, match_file_contents_list, match_file_contents_options, insert_file_name_options):
+def getFileContentsSearchResults(file_path, match_file_contents_list, match_file_contents_options, insert_file_name_options, sniffed_types = ()):
     
-    if Path.exists(file_path):
-        file_contents, text_encoding = readFile(file_path)
-        if not file_contents: return -1, [] # Can't open file, not a text file.
-    else:
+    if not Path.exists(file_path):
         print(f'\nERROR: File Not Found: [ {file_path} ]')
+        return -2, []
+    
+    # Skip binary files before reading them, they can't be decoded as text anyway.
+    text_encoding = getTextFileEncoding(file_path, sniffed_types)
+    if SEARCH_BINARY_FILES not in match_file_contents_options and not text_encoding:
+        if debug: print(f'Skipping Binary File: [ {file_path} ]')
         return -1, []
     
     contents_list_index, i = -1, -1
@@ -2546,50 +4319,25 @@ def getFileContentsSearchResults(file_path, match_file_contents_list, match_file
     regex_search = REGEX in match_file_contents_options
     regex_group_source = REGEX_GROUP in match_file_contents_options
     
-    if no_match_case:
-        file_contents = file_contents.casefold()
-    
-    for match_contents in match_file_contents_list:
-        i += 1
-        match_failed = False
-        match_skipped = False ## TODO: ignore matched contents?
+    # Scan the file contents once for every entry in the list, recording which list indexes matched.
+    # Regular expressions are searched for in the whole file, simple text is searched for a piece of the file at a time.
+    if regex_search:
+        file_contents, text_encoding = readFile(file_path, text_encoding)
+        if not file_contents: return -2, [] # Can't open file, not a text file.
         
         if no_match_case:
-            match_contents = match_contents.casefold()
-        
-        if regex_search:
-            
-            # Make a regular expression match.
-            re_pattern = re.compile(match_contents)
-            re_matches = re_pattern.search(file_contents)
-            
-            if not re_matches:
-                match_failed = True
-            
-            # Get all the match data only if it is to be used in file name via regex
-            elif regex_group_source:
-                
-                compiled_match_contents_data = []
-                while re_matches:
-                    compiled_match_contents_data.append( re_matches )
-                    re_matches = re_pattern.search(file_contents, re_matches.end())
-                
-                #compiled_match_contents_data.reverse()
-                
-                # Remove string index matches made if above match limit.
-                if REGEX in insert_file_name_options:
-                    ignore = len(compiled_match_contents_data) - match_limit
-                    while ignore > 0:
-                        if search_from_right:
-                            compiled_match_contents_data.pop(0)
-                        else:
-                            compiled_match_contents_data.pop(-1)
-                        ignore -= 1
+            file_contents = file_contents.casefold()
         
-        else:
-            # Make a simple string match.
-            if file_contents.find(match_contents) == -1:
-                match_failed = True
+        re_patterns = [ re.compile(match_contents.casefold() if no_match_case else match_contents) for match_contents in match_file_contents_list ]
+        indexes_matched = findPatternsInText(file_contents, re_patterns, match_all and not same_match_index)
+    else:
+        match_texts = [ match_contents.casefold() for match_contents in match_file_contents_list ] if no_match_case else match_file_contents_list
+        indexes_matched = findTextInFile(file_path, match_texts, no_match_case, match_all and not same_match_index, text_encoding)
+        if not indexes_matched: return -2, [] # Can't open file, not a text file.
+    
+    for matched in indexes_matched:
+        i += 1
+        match_failed = not matched
         
         # IF...
         if match_failed:
@@ -2603,11 +4351,260 @@ def getFileContentsSearchResults(file_path, match_file_contents_list, match_file
         if same_match_index or not match_all: break
         else: continue # To Match All
     
+    # Get all the match data only if it is to be used in file name via regex
+    if regex_search and regex_group_source and contents_list_index > -1:
+        
+        re_pattern = re_patterns[contents_list_index]
+        re_matches = re_pattern.search(file_contents)
+        while re_matches:
+            compiled_match_contents_data.append( re_matches )
+            re_matches = re_pattern.search(file_contents, re_matches.end())
+        
+        #compiled_match_contents_data.reverse()
+        
+        # Remove string index matches made if above match limit.
+        if REGEX in insert_file_name_options:
+            ignore = len(compiled_match_contents_data) - match_limit
+            while ignore > 0:
+                if search_from_right:
+                    compiled_match_contents_data.pop(0)
+                else:
+                    compiled_match_contents_data.pop(-1)
+                ignore -= 1
+    
     #print('compiled_match_contents_data: %s' % compiled_match_contents_data)
     
     return contents_list_index, compiled_match_contents_data
 
 
+### A regular expression match from a file's contents that can be sent from one process to another, unlike a re.Match.
+### Only the text of each matched group is kept, which is all that's needed to insert matched groups into a file name.
+class ContentsMatch:
+    __slots__ = ('groups_text',)
+    
+    ###     (groups_text) A Tuple of the whole match and then each group's text (or None). Ex. (re_match.group(0),) + re_match.groups()
+    def __init__(self, groups_text):
+        self.groups_text = groups_text
+    
+    def group(self, group_number = 0):
+        return self.groups_text[group_number]
+
+
+### Search the contents of many files at once using a pool of processes (see contents_search_workers) and the contents cache.
+### Only files that would still be renamed after searching their meta data are searched. The results are remembered in the
+### compiled preset and used when each file's new file name is created, so files are still renamed in the same order.
+### Every file given should be reached before a rename limit is hit. (See getRenamesLeft)
+###     (compiled) The CompiledPreset.
+###     (files) A List of FileMeta.
+def searchFilesContents(compiled, files):
+    
+    compiled.contents_results = {}
+    if contents_search_workers <= 1 or len(files) < contents_search_min_files:
+        return # Each file is searched when renamed. (See getCachedFileContentsSearchResults)
+    
+    if compiled.match_file_meta_data:
+        keep_files = filterFilesByMeta(compiled, files)
+        files = [ file for file, keep_file in zip(files, keep_files) if keep_file ]
+    
+    # Skip any unchanged files already cached.
+    if use_contents_cache:
+        file_stats = []
+        for file in files:
+            try:
+                file_stats.append( (file, os.stat(file[FILE_META_PATH])) )
+            except OSError:
+                file_stats.append( (file, None) ) # Doesn't exist anymore, reported when searched
+        compiled.contents_results = getCachedContentsResults([ file for file, file_stat in file_stats if file_stat ],
+                                                             [ file_stat for file, file_stat in file_stats if file_stat ], compiled.contents_search_key)
+        file_stats = [ (file, file_stat) for file, file_stat in file_stats if file[FILE_META_PATH] not in compiled.contents_results ]
+    else:
+        file_stats = [ (file, None) for file in files ]
+    
+    files = [ file for file, file_stat in file_stats ]
+    file_paths = [ file[FILE_META_PATH] for file in files ]
+    # Only the file types already read are sent to the other processes, no FileMeta. Any meta data a FileMeta read there would be lost.
+    arguments = ( file_paths, [compiled.match_file_contents_list] * len(files), [compiled.match_file_contents_options] * len(files),
+                  [compiled.insert_file_name_options] * len(files), [ file.sniffed_types for file in files ] )
+    
+    # All these files will be reached, so any left after using the cache are searched now, even if too few to use the pool.
+    if len(files) >= contents_search_min_files:
+        with ProcessPoolExecutor(max_workers=contents_search_workers) as executor:
+            contents_results = list(executor.map(getFileContentsSearchResultsInProcess, *arguments, chunksize=8))
+    else:
+        contents_results = list(map(getFileContentsSearchResultsInProcess, *arguments))
+    
+    for (file, file_stat), (contents_list_index, compiled_match_contents_data) in zip(file_stats, contents_results):
+        compiled.contents_results[file[FILE_META_PATH]] = (contents_list_index, compiled_match_contents_data)
+        
+        # Added to the contents cache after each directory, unless the file couldn't be read. (See saveSearchedFileContents)
+        if file_stat and contents_list_index != -2:
+            contents_cache_updates.append( (file[FILE_META_PATH], file_stat, compiled.contents_search_key, contents_list_index, compiled_match_contents_data) )
+
+
+### Search a file's contents, or use the results already searched (see searchFilesContents) or cached, if the file hasn't
+### changed since it was last searched. Only this one file is read, so a rename limit still stops any more files being read.
+###     (compiled) The CompiledPreset.
+###     (file_meta_data) The FileMeta of the file to search.
+###     --> Returns a [Integer] and [List]
+def getCachedFileContentsSearchResults(compiled, file_meta_data):
+    file_path = file_meta_data[FILE_META_PATH]
+    
+    if file_path in compiled.contents_results: # Already searched
+        return compiled.contents_results.pop(file_path)
+    
+    if not use_contents_cache:
+        return getFileContentsSearchResults(file_path, compiled.match_file_contents_list, compiled.match_file_contents_options,
+                                            compiled.insert_file_name_options, file_meta_data.sniffed_types)
+    
+    try:
+        file_stat = os.stat(file_path)
+        contents_results = getCachedContentsResults([file_meta_data], [file_stat], compiled.contents_search_key)
+        if file_path in contents_results:
+            return contents_results[file_path]
+    except OSError:
+        file_stat = None # Doesn't exist anymore, reported when searched
+    
+    contents_list_index, compiled_match_contents_data = getFileContentsSearchResultsInProcess(file_path, compiled.match_file_contents_list,
+                                                            compiled.match_file_contents_options, compiled.insert_file_name_options, file_meta_data.sniffed_types)
+    
+    # Added to the contents cache after each directory, unless the file couldn't be read. (See saveSearchedFileContents)
+    if file_stat and contents_list_index != -2:
+        contents_cache_updates.append( (file_path, file_stat, compiled.contents_search_key, contents_list_index, compiled_match_contents_data) )
+    
+    return contents_list_index, compiled_match_contents_data
+
+
+### Search current file's contents in another process. (See searchFilesContents)
+### Same as getFileContentsSearchResults, but any regular expression matches are returned as a List of ContentsMatch,
+### which can also be cached.
+###     --> Returns a [Integer] and [List]
+def getFileContentsSearchResultsInProcess(file_path, match_file_contents_list, match_file_contents_options, insert_file_name_options, sniffed_types = ()):
+    contents_list_index, compiled_match_contents_data = getFileContentsSearchResults(file_path, match_file_contents_list,
+                                                            match_file_contents_options, insert_file_name_options, sniffed_types)
+    return contents_list_index, [ ContentsMatch((re_match.group(0),) + re_match.groups()) for re_match in compiled_match_contents_data ]
+
+
+### Find the text encoding of a file using only the start of the file (and the file types already found in the file header).
+### Text that starts with a BOM uses the encoding of that BOM. Any other text has no null bytes and its first few kilobytes can
+### be decoded as utf-8 (or ascii) text, or else it's read as cp1252 (or latin-1) text if almost all of it is printable.
+###     (file_path) The path to the file to check.
+###     (sniffed_types) The file types found in this file's header (FileMeta.sniffed_types), if already read.
+###     --> Returns a [String] or [None] if not a text file
+def getTextFileEncoding(file_path, sniffed_types = ()):
+    sample_size = 8192 # Bytes
+    min_printable = 0.95 # Of characters in sample
+    
+    # Archives, audio, fonts, images and videos found in the file header. (Only if file type meta data was already read.)
+    if sniffed_types:
+        return None
+    
+    try:
+        with open(file_path, 'rb') as file:
+            sample = file.read(sample_size)
+    except OSError:
+        return 'utf-8' # Let the file contents search report the error.
+    
+    # UTF-16 and UTF-32 text have null bytes, so check for a BOM first. (UTF-32 LE starts with the UTF-16 LE BOM.)
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+        return 'utf-32'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    
+    if b'\x00' in sample:
+        return None
+    
+    # A multi-byte character cut off at the end of the sample is not an error.
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    # Any byte can be decoded as latin-1, so only call it text if it looks like text.
+    try:
+        text_encoding = 'cp1252'
+        sample_text = sample.decode(text_encoding)
+    except UnicodeDecodeError:
+        text_encoding = 'latin-1'
+        sample_text = sample.decode(text_encoding)
+    
+    printable = sum( character.isprintable() or character in '\t\n\r\f' for character in sample_text )
+    if printable < len(sample_text) * min_printable:
+        return None
+    
+    return text_encoding
+
+
+### Search text for regular expressions in order, stopping at the first match (or the first failed match if find_all).
+###     (file_contents) The text to search through.
+###     (re_patterns) A List of compiled regular expressions.
+###     (find_all) All patterns must match, else stop once any pattern matches.
+###     --> Returns a [List] of Booleans (pattern matched)
+def findPatternsInText(file_contents, re_patterns, find_all = False):
+    patterns_matched = [False] * len(re_patterns)
+    
+    for i, re_pattern in enumerate(re_patterns):
+        patterns_matched[i] = bool(re_pattern.search(file_contents))
+        if patterns_matched[i] != find_all:
+            break
+    
+    return patterns_matched
+
+
+### Search for text in a text file, reading only a piece of the file at a time and stopping once every text needed is found:
+### all texts if find_all, else the first text found in match_texts order. Text that spans two pieces of the file will still be found.
+###     (file_path) The path to the file to search through.
+###     (match_texts) A List of text to search for.
+###     (no_match_case) Case fold the file contents. (match_texts should already be case folded)
+###     (find_all) Keep reading until all texts are found, else stop once no text before one found is left to find.
+###     (text_encoding) The text encoding of the file. (See getTextFileEncoding)
+###     --> Returns a [List] of Booleans (text found) or [Boolean] False if the file couldn't be read or is empty
+def findTextInFile(file_path, match_texts, no_match_case = False, find_all = False, text_encoding = None):
+    chunk_size = 1048576 # Characters
+    overlap_size = max( len(match_text) for match_text in match_texts ) - 1 if match_texts else 0
+    texts_found = [False] * len(match_texts)
+    texts_left = list(range(len(match_texts)))
+    file_read = False
+    
+    try:
+        # Note: ascii text is also utf-8 text.
+        with open(file_path, 'r', encoding=text_encoding if text_encoding else 'utf-8') as file:
+            
+            overlap = ''
+            while texts_left:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    break
+                file_read = True
+                
+                if no_match_case:
+                    chunk = chunk.casefold()
+                file_contents = overlap + chunk
+                overlap = file_contents[-overlap_size:] if overlap_size else ''
+                
+                for i in texts_left:
+                    if file_contents.find(match_texts[i]) > -1:
+                        texts_found[i] = True
+                        if not find_all:
+                            break # Only texts before this one can still change which text is found first
+                
+                if find_all:
+                    texts_left = [ i for i in texts_left if not texts_found[i] ]
+                elif True in texts_found:
+                    texts_left = [ i for i in texts_left if i < texts_found.index(True) ]
+    except:
+        print(f'\nWARNING: Failed to open file: [ {file_path} ]')
+        print(f'Posible text encoding issue. File was read as {text_encoding if text_encoding else "utf-8"} text.')
+        return False
+    
+    if not file_read:
+        return False
+    
+    return texts_found
+
+
 ### Turn file meta data into formatted text to insert into a file name.
 ###     (meta_data) File meta data that is either text or a number.
 ###     (type) The type of meta data will determine how it is formatted.
@@ -2645,7 +4642,7 @@ def formatMetaData(meta_data, type):
             text = 'Document'
     
     # Date
-    elif type == FILE_META_ACCESSED or type == FILE_META_MODIFIED or type == FILE_META_CREATED: # or FILE_META_METADATA
+    elif type == FILE_META_ACCESSED or type == FILE_META_MODIFIED or type == FILE_META_CREATED or type == FILE_META_DATE_TAKEN: # or FILE_META_METADATA
         if meta_data:
             file_meta_date_time = datetime.fromtimestamp(float(meta_data))
             text = file_meta_date_time.strftime(date_time_fomat)
@@ -2878,6 +4875,28 @@ def checkAllAvalibleCountLimits(tracked_data, list_index, insert_file_name_list_
     return list_index
 
 
+### Get the least number of files that could be renamed before a rename limit is hit. Each file reviewed is renamed at most once,
+### so at least this many more files will be reviewed.
+###     (edit_details) All the details on how to proceed with the file name edits.
+###     --> Returns a [Integer] or NO_LIMIT
+def getRenamesLeft(edit_details):
+    renames_left = []
+    
+    hard_rename_limit = getTrackedData(edit_details, FILES_REVIEWED, [LIMIT])
+    if hard_rename_limit != NO_LIMIT:
+        renames_left.append( hard_rename_limit - getTrackedData(edit_details, FILES_RENAMED, [FULL_AMOUNT]) )
+    
+    soft_rename_limit = getTrackedData(edit_details, DIRECTORY_FILES_RENAMED, [LIMIT])
+    if soft_rename_limit != NO_LIMIT:
+        renames_left.append( soft_rename_limit - getTrackedData(edit_details, DIRECTORY_FILES_RENAMED, [AMOUNT]) )
+    
+    # A count is skipped forward when a file name already exists, so a single file can hit all count limits.
+    if NO_LIMIT not in getTrackedData(edit_details, FILE_NAME_COUNT_LIMIT):
+        renames_left.append(1)
+    
+    return max(min(renames_left), 1) if renames_left else NO_LIMIT
+
+
 ### Check if all count limits hit in any dynamic text used.
 ###     (tracked_data) A Dictionary with file name COUNT data.
 ###     --> Returns a [Boolean] 
@@ -2904,13 +4923,12 @@ def allCountLimitsHitCheck(tracked_data):
 ###     --> Returns a [String] 
 def getInsertText(edit_details, list_index = -1):
     
+    compiled = edit_details[COMPILED_PRESET]
     edit_type = edit_details[EDIT_TYPE] # No get, force error if missing
-    modify_data = edit_details[INSERT_FILE_NAME] # No get, force error if missing
-    match_file_name_options = getOptions(edit_details.get(MATCH_FILE_NAME, ''))
-    same_match_index = SAME_MATCH_INDEX in match_file_name_options
-    insert_file_name_list = getTextList(modify_data) # Always a List
-    insert_file_name_options = getOptions(modify_data)
-    no_repeat_text_list = NO_REPEAT_TEXT_LIST in insert_file_name_options
+    same_match_index = compiled.match_same_index
+    insert_file_name_list = compiled.insert_file_name_list # Always a List
+    insert_file_name_options = compiled.insert_file_name_options
+    no_repeat_text_list = compiled.insert_no_repeat
     tracked_data = getTrackedData(edit_details)
     
     insert_file_name_list_size = len(insert_file_name_list)
@@ -2972,7 +4990,7 @@ def getInsertText(edit_details, list_index = -1):
     else: ## TODO Index Out Of Bounds, Warn User?
         file_name_text_insert = ''
     
-    if EXTENSION in insert_file_name_options and REGEX not in insert_file_name_options and edit_type != RENAME:
+    if compiled.insert_extension and not compiled.insert_regex and edit_type != RENAME:
         if file_name_text_insert != '' and file_name_text_insert.find('.') != 0:
             file_name_text_insert = '.'+file_name_text_insert # Add a '.' if missing
     
@@ -3056,78 +5074,62 @@ def getCustomText(edit_details, list_index = -1):
 ###     --> Returns a [String] 
 def insertTextIntoFileName(edit_details):
     
+    compiled = edit_details[COMPILED_PRESET]
     file_path = getTrackedData(edit_details, CURRENT_FILE_META, [FILE_META_PATH])
     new_file_name = file_path.name # Start with orginal file name
     
-    match_file_name_data = edit_details.get(MATCH_FILE_NAME, '') # '' will always match
-    ignore_file_name_data = edit_details.get(IGNORE_FILE_NAME, None)
-    insert_file_name_data = edit_details[INSERT_FILE_NAME]
+    match_file_name_list = compiled.match_file_name_list
     
     file_meta_data = getTrackedData(edit_details, CURRENT_FILE_META)
     
-    match_file_contents_data = edit_details.get(MATCH_FILE_CONTENTS, None)
-    match_file_contents_list = getTextList(match_file_contents_data)
-    match_file_contents_options = getOptions(match_file_contents_data)
-    
-    match_file_meta_data = edit_details.get(MATCH_FILE_META, None)
-    match_file_meta_list = getMetaList(match_file_meta_data)
-    match_file_meta_options = getOptions(match_file_meta_data)
+    match_file_contents_data = compiled.match_file_contents_data
     
-    match_file_name_options = getOptions(match_file_name_data)
-    ignore_file_name_options = getOptions(ignore_file_name_data)
-    insert_file_name_options = getOptions(insert_file_name_data)
+    match_file_meta_data = compiled.match_file_meta_data
+    match_file_meta_list = compiled.match_file_meta_list
+    match_file_meta_options = compiled.match_file_meta_options
     
     # Search Data
-    match_file_name_list, searchable_match_file_name, ignore_file_name_list, searchable_ignore_file_name = getSearchData(match_file_name_data, ignore_file_name_data, file_path)
+    searchable_match_file_name, searchable_ignore_file_name = getSearchData(compiled, file_path)
     
     # File Name Serach
     # Note: The search data match_file_name_list is never empty and will hold at least one empty string [""].
     #       So unless there is one or more non-empty strings to match (or not match -1), search_index will always be 0.
-    search_index, edit_extension, compiled_match_data = getFileNameSearchResults(match_file_name_list, searchable_match_file_name, match_file_name_options, insert_file_name_options)
+    search_index, edit_extension, compiled_match_data = getFileNameSearchResults(compiled, searchable_match_file_name)
     
     # Ignore File Name Search
-    if ignore_file_name_list and search_index > -1:
-        ignore_match = getFileNameIgnoreResults(ignore_file_name_list, searchable_ignore_file_name, ignore_file_name_options)
+    if compiled.ignore_file_name_list and search_index > -1:
+        ignore_match = getFileNameIgnoreResults(compiled, searchable_ignore_file_name)
     else:
         ignore_match = False
     
+    # File Meta Search (Before the file contents are read, meta data is much faster to check.)
+    if match_file_meta_data and search_index > -1 and not ignore_match:
+        meta_list_index = getMetaSearchResults(file_meta_data, compiled.meta_searches, match_file_meta_options, compiled.meta_list_order)
+    else:
+        meta_list_index = 0
+    
     # File Contents Search
-    if match_file_contents_data and search_index > -1 and not ignore_match:
-        contents_list_index, compiled_match_contents_data = getFileContentsSearchResults(file_path, match_file_contents_list, match_file_contents_options, insert_file_name_options)
+    if match_file_contents_data and meta_list_index > -1 and search_index > -1 and not ignore_match:
+        contents_list_index, compiled_match_contents_data = getCachedFileContentsSearchResults(compiled, file_meta_data)
     else:
         contents_list_index = 0
         compiled_match_contents_data = []
     
-    # File Meta Search
-    if match_file_meta_data and contents_list_index > -1 and search_index > -1 and not ignore_match:
-        meta_list_index = getMetaSearchResults(file_meta_data, match_file_meta_list, match_file_meta_options)
-    else:
-        meta_list_index = 0
-    
-    text_list_size = 1
-    if type(insert_file_name_data) == dict:
-        is_text_list = True if type(insert_file_name_data.get(TEXT)) == list else False
-        if is_text_list:
-            text_list_size = len(insert_file_name_data.get(TEXT))
-    elif type(insert_file_name_data) == list:
-        is_text_list = True
-        text_list_size = len(insert_file_name_data.get(TEXT))
-    else:
-        is_text_list = False
+    text_list_size = compiled.text_list_size
+    is_text_list = compiled.is_text_list
     
     # Options
-    search_from_right = SEARCH_FROM_RIGHT in match_file_name_options
-    same_match_name_index = SAME_MATCH_INDEX in match_file_name_options
-    match_limit_index = getSpecificOption(match_file_name_options, MATCH_LIMIT, NO_LIMIT)
-    match_limit = ALL if match_limit_index <= NO_LIMIT else match_limit_index
-    regex_search = REGEX in match_file_name_options
-    file_contents_match_limit_index = getSpecificOption(match_file_contents_options, MATCH_LIMIT, NO_LIMIT)
-    search_from_right_file_contents = SEARCH_FROM_RIGHT in match_file_contents_options
-    same_match_contents_index = SAME_MATCH_INDEX in match_file_contents_options
-    same_match_meta_index = SAME_MATCH_INDEX in match_file_meta_options
-    no_repeat_text_list = NO_REPEAT_TEXT_LIST in insert_file_name_options
-    regex_modify = REGEX in insert_file_name_options
-    no_add_dupes = NO_ADD_DUPES in insert_file_name_options
+    search_from_right = compiled.match_from_right
+    same_match_name_index = compiled.match_same_index
+    match_limit_index = compiled.match_limit_index
+    match_limit = compiled.match_limit
+    regex_search = compiled.match_regex
+    file_contents_match_limit_index = compiled.contents_match_limit_index
+    same_match_contents_index = compiled.contents_same_index
+    same_match_meta_index = compiled.meta_same_index
+    no_repeat_text_list = compiled.insert_no_repeat
+    regex_modify = compiled.insert_regex
+    no_add_dupes = compiled.insert_no_add_dupes
     
     match_index = -1
     
@@ -3170,7 +5172,7 @@ def insertTextIntoFileName(edit_details):
         else:
             match_index = 0
         
-        if CUSTOM in insert_file_name_options:
+        if compiled.insert_custom:
             insert_file_name_text, edit_details = getCustomText(edit_details, match_index)
         else:
             insert_file_name_text, edit_details = getInsertText(edit_details, match_index)
@@ -3186,7 +5188,7 @@ def insertTextIntoFileName(edit_details):
                 if match_limit_index < cmdi:
                     cmdi = match_limit_index
                 
-                text_insert = re.sub(match_file_name_list[search_index], insert_file_name_text, compiled_match_data[cmdi].group())
+                text_insert = compiled.match_file_name_patterns[search_index].sub(insert_file_name_text, compiled_match_data[cmdi].group())
             
             elif regex_search and regex_modify and compiled_match_contents_data: # REGEX_GROUP used in MATCH_FILE_CONTENTS
                 
@@ -3212,13 +5214,13 @@ def insertTextIntoFileName(edit_details):
             # Create the final text in a rename (ADD, REPLACE, RENAME).
             if edit_details[EDIT_TYPE] == ADD:
                 
-                placement = getPlacement(insert_file_name_data)
+                placement = compiled.placement
                 
                 # Add extension if...
                 if edit_extension:
-                    if EXTENSION in insert_file_name_options and EXTENSION in match_file_name_options:
+                    if compiled.insert_extension and compiled.match_extension:
                         new_file_name = addToFileName(file_path, text_insert, EXTENSION, no_add_dupes) # Only to the END, placement is ignored.
-                    elif EXTENSION in match_file_name_options:
+                    elif compiled.match_extension:
                         new_file_name = addToFileName(file_path, text_insert, placement[0], no_add_dupes) # START and/or END OF_FILE_NAME only.
                 
                 # Else use normal placement options...
@@ -3232,7 +5234,7 @@ def insertTextIntoFileName(edit_details):
                             end_of_match = match.end()
                             if regex_modify:
                                 if not compiled_match_contents_data: # else text_insert already handled above
-                                    text_insert = re.sub(match_file_name_list[search_index], insert_file_name_text, match.group())
+                                    text_insert = compiled.match_file_name_patterns[search_index].sub(insert_file_name_text, match.group())
                             else:
                                 text_insert = insert_file_name_text
                         else:
@@ -3259,7 +5261,7 @@ def insertTextIntoFileName(edit_details):
                             end_of_match = match.end()
                             if regex_modify:
                                 if not compiled_match_contents_data: # else text_insert already defined above
-                                    text_insert = re.sub(match_file_name_list[search_index], insert_file_name_text, match.group())
+                                    text_insert = compiled.match_file_name_patterns[search_index].sub(insert_file_name_text, match.group())
                             else:
                                 text_insert = insert_file_name_text
                         else:
@@ -3901,6 +5903,8 @@ def getUserPresetSelection(string_num):
         number = ''
     elif 'showall'.find(string_num) > -1:
         number = ALL
+    elif 'estimate'.find(string_num) > -1:
+        number = ESTIMATE
     elif string_num.isnumeric():
         number = int(string_num)
     else:
@@ -3991,7 +5995,7 @@ def presetConstantsToText(key, value, parent_key = None, formatted_text = True,
                         if not formatted_text: text += new_line + '{ '
                         for name, val in object.items():
                             text += getMetaDataStr(name, formatted_text, new_line)
-                            if name == FILE_META_ACCESSED or name == FILE_META_MODIFIED or name == FILE_META_CREATED:
+                            if name == FILE_META_ACCESSED or name == FILE_META_MODIFIED or name == FILE_META_CREATED or name == FILE_META_DATE_TAKEN:
                                 if val == EXACT_MATCH:
                                     text += 'Exactly On The ' if formatted_text else ' : EXACT_MATCH, '
                                 elif val == LOOSE_MATCH:
@@ -4119,6 +6123,8 @@ def presetConstantsToText(key, value, parent_key = None, formatted_text = True,
                             text += new_line + 'Match All Text In List Before Renaming' if formatted_text else 'MATCH_ALL_INDEXES, '
                     if SEARCH_SUB_DIRS in value:
                         text += new_line + 'Search Sub Directories' if formatted_text else 'SEARCH_SUB_DIRS, '
+                    if SEARCH_BINARY_FILES in value:
+                        text += new_line + 'Search Binary File Contents' if formatted_text else 'SEARCH_BINARY_FILES, '
                     if EXTENSION in value and parent_key == MATCH_FILE_NAME:
                         text += new_line + 'Only Search The Extension' if formatted_text else 'EXTENSION, '
                     if EXTENSION in value and parent_key == IGNORE_FILE_NAME:
@@ -4393,6 +6399,8 @@ def getMetaDataStr(const, formatted_text = True, starting_text = ''):
         text = starting_text + 'By Audio Published ' if formatted_text else 'FILE_META_AUDIO_PUBLISHER'
     elif const == FILE_META_AUDIO_TRACK:
         text = starting_text + 'By Audio Track Number ' if formatted_text else 'FILE_META_AUDIO_TRACK'
+    elif const == FILE_META_DATE_TAKEN:
+        text = starting_text + 'By Date Photo Taken ' if formatted_text else 'FILE_META_DATE_TAKEN'
     
     elif const == TYPE_APPLICATION:
         text = starting_text + 'Application' if formatted_text else 'TYPE_APPLICATION'
@@ -4443,7 +6451,7 @@ def resetIfMaxed(number, max):
 ###     --> Returns a [Integer] Number of files renamed.
 def drop(files):
     
-    global selected_preset
+    global selected_preset, meta_data_cache_hits, meta_data_cache_misses, contents_cache_hits, contents_cache_misses, meta_data_probe_failures
     start_reverting_renames = False
     start_updating_links = False
     files_renamed = 0
@@ -4596,10 +6604,16 @@ def drop(files):
             preset_loop = loop
             while preset_loop:
                 displayPreset(preset_options, readable_preset_text, selected_preset)
-                preset_selection = input('Continue with this Preset [ Enter ] or choose another? [ # ] or [ (S)how(A)ll ]: ')
+                preset_selection = input('Continue with this Preset [ Enter ] or choose another? [ # ] or [ (S)how(A)ll ] or [ (E)stimate ]: ')
                 preset_selection = getUserPresetSelection(preset_selection)
                 
-                if preset_selection == ALL:
+                if preset_selection == ESTIMATE:
+                    edit_details = preset_options[selected_preset]
+                    files_meta = getFileMetaData(files)
+                    estimateFileRenames(files_meta, edit_details, edit_details.get(INCLUDE_SUB_DIRS, False))
+                    continue
+                
+                elif preset_selection == ALL:
                     displayPreset(preset_options, readable_preset_text)
                     preset_selection = input('Select a Preset [ # ]: ')
                     preset_selection = getUserPresetSelection(preset_selection)
@@ -4616,9 +6630,14 @@ def drop(files):
             print(f'\nPreset [ #{selected_preset} ] Selected')
             edit_details = preset_options[selected_preset]
             
-            # Presort Files
-            get_extra_meta = isExtraMetaNeeded(edit_details)
-            files_meta = getFileMetaData(files, edit_details.get(PRESORT_FILES, None), '', get_extra_meta)
+            # Presort Files (Files dropped with names that will never be renamed only have their extra meta data read if sorted by it.)
+            get_extra_meta = getExtraMetaNeeded(edit_details)
+            compiled = compilePreset(edit_details)[COMPILED_PRESET]
+            if compiled.name_search_needed:
+                extra_meta_filter = lambda files: [ not isSkippedByName(compiled, file.name) for file in files ]
+            else:
+                extra_meta_filter = None
+            files_meta = getFileMetaData(files, edit_details.get(PRESORT_FILES, None), '', get_extra_meta, None, extra_meta_filter)
             
             include_sub_dirs = edit_details.get(INCLUDE_SUB_DIRS, False)
             
@@ -4633,6 +6652,19 @@ def drop(files):
             # Show and record details of files renamed.
             if debug: displayPreset(edit_details_copy, readable_preset_text)
             updateLogFile(edit_details_copy)
+            
+            if meta_data_cache_hits or meta_data_cache_misses:
+                print(f'\nMeta data cache hits: [ {meta_data_cache_hits} ]  misses: [ {meta_data_cache_misses} ]')
+                meta_data_cache_hits, meta_data_cache_misses = 0, 0
+            
+            if contents_cache_hits or contents_cache_misses:
+                print(f'\nContents cache hits: [ {contents_cache_hits} ]  misses: [ {contents_cache_misses} ]')
+                contents_cache_hits, contents_cache_misses = 0, 0
+            
+            if meta_data_probe_failures:
+                print(f'\nFiles that failed to probe (meta data missing): [ {len(meta_data_probe_failures)} ]')
+                if debug: print('\n'.join(sorted(meta_data_probe_failures)))
+                meta_data_probe_failures = set()
     
     else:
         print('\nNo Existing Files or Directories Found.')
@@ -4644,12 +6676,12 @@ def drop(files):
 if __name__ == '__main__':
     print(sys.version)
     
-    if not chardet_installed or not ffmpeg_installed or not filetype_installed:
+    if not chardet_installed or not ffprobe_installed or not filetype_installed:
         not_installed = []
         if not chardet_installed:
             not_installed.append('chardet')
-        if not ffmpeg_installed:
-            not_installed.append('ffmpeg')
+        if not ffprobe_installed:
+            not_installed.append('ffprobe (FFmpeg)')
         if not filetype_installed:
             not_installed.append('filetype')
         not_installed_str = ', '.join(map(str, not_installed))
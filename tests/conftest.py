@@ -0,0 +1,37 @@
+### Shared test setup. The script isn't a package, so it's imported straight from the directory above.
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import batch_file_renamer
+
+
+### Keep the meta data and contents caches of every test in it's own temporary directory, never next to the script.
+@pytest.fixture(autouse=True)
+def meta_data_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_file_renamer, 'meta_data_cache_file_name', str(tmp_path / 'File Meta Data Cache.sqlite3'))
+    monkeypatch.setattr(batch_file_renamer, 'meta_data_cache_db', None)
+    monkeypatch.setattr(batch_file_renamer, 'meta_data_cache_updates', [])
+    monkeypatch.setattr(batch_file_renamer, 'contents_cache_updates', [])
+    monkeypatch.setattr(batch_file_renamer, 'meta_data_probe_failures', set())
+    yield
+    if batch_file_renamer.meta_data_cache_db:
+        batch_file_renamer.meta_data_cache_db.close()
+
+
+### Make a FileMeta of a file written to the temporary directory.
+###     --> Returns a [Function] (file name, file data Bytes or String) --> FileMeta
+@pytest.fixture
+def make_file(tmp_path):
+    def makeFile(file_name, file_data = b''):
+        file_path = tmp_path / file_name
+        if type(file_data) == str:
+            file_path.write_text(file_data, encoding='utf-8')
+        else:
+            file_path.write_bytes(file_data)
+        return batch_file_renamer.FileMeta(tmp_path, file_name, os.stat(file_path))
+    return makeFile
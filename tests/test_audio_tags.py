@@ -0,0 +1,108 @@
+### Audio tags read without ffprobe. (readAudioTags, readID3v2Tags, readID3v1Tags, readFlacTags, readOggTags)
+import struct
+
+import batch_file_renamer as bfr
+
+MP3_FRAME = b'\xff\xfb\x90\x00' + b'\x00' * 60
+
+
+def makeSyncSafeInteger(number):
+    return bytes([ (number >> 21) & 0x7F, (number >> 14) & 0x7F, (number >> 7) & 0x7F, number & 0x7F ])
+
+
+def makeID3v2(frames, version = 3):
+    tag_data = b''
+    for frame_id, text, text_encoding in frames:
+        encoding_byte = {'latin-1' : 0, 'utf-16' : 1, 'utf-16-be' : 2, 'utf-8' : 3}[text_encoding]
+        frame = bytes([encoding_byte]) + text.encode(text_encoding)
+        frame_size = makeSyncSafeInteger(len(frame)) if version == 4 else struct.pack('>I', len(frame))
+        tag_data += frame_id + frame_size + b'\x00\x00' + frame
+    tag_data += b'\x00' * 16 # Padding
+    return b'ID3' + bytes([version, 0, 0]) + makeSyncSafeInteger(len(tag_data)) + tag_data
+
+
+def makeID3v1(title, artist, album, year, track, genre):
+    return (b'TAG' + title.encode('latin-1').ljust(30, b'\x00') + artist.encode('latin-1').ljust(30, b'\x00')
+            + album.encode('latin-1').ljust(30, b'\x00') + year.encode('latin-1') + b'\x00' * 28 + bytes([0, track, genre]))
+
+
+def makeVorbisComments(comments):
+    vendor = b'test vendor'
+    comment_data = struct.pack('<I', len(vendor)) + vendor + struct.pack('<I', len(comments))
+    for comment in comments:
+        comment_data += struct.pack('<I', len(comment.encode('utf-8'))) + comment.encode('utf-8')
+    return comment_data
+
+
+def makeOggPage(packets):
+    segment_table = bytes( len(packet) for packet in packets ) # Each packet is less than 255 bytes
+    return b'OggS' + b'\x00\x02' + b'\x00' * 8 + b'\x01\x00\x00\x00' + b'\x00' * 8 + bytes([len(packets)]) + segment_table + b''.join(packets)
+
+
+def test_id3v2_3_tags(tmp_path):
+    audio_path = tmp_path / 'song.mp3'
+    audio_path.write_bytes(makeID3v2([ (b'TIT2', 'Title', 'latin-1'), (b'TPE1', 'Artist', 'utf-16'), (b'TALB', 'Album', 'latin-1'),
+                                       (b'TYER', '2004', 'latin-1'), (b'TRCK', '3/12', 'latin-1'), (b'TCON', '(17)', 'latin-1') ]) + MP3_FRAME)
+    assert bfr.readAudioTags(audio_path) == { 'title' : 'Title', 'artist' : 'Artist', 'album' : 'Album', 'date' : '2004',
+                                              'track' : '3/12', 'genre' : 'Rock' }
+
+
+def test_id3v2_4_tags(tmp_path):
+    audio_path = tmp_path / 'song.mp3'
+    audio_path.write_bytes(makeID3v2([ (b'TIT2', 'Tïtle', 'utf-8'), (b'TPE2', 'Album Artist', 'utf-16-be'), (b'TDRC', '2010-05-01', 'utf-8') ], 4) + MP3_FRAME)
+    assert bfr.readAudioTags(audio_path) == { 'title' : 'Tïtle', 'album_artist' : 'Album Artist', 'date' : '2010-05-01' }
+
+
+def test_id3v1_tags_at_end_of_file(tmp_path):
+    audio_path = tmp_path / 'song.mp3'
+    audio_path.write_bytes(MP3_FRAME + makeID3v1('Title', 'Artist', 'Album', '1999', 7, 13))
+    assert bfr.readAudioTags(audio_path) == { 'title' : 'Title', 'artist' : 'Artist', 'album' : 'Album', 'date' : '1999',
+                                              'track' : '7', 'genre' : 'Pop' }
+
+
+def test_id3v2_tags_used_before_id3v1_tags(tmp_path):
+    audio_path = tmp_path / 'song.mp3'
+    audio_path.write_bytes(makeID3v2([ (b'TIT2', 'New Title', 'latin-1') ]) + MP3_FRAME + makeID3v1('Old Title', '', '', '1999', 1, 0))
+    assert bfr.readAudioTags(audio_path) == { 'title' : 'New Title' }
+
+
+def test_flac_tags(tmp_path):
+    audio_path = tmp_path / 'song.flac'
+    stream_info = b'\x00' + (34).to_bytes(3, 'big') + b'\x00' * 34
+    comments = makeVorbisComments([ 'TITLE=Title', 'ALBUMARTIST=Album Artist', 'TRACKNUMBER=5', 'title=Second Title' ])
+    audio_path.write_bytes(b'fLaC' + stream_info + bytes([0x80 | 4]) + len(comments).to_bytes(3, 'big') + comments)
+    assert bfr.readAudioTags(audio_path) == { 'title' : 'Title', 'album_artist' : 'Album Artist', 'track' : '5' }
+
+
+def test_ogg_vorbis_tags(tmp_path):
+    audio_path = tmp_path / 'song.ogg'
+    packets = [ b'\x01vorbis' + b'\x00' * 23, b'\x03vorbis' + makeVorbisComments([ 'ARTIST=Artist', 'DATE=2001' ]) + b'\x01', b'\x05vorbis' ]
+    audio_path.write_bytes(makeOggPage(packets))
+    assert bfr.readAudioTags(audio_path) == { 'artist' : 'Artist', 'date' : '2001' }
+
+
+def test_ogg_opus_tags(tmp_path):
+    audio_path = tmp_path / 'song.opus'
+    packets = [ b'OpusHead' + b'\x00' * 11, b'OpusTags' + makeVorbisComments([ 'GENRE=Jazz' ]), b'\x00' ]
+    audio_path.write_bytes(makeOggPage(packets))
+    assert bfr.readAudioTags(audio_path) == { 'genre' : 'Jazz' }
+
+
+def test_not_supported_audio(tmp_path):
+    audio_path = tmp_path / 'song.wav'
+    audio_path.write_bytes(b'RIFF\x00\x00\x00\x00WAVEfmt ')
+    assert bfr.readAudioTags(audio_path) == None
+
+
+def test_tag_numbers():
+    assert bfr.getTagNumber('2004-05-01') == 2004
+    assert bfr.getTagNumber(' 3/12') == 3
+    assert bfr.getTagNumber('Unknown') == None
+    assert bfr.getTagNumber(None) == None
+
+
+def test_audio_tags_read_when_used(make_file):
+    audio = make_file('song.mp3', makeID3v2([ (b'TIT2', 'Title', 'latin-1'), (b'TYER', '2004', 'latin-1'), (b'TRCK', '3/12', 'latin-1') ]) + MP3_FRAME * 4)
+    assert audio[bfr.FILE_META_AUDIO_TITLE] == 'Title'
+    assert audio[bfr.FILE_META_AUDIO_YEAR] == 2004
+    assert audio[bfr.FILE_META_AUDIO_TRACK] == 3
@@ -0,0 +1,79 @@
+### Contents search results cached in the meta data cache file between runs. (getCachedContentsResults, updateContentsCache, getCachedFileContentsSearchResults)
+import os
+
+import pytest
+
+import batch_file_renamer as bfr
+
+
+def compileContentsSearch(match_contents, match_options = ()):
+    edit_details = { bfr.EDIT_TYPE : bfr.ADD, bfr.MATCH_FILE_CONTENTS : { bfr.TEXT : match_contents, bfr.OPTIONS : list(match_options) },
+                     bfr.INSERT_FILE_NAME : { bfr.TEXT : 'New', bfr.PLACEMENT : (bfr.START, bfr.OF_FILE_NAME) } }
+    return bfr.compilePreset(edit_details)[bfr.COMPILED_PRESET]
+
+
+def getGroupsText(contents_results):
+    return { file_path : (contents_list_index, [ contents_match.groups_text for contents_match in compiled_match_contents_data ])
+             for file_path, (contents_list_index, compiled_match_contents_data) in contents_results.items() }
+
+
+def failContentsSearch(*args):
+    pytest.fail('File contents searched again instead of using the cache')
+
+
+def test_cached_results_restored(make_file):
+    file = make_file('file.txt', 'Version 1.2')
+    file_path, file_stat = file[bfr.FILE_META_PATH], os.stat(file[bfr.FILE_META_PATH])
+    bfr.updateContentsCache([ (file_path, file_stat, 'search key', 0, [ bfr.ContentsMatch(('1.2', '1', None)) ]) ])
+    
+    contents_results = bfr.getCachedContentsResults([file], [file_stat], 'search key')
+    assert getGroupsText(contents_results) == { file_path : (0, [ ('1.2', '1', None) ]) }
+    assert contents_results[file_path][1][0].group(1) == '1'
+    assert bfr.getCachedContentsResults([file], [file_stat], 'other search key') == {}
+
+
+def test_changed_file_not_used_from_cache(make_file):
+    file = make_file('file.txt', 'Some text.')
+    file_path = file[bfr.FILE_META_PATH]
+    bfr.updateContentsCache([ (file_path, os.stat(file_path), 'search key', -1, []) ])
+    
+    file_path.write_text('Some new text.', encoding='utf-8')
+    assert bfr.getCachedContentsResults([file], [os.stat(file_path)], 'search key') == {}
+
+
+def test_search_key_changes_with_search():
+    compiled = compileContentsSearch(['hello'])
+    assert compiled.contents_search_key == compileContentsSearch(['hello']).contents_search_key
+    assert compiled.contents_search_key != compileContentsSearch(['Hello']).contents_search_key
+    assert compiled.contents_search_key != compileContentsSearch(['hello'], [bfr.NO_MATCH_CASE]).contents_search_key
+
+
+def test_searched_file_cached(make_file, monkeypatch):
+    file = make_file('file.txt', 'Say hello, then goodbye.')
+    compiled = compileContentsSearch(['goodbye', 'hello'], [bfr.MATCH_ALL_INDEXES])
+    assert bfr.getCachedFileContentsSearchResults(compiled, file) == (1, [])
+    assert bfr.saveSearchedFileContents()
+    assert bfr.contents_cache_updates == []
+    
+    monkeypatch.setattr(bfr, 'getFileContentsSearchResultsInProcess', failContentsSearch)
+    assert bfr.getCachedFileContentsSearchResults(compileContentsSearch(['goodbye', 'hello'], [bfr.MATCH_ALL_INDEXES]), file) == (1, [])
+
+
+def test_regex_matches_cached(make_file, monkeypatch):
+    file = make_file('file.txt', 'Version 1.2\nVersion 3.4')
+    compiled = compileContentsSearch([r'Version (\d)\.(\d)'], [bfr.REGEX, bfr.REGEX_GROUP])
+    contents_list_index, compiled_match_contents_data = bfr.getCachedFileContentsSearchResults(compiled, file)
+    bfr.saveSearchedFileContents()
+    
+    monkeypatch.setattr(bfr, 'getFileContentsSearchResultsInProcess', failContentsSearch)
+    cached_index, cached_match_contents_data = bfr.getCachedFileContentsSearchResults(compiled, file)
+    assert cached_index == contents_list_index == 0 and compiled_match_contents_data
+    assert [ match.groups_text for match in cached_match_contents_data ] == [ match.groups_text for match in compiled_match_contents_data ]
+
+
+def test_unreadable_file_not_cached(make_file, monkeypatch):
+    file = make_file('file.txt', 'Some text.')
+    monkeypatch.setattr(bfr, 'getFileContentsSearchResultsInProcess', lambda *args: (-2, []))
+    assert bfr.getCachedFileContentsSearchResults(compileContentsSearch(['text']), file) == (-2, [])
+    assert bfr.contents_cache_updates == []
+    assert not bfr.saveSearchedFileContents()
@@ -0,0 +1,37 @@
+### File contents searched ahead of renaming in a pool of processes. (searchFilesContents)
+import pytest
+
+import batch_file_renamer as bfr
+
+
+@pytest.fixture
+def contents_search_pool(monkeypatch):
+    monkeypatch.setattr(bfr, 'contents_search_workers', 2)
+    monkeypatch.setattr(bfr, 'contents_search_min_files', 2)
+
+
+def compileContentsSearch(match_contents, match_options = ()):
+    edit_details = { bfr.EDIT_TYPE : bfr.ADD, bfr.MATCH_FILE_CONTENTS : { bfr.TEXT : match_contents, bfr.OPTIONS : list(match_options) },
+                     bfr.INSERT_FILE_NAME : { bfr.TEXT : 'New', bfr.PLACEMENT : (bfr.START, bfr.OF_FILE_NAME) } }
+    return bfr.compilePreset(edit_details)[bfr.COMPILED_PRESET]
+
+
+def test_same_as_searching_each_file(make_file, contents_search_pool):
+    files = [ make_file(f'file {i}.txt', text) for i, text in enumerate([ 'one', 'two', 'one two', 'three', '', 'TWO' ]) ]
+    compiled = compileContentsSearch(['two', 'one'])
+    bfr.searchFilesContents(compiled, files)
+    
+    assert compiled.contents_results == { file[bfr.FILE_META_PATH] : bfr.getFileContentsSearchResults(file[bfr.FILE_META_PATH], ['two', 'one'], [], [])
+                                          for file in files }
+    assert len(bfr.contents_cache_updates) == len(files) - 1 # Empty file couldn't be read
+
+
+def test_file_types_sent_to_processes(make_file, contents_search_pool):
+    files = [ make_file('file 1.txt', 'text'), make_file('file 2.txt', 'text') ]
+    files[0].sniffed_types = ('image',)
+    compiled = compileContentsSearch(['text'])
+    bfr.searchFilesContents(compiled, files)
+    
+    assert compiled.contents_results[files[0][bfr.FILE_META_PATH]] == (-1, []) # Skipped, not a text file
+    assert compiled.contents_results[files[1][bfr.FILE_META_PATH]] == (0, [])
+    assert files[1].extractors == set() # No meta data read
@@ -0,0 +1,53 @@
+### Estimated totals of a whole run from a random sample of files. (getEstimateTotal)
+import math
+
+import pytest
+
+import batch_file_renamer as bfr
+
+
+def test_matched_count_wilson_interval():
+    estimate, low, high = bfr.getEstimateTotal(50, 100, 10 ** 9)
+    assert estimate == 5 * 10 ** 8
+    assert low / 10 ** 9 == pytest.approx(0.4038, abs=0.0001)
+    assert high / 10 ** 9 == pytest.approx(0.5962, abs=0.0001)
+
+
+def test_no_matches_sampled_can_still_match():
+    estimate, low, high = bfr.getEstimateTotal(0, 100, 10000)
+    assert (estimate, low) == (0, 0)
+    assert 300 < high < 400
+
+
+def test_all_sampled_matched_stays_in_range():
+    estimate, low, high = bfr.getEstimateTotal(20, 20, 1000)
+    assert (estimate, high) == (1000, 1000)
+    assert low < 1000
+
+
+def test_more_files_sampled_narrows_interval():
+    estimate, low, high = bfr.getEstimateTotal(10, 100, 1000)
+    estimate_more, low_more, high_more = bfr.getEstimateTotal(50, 500, 1000)
+    assert estimate == estimate_more == 100
+    assert low < low_more and high_more < high
+
+
+def test_every_file_sampled_is_exact():
+    assert bfr.getEstimateTotal(37, 100, 100) == (37, 37, 37)
+    assert bfr.getEstimateTotal([ 0.5, 1.5, 1.0 ], 3, 3) == (3.0, 3.0, 3.0)
+    assert bfr.getEstimateTotal(1, 1, 1) == (1, 1, 1)
+
+
+def test_values_mean_interval():
+    estimate, low, high = bfr.getEstimateTotal([ 1.0, 2.0, 3.0, 4.0 ], 4, 10 ** 6)
+    margin = 1.96 * math.sqrt((5 / 3) / 4) * math.sqrt((10 ** 6 - 4) / (10 ** 6 - 1))
+    assert estimate == pytest.approx(2.5 * 10 ** 6)
+    assert low == pytest.approx((2.5 - margin) * 10 ** 6)
+    assert high == pytest.approx((2.5 + margin) * 10 ** 6)
+
+
+def test_values_never_below_zero():
+    estimate, low, high = bfr.getEstimateTotal([ 0.0, 0.0, 0.0, 10.0 ], 4, 1000)
+    assert low == 0
+    assert estimate == pytest.approx(2500)
+    assert high > estimate
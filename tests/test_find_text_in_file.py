@@ -0,0 +1,65 @@
+### File contents searched a piece of the file at a time. (findTextInFile)
+import pytest
+
+import batch_file_renamer as bfr
+
+CHUNK_SIZE = 1048576 # Characters read at a time by findTextInFile
+
+
+@pytest.mark.parametrize('text_start', [ CHUNK_SIZE - 6, CHUNK_SIZE - 3, CHUNK_SIZE - 1, CHUNK_SIZE, 2 * CHUNK_SIZE - 2 ])
+def test_text_found_across_chunks(tmp_path, text_start):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_text('x' * text_start + 'needle' + 'x' * 10, encoding='utf-8')
+    assert bfr.findTextInFile(file_path, ['needle']) == [True]
+    assert bfr.findTextInFile(file_path, ['needles', 'xneedlex'], find_all=True) == [False, True]
+
+
+def test_text_found_across_chunks_no_match_case(tmp_path):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_text('x' * (CHUNK_SIZE - 2) + 'NeEdLe', encoding='utf-8')
+    assert bfr.findTextInFile(file_path, ['needle'], no_match_case=True) == [True]
+    assert bfr.findTextInFile(file_path, ['needle']) == [False]
+
+
+def test_text_found_across_chunks_utf_16(tmp_path):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_bytes(('é' * (CHUNK_SIZE - 2) + 'café').encode('utf-16'))
+    assert bfr.findTextInFile(file_path, ['éécafé'], text_encoding='utf-16') == [True]
+
+
+def test_find_all(tmp_path):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_text('one two' + 'x' * CHUNK_SIZE + 'three', encoding='utf-8')
+    assert bfr.findTextInFile(file_path, ['three', 'two', 'four', 'one'], find_all=True) == [True, True, False, True]
+
+
+def test_first_text_found_in_list_order(tmp_path):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_text('one two' + 'x' * CHUNK_SIZE + 'three', encoding='utf-8')
+    texts_found = bfr.findTextInFile(file_path, ['four', 'three', 'two', 'one'])
+    assert texts_found[:3] == [False, True, True]
+    assert texts_found.index(True) == 1
+
+
+def test_stop_reading_once_text_found(tmp_path):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_bytes(b'one two' + b'x' * CHUNK_SIZE + b'\xff\xfe not utf-8')
+    assert bfr.findTextInFile(file_path, ['one', 'two']) == [True, False]
+    assert bfr.findTextInFile(file_path, ['one', 'two'], find_all=True) == [True, True]
+    assert bfr.findTextInFile(file_path, ['one', 'three'], find_all=True) == False # Read to the end
+
+
+def test_empty_file(tmp_path):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_bytes(b'')
+    assert bfr.findTextInFile(file_path, ['text']) == False
+
+
+def test_regex_matches_in_whole_file(tmp_path):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_text('x' * (CHUNK_SIZE - 3) + 'Version 12.5', encoding='utf-8')
+    assert bfr.getFileContentsSearchResults(file_path, [r'ersion \d+\.\d', 'x'], [bfr.REGEX], []) == (0, [])
+    contents_list_index, compiled_match_contents_data = bfr.getFileContentsSearchResults(file_path, [r'VERSION (\d+)'],
+                                                            [bfr.REGEX, bfr.NO_MATCH_CASE, bfr.REGEX_GROUP], [bfr.REGEX])
+    assert contents_list_index == 0
+    assert [ re_match.group(1) for re_match in compiled_match_contents_data ] == ['12']
@@ -0,0 +1,78 @@
+### FULL_MATCH (and EXTENSION ignore) lists looked up by file name instead of compared one text at a time. (indexTextList)
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+import batch_file_renamer as bfr
+
+
+def makePreset(match_texts, match_options, ignore_texts = None, ignore_options = (), insert_texts = 'New'):
+    edit_details = { bfr.EDIT_TYPE : bfr.ADD, bfr.MATCH_FILE_NAME : { bfr.TEXT : match_texts, bfr.OPTIONS : list(match_options) },
+                     bfr.INSERT_FILE_NAME : { bfr.TEXT : insert_texts, bfr.PLACEMENT : (bfr.START, bfr.OF_FILE_NAME) } }
+    if ignore_texts:
+        edit_details[bfr.IGNORE_FILE_NAME] = { bfr.TEXT : ignore_texts, bfr.OPTIONS : list(ignore_options) }
+    return edit_details
+
+
+### Compile a preset twice, with and without looking up full matches.
+###     --> Returns a [Tuple] of two CompiledPreset
+def compileWithAndWithoutIndex(edit_details):
+    with_index = bfr.compilePreset(dict(edit_details))[bfr.COMPILED_PRESET]
+    without_index = bfr.compilePreset(dict(edit_details))[bfr.COMPILED_PRESET]
+    without_index.match_file_name_index, without_index.ignore_file_name_index = None, None
+    return with_index, without_index
+
+
+def getSearchResults(compiled, file_name):
+    searchable_match_file_name, searchable_ignore_file_name = bfr.getSearchData(compiled, Path(file_name))
+    search_index, edit_extension, compiled_match_data = bfr.getFileNameSearchResults(compiled, searchable_match_file_name)
+    if search_index == -1:
+        compiled_match_data = [] # Not used when there's no match
+    ignore_match = bfr.getFileNameIgnoreResults(compiled, searchable_ignore_file_name) if compiled.ignore_file_name_list else False
+    return search_index, edit_extension, compiled_match_data, ignore_match
+
+
+def test_index_keeps_every_list_index():
+    assert bfr.indexTextList(['a', 'b', 'a', '']) == { 'a' : [0, 2], 'b' : [1], '' : [3] }
+
+
+@pytest.mark.parametrize('match_options', [ [bfr.FULL_MATCH], [bfr.FULL_MATCH, bfr.NO_MATCH_CASE], [bfr.FULL_MATCH, bfr.MATCH_ALL_INDEXES],
+                                            [bfr.FULL_MATCH, bfr.NO_MATCH_CASE, bfr.SAME_MATCH_INDEX], [bfr.FULL_MATCH, bfr.EXTENSION],
+                                            [bfr.FULL_MATCH, bfr.EXTENSION, bfr.NO_MATCH_CASE] ])
+def test_full_match_same_with_index(match_options):
+    rng = random.Random(str(match_options))
+    names = [ 'One.txt', 'one.txt', 'TWO.TXT', 'two.txt', 'three.md', '.txt', '.TXT', '.md' ]
+    match_texts = [ 'one.txt', 'TWO.TXT', 'one.txt', '.txt', '.MD' ]
+    edit_details = makePreset(match_texts, match_options, [ 'three.md', 'ONE.TXT', '.txt' ], [bfr.FULL_MATCH, bfr.NO_MATCH_CASE])
+    with_index, without_index = compileWithAndWithoutIndex(edit_details)
+    assert with_index.match_file_name_index != None
+
+    for file_name in names + [ rng.choice(names[:5]).replace('o', 'O') for n in range(20) ]:
+        assert getSearchResults(with_index, file_name) == getSearchResults(without_index, file_name), file_name
+
+
+@pytest.mark.parametrize('ignore_options', [ [bfr.FULL_MATCH], [bfr.FULL_MATCH, bfr.NO_MATCH_CASE], [bfr.FULL_MATCH, bfr.MATCH_ALL_IGNORE_INDEXES],
+                                             [bfr.EXTENSION], [bfr.EXTENSION, bfr.NO_MATCH_CASE] ])
+def test_ignore_full_match_same_with_index(ignore_options):
+    edit_details = makePreset('', [], [ 'skip.txt', '.TXT', 'SKIP.md', '.md' ], ignore_options)
+    with_index, without_index = compileWithAndWithoutIndex(edit_details)
+    assert with_index.ignore_file_name_index != None
+
+    for file_name in [ 'skip.txt', 'Skip.TXT', 'SKIP.md', 'keep.md', 'keep.txt', 'keep.TXT', 'keep' ]:
+        assert getSearchResults(with_index, file_name) == getSearchResults(without_index, file_name), file_name
+
+
+def test_same_match_index_rename(tmp_path, monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda *args: '')
+    files_path = tmp_path / 'files'
+    files_path.mkdir()
+    for file_name in [ 'One.txt', 'TWO.txt', 'three.txt' ]:
+        (files_path / file_name).write_text('')
+    edit_details = makePreset([ 'two.txt', 'one.txt' ], [bfr.FULL_MATCH, bfr.NO_MATCH_CASE, bfr.SAME_MATCH_INDEX], insert_texts=[ 'B ', 'A ' ])
+
+    files_meta = bfr.getFileMetaData([str(files_path)])
+    bfr.startingFileRenameProcedure(files_meta, edit_details)
+
+    assert sorted(os.listdir(files_path)) == [ 'A One.txt', 'B TWO.txt', 'three.txt' ]
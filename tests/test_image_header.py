@@ -0,0 +1,98 @@
+### Images read without ffprobe. (readImageHeader, getExifDateTaken, getImageMetaData)
+import struct
+from datetime import datetime
+
+import batch_file_renamer as bfr
+
+
+### EXIF data (little endian TIFF header) with only an Exif IFD pointer and a DateTimeOriginal tag.
+def makeExif(date_text = '2021:05:04 03:02:01'):
+    exif_ifd_offset = 8 + 2 + 12 + 4
+    date_offset = exif_ifd_offset + 2 + 12 + 4
+    exif = b'II*\x00' + struct.pack('<I', 8)
+    exif += struct.pack('<H', 1) + struct.pack('<HHII', 0x8769, 4, 1, exif_ifd_offset) + struct.pack('<I', 0)
+    exif += struct.pack('<H', 1) + struct.pack('<HHII', 0x9003, 2, 20, date_offset) + struct.pack('<I', 0)
+    return exif + date_text.encode('ascii') + b'\x00'
+
+
+def makePngChunk(chunk_type, chunk_data):
+    return struct.pack('>I', len(chunk_data)) + chunk_type + chunk_data + b'\x00\x00\x00\x00' # CRC isn't checked
+
+
+def makePng(width, height, bit_depth, exif = None):
+    png = b'\x89PNG\r\n\x1a\n' + makePngChunk(b'IHDR', struct.pack('>IIBBBBB', width, height, bit_depth, 2, 0, 0, 0))
+    if exif:
+        png += makePngChunk(b'eXIf', exif)
+    return png + makePngChunk(b'IDAT', b'\x00' * 16) + makePngChunk(b'IEND', b'')
+
+
+def makeJpeg(width, height, exif = None):
+    jpeg = b'\xff\xd8'
+    if exif:
+        app1 = b'Exif\x00\x00' + exif
+        jpeg += b'\xff\xe1' + struct.pack('>H', len(app1) + 2) + app1
+    jpeg += b'\xff\xdb' + struct.pack('>H', 4) + b'\x00\x00' # A segment that's skipped
+    jpeg += b'\xff\xc0' + struct.pack('>HBHHB', 11, 8, height, width, 1) + b'\x01\x11\x00'
+    return jpeg + b'\xff\xda' + struct.pack('>H', 2) + b'\xff\xd9'
+
+
+def test_png_header(tmp_path):
+    image_path = tmp_path / 'image.png'
+    image_path.write_bytes(makePng(640, 480, 16))
+    assert bfr.readImageHeader(image_path) == ('png', 'PNG (Portable Network Graphics) image', 480, 640, 16, None)
+
+
+def test_png_exif_date_taken(tmp_path):
+    image_path = tmp_path / 'image.png'
+    image_path.write_bytes(makePng(640, 480, 8, makeExif()))
+    assert bfr.readImageHeader(image_path, True)[5] == datetime(2021, 5, 4, 3, 2, 1).timestamp()
+    assert bfr.readImageHeader(image_path, False)[5] == None
+
+
+def test_jpeg_header_and_exif(tmp_path):
+    image_path = tmp_path / 'image.jpg'
+    image_path.write_bytes(makeJpeg(1920, 1080, makeExif('2019:12:31 23:59:59')))
+    assert bfr.readImageHeader(image_path, True) == ('mjpeg', 'Motion JPEG', 1080, 1920, 8, datetime(2019, 12, 31, 23, 59, 59).timestamp())
+
+
+def test_jpeg_without_frame_header(tmp_path):
+    image_path = tmp_path / 'image.jpg'
+    image_path.write_bytes(b'\xff\xd8\xff\xda' + struct.pack('>H', 2) + b'\xff\xd9')
+    assert bfr.readImageHeader(image_path) == None
+
+
+def test_gif_header(tmp_path):
+    image_path = tmp_path / 'image.gif'
+    image_path.write_bytes(b'GIF89a' + struct.pack('<HHBBB', 320, 200, 0xF7, 0, 0) + b'\x3b')
+    assert bfr.readImageHeader(image_path) == ('gif', 'CompuServe GIF (Graphics Interchange Format)', 200, 320, 8, None)
+
+
+def test_bmp_header_top_down(tmp_path):
+    image_path = tmp_path / 'image.bmp'
+    image_path.write_bytes(b'BM' + b'\x00' * 12 + struct.pack('<IiiHH', 40, 100, -50, 1, 24) + b'\x00' * 24)
+    assert bfr.readImageHeader(image_path) == ('bmp', 'BMP (Windows and OS/2 bitmap)', 50, 100, 8, None)
+
+
+def test_webp_extended_header(tmp_path):
+    image_path = tmp_path / 'image.webp'
+    vp8x = b'\x00\x00\x00\x00' + (800 - 1).to_bytes(3, 'little') + (600 - 1).to_bytes(3, 'little')
+    image_path.write_bytes(b'RIFF' + struct.pack('<I', 4 + 8 + len(vp8x)) + b'WEBP' + b'VP8X' + struct.pack('<I', len(vp8x)) + vp8x)
+    assert bfr.readImageHeader(image_path) == ('webp', 'WebP', 600, 800, 8, None)
+
+
+def test_not_an_image(tmp_path):
+    image_path = tmp_path / 'image.png'
+    image_path.write_bytes(b'Not an image at all, only text.')
+    assert bfr.readImageHeader(image_path) == None
+
+
+def test_exif_unknown_date():
+    assert bfr.getExifDateTaken(makeExif('0000:00:00 00:00:00')) == None
+
+
+def test_image_meta_data_read_when_used(make_file):
+    image = make_file('image.png', makePng(64, 32, 8))
+    assert image[bfr.FILE_META_WIDTH] == 64
+    assert image[bfr.FILE_META_HEIGHT] == 32
+    assert image[bfr.FILE_META_FORMAT] == 'png'
+    assert bfr.META_EXTRACTOR_STREAM in image.extractors
@@ -0,0 +1,82 @@
+### Extra meta data cached in a SQLite file between runs. (openMetaDataCache, getCachedFileMetaData, updateMetaDataCache)
+import os
+
+import pytest
+
+import batch_file_renamer as bfr
+
+
+def readFileMeta(file):
+    return bfr.FileMeta(file.root, file.name, os.stat(file[bfr.FILE_META_PATH]))
+
+
+def test_cached_meta_data_restored(make_file):
+    file = make_file('file.txt', 'Some text.')
+    file.addExtractors({bfr.META_EXTRACTOR_TYPE, bfr.META_EXTRACTOR_STREAM})
+    file.sniffed_types = ('image',)
+    file.updateExtraMeta({ bfr.FILE_META_TYPE : bfr.TYPE_IMAGE, bfr.FILE_META_MIME : 'image/png', bfr.FILE_META_WIDTH : 64 })
+    assert bfr.updateMetaDataCache([ (file, os.stat(file[bfr.FILE_META_PATH])) ])
+    
+    cached_file = readFileMeta(file)
+    assert bfr.getCachedFileMetaData([cached_file], [os.stat(file[bfr.FILE_META_PATH])], {bfr.META_EXTRACTOR_TYPE})
+    assert cached_file.extractors == {bfr.META_EXTRACTOR_TYPE, bfr.META_EXTRACTOR_STREAM}
+    assert cached_file.sniffed_types == ('image',)
+    assert cached_file.extra_meta == { bfr.FILE_META_TYPE : bfr.TYPE_IMAGE, bfr.FILE_META_MIME : 'image/png', bfr.FILE_META_WIDTH : 64 }
+
+
+def test_changed_file_not_used_from_cache(make_file, monkeypatch):
+    monkeypatch.setattr(bfr, 'meta_data_cache_hits', 0)
+    monkeypatch.setattr(bfr, 'meta_data_cache_misses', 0)
+    file = make_file('file.txt', 'Some text.')
+    file.addExtractors({bfr.META_EXTRACTOR_TYPE})
+    file.updateExtraMeta({ bfr.FILE_META_TYPE : bfr.TYPE_TEXT })
+    bfr.updateMetaDataCache([ (file, os.stat(file[bfr.FILE_META_PATH])) ])
+    
+    file_path = file[bfr.FILE_META_PATH]
+    file_path.write_text('Some more text.', encoding='utf-8')
+    changed_file = readFileMeta(file)
+    bfr.getCachedFileMetaData([changed_file], [os.stat(file_path)], {bfr.META_EXTRACTOR_TYPE})
+    assert changed_file.extractors == set()
+    assert changed_file.extra_meta == None
+    
+    # Same size, only modified time changed.
+    bfr.updateMetaDataCache([ (file, os.stat(file_path)) ])
+    os.utime(file_path, ns=(os.stat(file_path).st_atime_ns, os.stat(file_path).st_mtime_ns + 10 ** 9))
+    touched_file = readFileMeta(file)
+    bfr.getCachedFileMetaData([touched_file], [os.stat(file_path)], {bfr.META_EXTRACTOR_TYPE})
+    assert touched_file.extractors == set()
+    assert (bfr.meta_data_cache_hits, bfr.meta_data_cache_misses) == (0, 2)
+
+
+def test_meta_data_read_when_used_is_cached(make_file, monkeypatch):
+    file = make_file('file.txt', 'Some text.')
+    assert file[bfr.FILE_META_TYPE] == bfr.TYPE_TEXT
+    assert bfr.saveMissingFileMetaData()
+    assert bfr.meta_data_cache_updates == []
+    
+    def getExtraFileMetaData(*args):
+        pytest.fail('Meta data read again instead of using the cache')
+    monkeypatch.setattr(bfr, 'getExtraFileMetaData', getExtraFileMetaData)
+    cached_file = readFileMeta(file)
+    assert cached_file[bfr.FILE_META_TYPE] == bfr.TYPE_TEXT
+    assert cached_file[bfr.FILE_META_MIME] == 'text/plain'
+
+
+def test_excess_cached_files_removed(make_file, monkeypatch):
+    files = [ make_file(f'file {i}.txt', str(i)) for i in range(3) ]
+    bfr.updateMetaDataCache([ (file, os.stat(file[bfr.FILE_META_PATH])) for file in files ])
+    bfr.meta_data_cache_db.close()
+    
+    monkeypatch.setattr(bfr, 'meta_data_cache_db', None)
+    monkeypatch.setattr(bfr, 'meta_data_cache_max_files', 1)
+    assert bfr.openMetaDataCache().execute('SELECT COUNT(*) FROM file_meta').fetchone() == (1,)
+
+
+def test_rebuild_meta_data_cache(make_file, monkeypatch):
+    file = make_file('file.txt', 'Some text.')
+    bfr.updateMetaDataCache([ (file, os.stat(file[bfr.FILE_META_PATH])) ])
+    bfr.meta_data_cache_db.close()
+    
+    monkeypatch.setattr(bfr, 'meta_data_cache_db', None)
+    monkeypatch.setattr(bfr, 'rebuild_meta_data_cache', True)
+    assert bfr.openMetaDataCache().execute('SELECT COUNT(*) FROM file_meta').fetchone() == (0,)
@@ -0,0 +1,83 @@
+### Meta data searches compiled once per preset give the same results as matching each meta data dict. (compileMetaSearches, getMetaSearchResults)
+from datetime import datetime
+
+import pytest
+
+import batch_file_renamer as bfr
+
+FILES = [
+    { bfr.FILE_META_SIZE : 500, bfr.FILE_META_MODIFIED : datetime(2021, 8, 15, 12, 30, 5).timestamp(), bfr.FILE_META_CREATED : datetime(2020, 1, 2, 3, 4, 5).timestamp(),
+      bfr.FILE_META_TYPE : bfr.TYPE_TEXT, bfr.FILE_META_MIME : 'text/plain', bfr.FILE_META_FORMAT : None, bfr.FILE_META_HEIGHT : None, bfr.FILE_META_LENGTH : None,
+      bfr.FILE_META_AUDIO_YEAR : None, bfr.FILE_META_AUDIO_TITLE : None, bfr.FILE_META_DATE_TAKEN : None },
+    { bfr.FILE_META_SIZE : 3 * 1048576 + 7 * 1024 + 100, bfr.FILE_META_MODIFIED : datetime(2022, 8, 1).timestamp(), bfr.FILE_META_CREATED : datetime(2022, 7, 31).timestamp(),
+      bfr.FILE_META_TYPE : bfr.TYPE_IMAGE, bfr.FILE_META_MIME : 'image/png', bfr.FILE_META_FORMAT : 'png', bfr.FILE_META_HEIGHT : 1080, bfr.FILE_META_LENGTH : None,
+      bfr.FILE_META_AUDIO_YEAR : None, bfr.FILE_META_AUDIO_TITLE : None, bfr.FILE_META_DATE_TAKEN : datetime(2022, 7, 30, 10).timestamp() },
+    { bfr.FILE_META_SIZE : 5 * 1048576, bfr.FILE_META_MODIFIED : datetime(2019, 3, 3).timestamp(), bfr.FILE_META_CREATED : datetime(2019, 3, 3).timestamp(),
+      bfr.FILE_META_TYPE : bfr.TYPE_AUDIO, bfr.FILE_META_MIME : 'audio/mpeg', bfr.FILE_META_FORMAT : 'mp3', bfr.FILE_META_HEIGHT : None, bfr.FILE_META_LENGTH : 185.5,
+      bfr.FILE_META_AUDIO_YEAR : 2004, bfr.FILE_META_AUDIO_TITLE : 'Hello World', bfr.FILE_META_DATE_TAKEN : None },
+]
+
+# (Meta list, options, search index of each file in FILES) The indexes are the results of matching before meta searches were compiled.
+META_SEARCHES = [
+    ( [ { bfr.FILE_META_TYPE : bfr.EXACT_MATCH, bfr.DATA : bfr.TYPE_TEXT } ], [], (0, -1, -1) ),
+    ( [ { bfr.FILE_META_TYPE : bfr.SKIP_EXACT_MATCH, bfr.DATA : bfr.TYPE_TEXT } ], [], (-1, 0, 0) ),
+    ( [ bfr.TYPE_IMAGE, bfr.TYPE_AUDIO ], [], (-1, 0, 1) ),
+    ( [ 'image/', 'audio/' ], [], (-1, 0, 1) ),
+    ( [ { bfr.FILE_META_MIME : bfr.LOOSE_MATCH, bfr.DATA : 'TEXT' } ], [bfr.NO_MATCH_CASE], (0, -1, -1) ),
+    ( [ { bfr.FILE_META_MIME : bfr.LOOSE_MATCH, bfr.DATA : 'TEXT' } ], [], (-1, -1, -1) ),
+    ( [ { bfr.FILE_META_FORMAT : bfr.EXACT_MATCH, bfr.DATA : ('png', 'mp3') } ], [], (-1, 0, 0) ),
+    ( [ { bfr.FILE_META_AUDIO_TITLE : bfr.LOOSE_MATCH, bfr.DATA : 'world' } ], [bfr.NO_MATCH_CASE], (0, 0, 0) ),
+    ( [ { bfr.FILE_META_AUDIO_TITLE : bfr.SKIP_LOOSE_MATCH, bfr.DATA : 'World' } ], [], (0, 0, -1) ),
+    ( [ { bfr.FILE_META_SIZE : bfr.LESS_THAN, bfr.KB : 1 } ], [], (0, -1, -1) ),
+    ( [ { bfr.FILE_META_SIZE : bfr.MORE_THAN, bfr.MB : 1 } ], [], (-1, 0, 0) ),
+    ( [ { bfr.FILE_META_SIZE : bfr.EXACT_MATCH, bfr.MB : 3, bfr.KB : 7 } ], [], (-1, 0, -1) ),
+    ( [ { bfr.FILE_META_SIZE : bfr.EXACT_MATCH, bfr.BYTES : 500 } ], [], (0, -1, -1) ),
+    ( [ { bfr.FILE_META_SIZE : bfr.LOOSE_MATCH, bfr.MB : 5 } ], [], (-1, -1, 0) ),
+    ( [ { bfr.FILE_META_SIZE : bfr.SKIP_LOOSE_MATCH, bfr.MB : 5 } ], [], (-1, -1, -1) ),
+    ( [ { bfr.FILE_META_SIZE : bfr.EXACT_MATCH, bfr.IN_BYTES_ONLY : 500 } ], [], (0, 0, 0) ),
+    ( [ { bfr.FILE_META_HEIGHT : bfr.MORE_THAN, bfr.DATA : 720 } ], [], (0, -1, 0) ),
+    ( [ { bfr.FILE_META_HEIGHT : bfr.LESS_THAN, bfr.DATA : 720 } ], [], (-1, 0, -1) ),
+    ( [ { bfr.FILE_META_HEIGHT : bfr.EXACT_MATCH, bfr.DATA : (720, 1080) } ], [], (-1, 0, -1) ),
+    ( [ { bfr.FILE_META_MODIFIED : bfr.EXACT_MATCH, bfr.YEAR : 2021, bfr.MONTH : 8 } ], [], (0, -1, -1) ),
+    ( [ { bfr.FILE_META_MODIFIED : bfr.EXACT_MATCH, bfr.YEAR : (2021, 2022) } ], [], (0, 0, -1) ),
+    ( [ { bfr.FILE_META_MODIFIED : bfr.SKIP_EXACT_MATCH, bfr.YEAR : 2021 } ], [], (-1, 0, 0) ),
+    ( [ { bfr.FILE_META_CREATED : bfr.BEFORE, bfr.YEAR : 2021 } ], [], (0, 0, 0) ),
+    ( [ { bfr.FILE_META_CREATED : bfr.AFTER, bfr.YEAR : 2021 } ], [], (-1, -1, -1) ),
+    ( [ { bfr.FILE_META_MODIFIED : bfr.WITHIN_THE_PAST, bfr.YEAR : 1 } ], [], (-1, -1, -1) ),
+    ( [ { bfr.FILE_META_MODIFIED : bfr.OLDER_THAN, bfr.YEAR : 2 } ], [], (0, 0, 0) ),
+    ( [ { bfr.FILE_META_DATE_TAKEN : bfr.EXACT_MATCH, bfr.YEAR : 2022, bfr.MONTH : 7, bfr.DAY : 30 } ], [], (-1, 0, -1) ),
+    ( [ { bfr.FILE_META_AUDIO_YEAR : bfr.EXACT_MATCH, bfr.YEAR : 2004 } ], [], (-1, -1, -1) ),
+    ( [ { bfr.FILE_META_LENGTH : bfr.MORE_THAN, bfr.MINUTE : 3 } ], [], (-1, -1, 0) ),
+    ( [ { bfr.FILE_META_LENGTH : bfr.LESS_THAN, bfr.MINUTE : 3 } ], [], (-1, -1, -1) ),
+    ( [ { bfr.FILE_META_TYPE : bfr.EXACT_MATCH, bfr.DATA : bfr.TYPE_IMAGE }, { bfr.FILE_META_SIZE : bfr.MORE_THAN, bfr.MB : 1 } ], [bfr.MATCH_ALL_INDEXES], (-1, 1, -1) ),
+    ( [ { bfr.FILE_META_TYPE : bfr.EXACT_MATCH, bfr.DATA : bfr.TYPE_IMAGE }, { bfr.FILE_META_SIZE : bfr.MORE_THAN, bfr.MB : 1 } ], [], (-1, 0, 1) ),
+    ( [ { bfr.FILE_META_TYPE : bfr.EXACT_MATCH, bfr.DATA : bfr.TYPE_IMAGE }, { bfr.FILE_META_SIZE : bfr.MORE_THAN, bfr.MB : 1 } ], [bfr.SAME_MATCH_INDEX], (-1, 0, 1) ),
+    ( [ { bfr.FILE_META_TYPE : bfr.EXACT_MATCH, bfr.DATA : bfr.TYPE_TEXT }, { bfr.FILE_META_SIZE : bfr.LESS_THAN, bfr.MB : 1, bfr.OPERATOR : bfr.AND },
+        { bfr.FILE_META_MIME : bfr.LOOSE_MATCH, bfr.DATA : 'audio' } ], [], (0, -1, 2) ),
+    ( [ { bfr.FILE_META_TYPE : bfr.EXACT_MATCH, bfr.DATA : bfr.TYPE_TEXT, bfr.OPERATOR : bfr.OR }, { bfr.FILE_META_FORMAT : bfr.EXACT_MATCH, bfr.DATA : 'mp3' } ],
+      [bfr.MATCH_ALL_INDEXES], (-1, -1, -1) ),
+]
+
+
+@pytest.mark.parametrize('match_file_meta_list, match_file_meta_options, search_indexes', META_SEARCHES)
+def test_compiled_meta_searches(match_file_meta_list, match_file_meta_options, search_indexes):
+    meta_searches = bfr.compileMetaSearches(match_file_meta_list, match_file_meta_options)
+    assert tuple( bfr.getMetaSearchResults(file, meta_searches, match_file_meta_options) for file in FILES ) == search_indexes
+
+
+@pytest.mark.parametrize('match_file_meta_list, match_file_meta_options, search_indexes', META_SEARCHES)
+def test_compiled_preset_meta_searches(match_file_meta_list, match_file_meta_options, search_indexes):
+    edit_details = { bfr.EDIT_TYPE : bfr.ADD, bfr.MATCH_FILE_META : { bfr.META : match_file_meta_list, bfr.OPTIONS : list(match_file_meta_options) },
+                     bfr.INSERT_FILE_NAME : { bfr.TEXT : 'New', bfr.PLACEMENT : (bfr.START, bfr.OF_FILE_NAME) } }
+    compiled = bfr.compilePreset(edit_details)[bfr.COMPILED_PRESET]
+    assert tuple( bfr.getMetaSearchResults(file, compiled.meta_searches, compiled.match_file_meta_options, compiled.meta_list_order)
+                  for file in FILES ) == search_indexes
+
+
+def test_match_all_searches_cheapest_meta_data_first():
+    edit_details = { bfr.EDIT_TYPE : bfr.ADD, bfr.INSERT_FILE_NAME : { bfr.TEXT : 'New', bfr.PLACEMENT : (bfr.START, bfr.OF_FILE_NAME) },
+                     bfr.MATCH_FILE_META : { bfr.META : [ { bfr.FILE_META_HEIGHT : bfr.MORE_THAN, bfr.DATA : 720 }, { bfr.FILE_META_TYPE : bfr.EXACT_MATCH, bfr.DATA : bfr.TYPE_IMAGE },
+                                                          { bfr.FILE_META_SIZE : bfr.MORE_THAN, bfr.MB : 1 } ], bfr.OPTIONS : [bfr.MATCH_ALL_INDEXES] } }
+    compiled = bfr.compilePreset(edit_details)[bfr.COMPILED_PRESET]
+    assert compiled.meta_list_order == [2, 1, 0]
+    assert compiled.meta_stat_list == [ compiled.meta_searches[2] ]
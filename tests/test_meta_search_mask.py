@@ -0,0 +1,77 @@
+### Meta data of many files searched at once, one column (numpy array) per meta data. (getMetaSearchMask)
+import random
+import time
+
+import pytest
+
+import batch_file_renamer as bfr
+
+pytest.importorskip('numpy')
+
+HOW_TO_MATCH = [ bfr.EXACT_MATCH, bfr.LOOSE_MATCH, bfr.SKIP_EXACT_MATCH, bfr.SKIP_LOOSE_MATCH, bfr.LESS_THAN, bfr.MORE_THAN, bfr.WITHIN_THE_PAST, bfr.OLDER_THAN ]
+
+
+def makeMetaData(rng):
+    meta_type = rng.choice([ 'size', 'time', 'number' ])
+    if meta_type == 'size':
+        meta_data = { bfr.FILE_META_SIZE : rng.choice(HOW_TO_MATCH) }
+        for size_unit in rng.sample([ bfr.BYTES, bfr.KB, bfr.MB, bfr.GB ], rng.randint(1, 2)):
+            meta_data[size_unit] = rng.choice([ rng.randint(0, 900), (rng.randint(0, 900), rng.randint(0, 900)) ])
+    elif meta_type == 'time':
+        meta_data = { rng.choice([ bfr.FILE_META_MODIFIED, bfr.FILE_META_CREATED, bfr.FILE_META_LENGTH, bfr.FILE_META_DATE_TAKEN ]) : rng.choice(HOW_TO_MATCH) }
+        for time_unit in rng.sample([ bfr.YEAR, bfr.MONTH, bfr.DAY, bfr.HOUR, bfr.MINUTE, bfr.SECOND ], rng.randint(1, 3)):
+            meta_data[time_unit] = rng.choice([ 2020, 2021, 2022, 1, 2 ]) if time_unit == bfr.YEAR else rng.choice([ rng.randint(1, 12), (rng.randint(1, 28), rng.randint(0, 5)) ])
+    elif meta_type == 'number':
+        meta_data = { rng.choice([ bfr.FILE_META_HEIGHT, bfr.FILE_META_WIDTH ]) : rng.choice(HOW_TO_MATCH),
+                      bfr.DATA : rng.choice([ 100, 200, (100, 300), (200, 400, 0) ]) }
+    if rng.random() < 0.5:
+        meta_data[bfr.OPERATOR] = rng.choice([ bfr.AND, bfr.OR ])
+    return meta_data
+
+
+def makeFile(rng, now):
+    file = { bfr.FILE_META_SIZE : rng.choice([ rng.randint(0, 2000), rng.randint(0, 900) * 1024 + rng.randint(0, 1023), rng.randint(0, 5) * 1048576 + rng.randint(0, 1048575) ]),
+             bfr.FILE_META_LENGTH : rng.choice([ None, rng.uniform(0, 8000), rng.randint(0, 100) ]),
+             bfr.FILE_META_TYPE : rng.choice([ bfr.TYPE_TEXT, bfr.TYPE_IMAGE, bfr.TYPE_ARCHIVE, None ]),
+             bfr.FILE_META_MIME : rng.choice([ 'text/plain', 'image/png', 'application/zip', None ]) }
+    for meta_data in [ bfr.FILE_META_MODIFIED, bfr.FILE_META_CREATED, bfr.FILE_META_DATE_TAKEN ]:
+        file[meta_data] = rng.choice([ now - rng.uniform(0, 3 * 31536000), rng.uniform(1577836800, 1672531200), None ])
+    for meta_data in [ bfr.FILE_META_HEIGHT, bfr.FILE_META_WIDTH ]:
+        file[meta_data] = rng.choice([ 100, 200, 300, 400, None, 195, 0 ])
+    for meta_data in [ bfr.FILE_META_FORMAT, bfr.FILE_META_AUDIO_TITLE ]:
+        file[meta_data] = rng.choice([ 'abc', 'ABC', 'hello world', None, 'hex', '' ])
+    return file
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_same_as_searching_each_file(seed):
+    rng = random.Random(seed)
+    now = time.time()
+    masks_compared = 0
+    for n in range(200):
+        match_file_meta_list = [ makeMetaData(rng) for i in range(rng.randint(1, 4)) ]
+        match_file_meta_options = rng.sample([ bfr.MATCH_ALL_INDEXES, bfr.SAME_MATCH_INDEX, bfr.NO_MATCH_CASE ], rng.randint(0, 3))
+        meta_searches = bfr.compileMetaSearches(match_file_meta_list, match_file_meta_options)
+        files = [ makeFile(rng, now) for i in range(20) ]
+        
+        keep_files = bfr.getMetaSearchMask(files, meta_searches, match_file_meta_options)
+        if keep_files is None:
+            continue # Searched one file at a time instead
+        masks_compared += 1
+        assert list(keep_files) == [ bfr.getMetaSearchResults(file, meta_searches, match_file_meta_options) > -1 for file in files ], match_file_meta_list
+    
+    assert masks_compared > 50
+
+
+def test_match_all_in_cheapest_order():
+    match_file_meta_list = [ { bfr.FILE_META_HEIGHT : bfr.MORE_THAN, bfr.DATA : 150 }, { bfr.FILE_META_SIZE : bfr.LESS_THAN, bfr.KB : 1 } ]
+    meta_searches = bfr.compileMetaSearches(match_file_meta_list, [bfr.MATCH_ALL_INDEXES])
+    files = [ { bfr.FILE_META_HEIGHT : 200, bfr.FILE_META_SIZE : 10 }, { bfr.FILE_META_HEIGHT : 100, bfr.FILE_META_SIZE : 10 },
+              { bfr.FILE_META_HEIGHT : 200, bfr.FILE_META_SIZE : 5000 }, { bfr.FILE_META_HEIGHT : None, bfr.FILE_META_SIZE : 10 } ]
+    keep_files = bfr.getMetaSearchMask(files, meta_searches, [bfr.MATCH_ALL_INDEXES], [1, 0])
+    assert list(keep_files) == [ bfr.getMetaSearchResults(file, meta_searches, [bfr.MATCH_ALL_INDEXES], [1, 0]) > -1 for file in files ]
+
+
+def test_text_meta_data_not_searched_in_columns():
+    meta_searches = bfr.compileMetaSearches([ { bfr.FILE_META_FORMAT : bfr.LOOSE_MATCH, bfr.DATA : 'png' } ], [])
+    assert bfr.getMetaSearchMask([ { bfr.FILE_META_FORMAT : 'png' } ], meta_searches, []) is None
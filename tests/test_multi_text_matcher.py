@@ -0,0 +1,89 @@
+### Large MATCH_FILE_NAME and IGNORE_FILE_NAME lists searched all at once. (MultiTextMatcher)
+import random
+from pathlib import Path
+
+import pytest
+
+import batch_file_renamer as bfr
+
+
+def makePreset(match_texts, match_options, ignore_texts = None, ignore_options = ()):
+    edit_details = { bfr.EDIT_TYPE : bfr.ADD, bfr.MATCH_FILE_NAME : { bfr.TEXT : match_texts, bfr.OPTIONS : list(match_options) },
+                     bfr.INSERT_FILE_NAME : { bfr.TEXT : 'New', bfr.PLACEMENT : (bfr.START, bfr.OF_FILE_NAME) } }
+    if ignore_texts:
+        edit_details[bfr.IGNORE_FILE_NAME] = { bfr.TEXT : ignore_texts, bfr.OPTIONS : list(ignore_options) }
+    return edit_details
+
+
+### Compile a preset twice, with and without searching the lists all at once.
+###     --> Returns a [Tuple] of two CompiledPreset
+def compileWithAndWithoutMatcher(edit_details, monkeypatch):
+    monkeypatch.setattr(bfr, 'multi_text_search_min_list_size', 1)
+    with_matcher = bfr.compilePreset(dict(edit_details))[bfr.COMPILED_PRESET]
+    monkeypatch.setattr(bfr, 'multi_text_search_min_list_size', 10 ** 9)
+    without_matcher = bfr.compilePreset(dict(edit_details))[bfr.COMPILED_PRESET]
+    return with_matcher, without_matcher
+
+
+def getSearchResults(compiled, file_name):
+    searchable_match_file_name, searchable_ignore_file_name = bfr.getSearchData(compiled, Path(file_name))
+    search_index, edit_extension, compiled_match_data = bfr.getFileNameSearchResults(compiled, searchable_match_file_name)
+    compiled_match_data = [ match.span() if isinstance(match, bfr.re.Match) else match for match in compiled_match_data ]
+    ignore_match = bfr.getFileNameIgnoreResults(compiled, searchable_ignore_file_name) if compiled.ignore_file_name_list else False
+    return search_index, edit_extension, compiled_match_data, ignore_match
+
+
+def test_overlapping_texts():
+    matcher = bfr.MultiTextMatcher(['he', 'she', 'his', 'hers', 'x'])
+    assert matcher.search('ushers') == {0, 1, 3}
+    assert matcher.search('this') == {2}
+    assert matcher.search('') == set()
+
+
+def test_empty_text_always_found():
+    matcher = bfr.MultiTextMatcher(['', 'abc', ''])
+    assert matcher.search('xyz') == {0, 2}
+    assert matcher.search('xabcx') == {0, 1, 2}
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_same_as_searching_each_text(seed):
+    rng = random.Random(seed)
+    text_list = [ ''.join( rng.choice('abcA.') for n in range(rng.randint(1, 4)) ) for i in range(200) ]
+    matcher = bfr.MultiTextMatcher(text_list)
+    for n in range(300):
+        file_name = ''.join( rng.choice('abcA. ') for n in range(rng.randint(0, 20)) )
+        assert matcher.search(file_name) == { i for i, text in enumerate(text_list) if text in file_name }
+
+
+@pytest.mark.parametrize('match_options', [ [], [bfr.NO_MATCH_CASE], [bfr.MATCH_ALL_INDEXES], [bfr.SEARCH_FROM_RIGHT, bfr.MATCH_LIMIT, 1],
+                                            [bfr.EXTENSION], [bfr.EXTENSION, bfr.NO_MATCH_CASE], [bfr.REGEX], [bfr.REGEX, bfr.NO_MATCH_CASE] ])
+def test_file_name_search_same_with_matcher(match_options, monkeypatch):
+    rng = random.Random(str(match_options))
+    if bfr.REGEX in match_options:
+        match_texts = [ r'(\d+)x', 'ab', r'^Ba', r'c\.txt$', r'(?i)AB', 'q(u|v)' ]
+    elif bfr.EXTENSION in match_options:
+        match_texts = [ '.txt', 'TXT', '.md', '.tar.gz', '.gz' ]
+    else:
+        match_texts = [ 'ab', 'Ab', 'b', 'abc', 'x', '' ] if bfr.MATCH_ALL_INDEXES not in match_options else [ 'ab', 'b' ]
+    ignore_texts = [ 'zz', 'Q' ]
+    edit_details = makePreset(match_texts, match_options, ignore_texts, [bfr.NO_MATCH_CASE])
+    with_matcher, without_matcher = compileWithAndWithoutMatcher(edit_details, monkeypatch)
+    assert with_matcher.match_file_name_matcher and not without_matcher.match_file_name_matcher
+
+    for n in range(300):
+        file_name = ''.join( rng.choice('abABcxz1Qq ') for n in range(rng.randint(1, 10)) ) + rng.choice(['.txt', '.TXT', '.md', '.tar.gz', ''])
+        assert getSearchResults(with_matcher, file_name) == getSearchResults(without_matcher, file_name), file_name
+
+
+@pytest.mark.parametrize('ignore_options', [ [], [bfr.NO_MATCH_CASE], [bfr.MATCH_ALL_IGNORE_INDEXES], [bfr.REGEX] ])
+def test_ignore_file_name_same_with_matcher(ignore_options, monkeypatch):
+    rng = random.Random(str(ignore_options))
+    ignore_texts = [ 'ab', 'B', r'\d+' if bfr.REGEX in ignore_options else 'c1', 'zz' ]
+    edit_details = makePreset('', [], ignore_texts, ignore_options)
+    with_matcher, without_matcher = compileWithAndWithoutMatcher(edit_details, monkeypatch)
+    assert with_matcher.ignore_file_name_matcher and not without_matcher.ignore_file_name_matcher
+
+    for n in range(300):
+        file_name = ''.join( rng.choice('abABcz1 ') for n in range(rng.randint(1, 10)) ) + '.txt'
+        assert getSearchResults(with_matcher, file_name) == getSearchResults(without_matcher, file_name), file_name
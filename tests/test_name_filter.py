@@ -0,0 +1,42 @@
+### Files that will never be renamed found by name alone, before reading any extra meta data. (isSkippedByName, getFileMetaData)
+import pytest
+
+import batch_file_renamer as bfr
+
+
+def compileNameSearch(match_texts, match_options = (), ignore_texts = None):
+    edit_details = { bfr.EDIT_TYPE : bfr.ADD, bfr.MATCH_FILE_NAME : { bfr.TEXT : match_texts, bfr.OPTIONS : list(match_options) },
+                     bfr.INSERT_FILE_NAME : { bfr.TEXT : [bfr.FILE_META_TYPE], bfr.OPTIONS : [bfr.INSERT_META_DATA], bfr.PLACEMENT : (bfr.START, bfr.OF_FILE_NAME) } }
+    if ignore_texts:
+        edit_details[bfr.IGNORE_FILE_NAME] = { bfr.TEXT : ignore_texts, bfr.OPTIONS : [] }
+    return edit_details, bfr.compilePreset(dict(edit_details))[bfr.COMPILED_PRESET]
+
+
+def test_skipped_by_name():
+    edit_details, compiled = compileNameSearch(['.txt'], [bfr.EXTENSION], ['skip'])
+    assert compiled.name_search_needed
+    assert [ bfr.isSkippedByName(compiled, file_name) for file_name in [ 'a.txt', 'b.md', 'skip.txt', 'c.TXT' ] ] == [ False, True, True, True ]
+
+
+def test_dropped_files_skipped_by_name_not_read(make_file, monkeypatch):
+    if not bfr.filetype_installed:
+        pytest.skip('filetype not installed')
+    files = [ make_file('a.txt', 'text'), make_file('b.md', 'text'), make_file('skip.txt', 'text') ]
+    edit_details, compiled = compileNameSearch(['.txt'], [bfr.EXTENSION], ['skip'])
+    
+    files_read = []
+    getExtraFileMetaData = bfr.getExtraFileMetaData
+    def countFilesRead(file, extractors, *args):
+        if extractors - file.extractors:
+            files_read.append(file.name)
+        return getExtraFileMetaData(file, extractors, *args)
+    monkeypatch.setattr(bfr, 'getExtraFileMetaData', countFilesRead)
+    monkeypatch.setattr(bfr, 'meta_data_workers', 1)
+    
+    (files_meta,) = bfr.getFileMetaData([ str(file[bfr.FILE_META_PATH]) for file in files ], None, '', bfr.getExtraMetaNeeded(edit_details), None,
+                                     lambda files: [ not bfr.isSkippedByName(compiled, file.name) for file in files ])
+    assert [ file.name for file in files_meta ] == [ 'a.txt', 'b.md', 'skip.txt' ]
+    assert files_read == ['a.txt']
+    
+    assert files_meta[1][bfr.FILE_META_TYPE] == bfr.TYPE_TEXT # Still read if used
+    assert files_read == [ 'a.txt', 'b.md' ]
@@ -0,0 +1,60 @@
+### Text encodings found before searching a file's contents, binary files skipped. (getTextFileEncoding)
+import codecs
+
+import pytest
+
+import batch_file_renamer as bfr
+
+BINARY_DATA = b'\xff\xd8\xff\xe0' + bytes(range(1, 9)) * 100
+
+
+@pytest.mark.parametrize('file_data, text_encoding', [
+    (codecs.BOM_UTF8 + 'Café'.encode('utf-8'), 'utf-8-sig'),
+    ('Hello World'.encode('utf-16'), 'utf-16'),
+    (codecs.BOM_UTF16_BE + 'Hello World'.encode('utf-16-be'), 'utf-16'),
+    ('Hello World'.encode('utf-32'), 'utf-32'),
+    (codecs.BOM_UTF32_BE + 'Hello World'.encode('utf-32-be'), 'utf-32'),
+    (b'Plain ascii text.\r\n', 'utf-8'),
+    ('Café, naïve, 日本語'.encode('utf-8'), 'utf-8'),
+    ('Café “quoted” – text.'.encode('cp1252'), 'cp1252'),
+    (b'Caf\xe9 \x81 text that is not cp1252.', 'latin-1'),
+    (b'', 'utf-8'),
+    (b'Text with a null\x00 byte.', None),
+    (BINARY_DATA, None),
+])
+def test_text_encoding(tmp_path, file_data, text_encoding):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_bytes(file_data)
+    assert bfr.getTextFileEncoding(file_path) == text_encoding
+
+
+def test_character_cut_off_at_end_of_sample(tmp_path):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_bytes(b'a' * 8191 + 'é'.encode('utf-8'))
+    assert bfr.getTextFileEncoding(file_path) == 'utf-8'
+
+
+def test_file_types_found_in_header_not_text(tmp_path):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_bytes(b'Looks like text.')
+    assert bfr.getTextFileEncoding(file_path, ('image',)) == None
+
+
+def test_missing_file_left_to_contents_search(tmp_path):
+    assert bfr.getTextFileEncoding(tmp_path / 'missing.txt') == 'utf-8'
+
+
+@pytest.mark.parametrize('file_data', [ 'Say hello, then bye.'.encode('utf-16'), 'Say hello, café.'.encode('cp1252'),
+                                        codecs.BOM_UTF8 + 'Say hello.'.encode('utf-8') ])
+def test_contents_searched_with_text_encoding(tmp_path, file_data):
+    file_path = tmp_path / 'file.txt'
+    file_path.write_bytes(file_data)
+    assert bfr.getFileContentsSearchResults(file_path, ['goodbye', 'hello'], [], []) == (1, [])
+    assert bfr.getFileContentsSearchResults(file_path, ['HELLO'], [bfr.NO_MATCH_CASE], []) == (0, [])
+    assert bfr.getFileContentsSearchResults(file_path, [r'h(el)lo'], [bfr.REGEX], []) == (0, [])
+
+
+def test_binary_files_skipped(tmp_path):
+    file_path = tmp_path / 'file.bin'
+    file_path.write_bytes(BINARY_DATA + b'hello')
+    assert bfr.getFileContentsSearchResults(file_path, ['hello'], [], []) == (-1, [])
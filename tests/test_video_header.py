@@ -0,0 +1,97 @@
+### Videos read without ffprobe. (readVideoHeader, readMp4Header, readMatroskaHeader)
+import struct
+
+import pytest
+
+import batch_file_renamer as bfr
+
+
+def makeAtom(atom_type, atom_data):
+    return struct.pack('>I', len(atom_data) + 8) + atom_type + atom_data
+
+
+### A MP4 file with one H.264 video track of three samples.
+###     (moov_first) Put the "moov" atom before the media data "mdat".
+def makeMp4(width = 1280, height = 720, timescale = 1000, duration = 10000, sample_delta = 40, sample_sizes = (1000, 2000, 3000), moov_first = True):
+    avcc = makeAtom(b'avcC', bytes([1, 66, 0, 30, 0xFF, 0xE0, 0]))
+    sample_entry_data = b'\x00' * 6 + b'\x00\x01' + b'\x00' * 16 + struct.pack('>HH', width, height) + b'\x00' * 50 + avcc
+    stsd = makeAtom(b'stsd', b'\x00' * 4 + struct.pack('>I', 1) + makeAtom(b'avc1', sample_entry_data))
+    stts = makeAtom(b'stts', b'\x00' * 4 + struct.pack('>III', 1, len(sample_sizes), sample_delta))
+    stsz = makeAtom(b'stsz', b'\x00' * 4 + struct.pack('>II', 0, len(sample_sizes)) + b''.join( struct.pack('>I', size) for size in sample_sizes ))
+    stbl = makeAtom(b'stbl', stsd + stts + stsz)
+    mdhd = makeAtom(b'mdhd', b'\x00' * 12 + struct.pack('>II', timescale, duration) + b'\x00' * 4)
+    hdlr = makeAtom(b'hdlr', b'\x00' * 8 + b'vide' + b'\x00' * 12)
+    moov = makeAtom(b'moov', makeAtom(b'trak', makeAtom(b'mdia', mdhd + hdlr + makeAtom(b'minf', stbl))))
+    ftyp = makeAtom(b'ftyp', b'isom\x00\x00\x02\x00isomavc1')
+    mdat = makeAtom(b'mdat', b'\x00' * sum(sample_sizes))
+    return ftyp + moov + mdat if moov_first else ftyp + mdat + moov
+
+
+def makeEbmlElement(element_id, element_data):
+    element_size = len(element_data)
+    size_data = bytes([0x80 | element_size]) if element_size < 127 else (0x4000 | element_size).to_bytes(2, 'big')
+    return element_id.to_bytes((element_id.bit_length() + 7) // 8, 'big') + size_data + element_data
+
+
+### A Matroska file with one video track. The segment's size is unknown, like a live recording.
+def makeMatroska(codec_id = b'V_VP9', track_type = 1, width = 640, height = 360, duration_ms = 5000.0, frame_duration = 40000000):
+    ebml_header = makeEbmlElement(0x1A45DFA3, makeEbmlElement(0x4282, b'webm'))
+    info = makeEbmlElement(0x1549A966, makeEbmlElement(0x2AD7B1, (1000000).to_bytes(3, 'big')) + makeEbmlElement(0x4489, struct.pack('>f', duration_ms)))
+    track_video = makeEbmlElement(0xE0, makeEbmlElement(0xB0, width.to_bytes(2, 'big')) + makeEbmlElement(0xBA, height.to_bytes(2, 'big')))
+    track_entry = makeEbmlElement(0xAE, makeEbmlElement(0xD7, b'\x01') + makeEbmlElement(0x83, bytes([track_type])) + makeEbmlElement(0x86, codec_id)
+                                        + makeEbmlElement(0x23E383, frame_duration.to_bytes(4, 'big')) + track_video)
+    tracks = makeEbmlElement(0x1654AE6B, track_entry)
+    cluster = makeEbmlElement(0x1F43B675, b'\x00' * 8)
+    return ebml_header + b'\x18\x53\x80\x67\x01\xff\xff\xff\xff\xff\xff\xff' + info + tracks + cluster
+
+
+@pytest.mark.parametrize('moov_first', [True, False])
+def test_mp4_header(tmp_path, moov_first):
+    video_path = tmp_path / 'video.mp4'
+    video_path.write_bytes(makeMp4(moov_first=moov_first))
+    assert bfr.readVideoHeader(video_path) == ('h264', 'H.264 / AVC / MPEG-4 AVC / MPEG-4 part 10', 720, 1280, 10.0, 8, 4800, 25.0)
+
+
+def test_mp4_audio_only(tmp_path):
+    video_path = tmp_path / 'audio.m4a'
+    video_path.write_bytes(makeMp4().replace(b'vide', b'soun'))
+    assert bfr.readVideoHeader(video_path) == None
+
+
+def test_mp4_unknown_codec(tmp_path):
+    video_path = tmp_path / 'video.mp4'
+    video_path.write_bytes(makeMp4().replace(b'avc1', b'xxxx', 2))
+    assert bfr.readVideoHeader(video_path) == None
+
+
+def test_matroska_header(tmp_path):
+    video_path = tmp_path / 'video.webm'
+    video_path.write_bytes(makeMatroska())
+    assert bfr.readVideoHeader(video_path) == ('vp9', 'Google VP9', 360, 640, 5.0, None, None, 25.0)
+
+
+def test_matroska_audio_track_first(tmp_path):
+    video_path = tmp_path / 'audio.mka'
+    video_path.write_bytes(makeMatroska(codec_id=b'A_OPUS', track_type=2))
+    assert bfr.readVideoHeader(video_path) == None
+
+
+def test_ebml_variable_integers():
+    assert bfr.readEbmlElements(makeEbmlElement(0x4282, b'webm') + makeEbmlElement(0xB0, b'\x02\x80')) == { 0x4282 : b'webm', 0xB0 : b'\x02\x80' }
+    assert bfr.getEbmlUnsignedInteger(b'\x02\x80') == 640
+    assert bfr.getEbmlUnsignedInteger(b'') == None
+
+
+def test_h264_high_profile_bit_depth():
+    sps = b'\x67\x64\x00\x1f'
+    pps = b'\x68\xee'
+    avcc = bytes([1, 100, 0, 31, 0xFF, 0xE1]) + struct.pack('>H', len(sps)) + sps + b'\x01' + struct.pack('>H', len(pps)) + pps + bytes([0xFD, 0xFA])
+    assert bfr.getVideoCodecBitDepth('h264', avcc) == 10
+    assert bfr.getVideoCodecBitDepth('h264', bytes([1, 66, 0, 30, 0xFF, 0xE0, 0])) == 8
+
+
+def test_video_meta_data_read_when_used(make_file):
+    video = make_file('video.mp4', makeMp4())
+    assert video[bfr.FILE_META_WIDTH] == 1280
+    assert video[bfr.FILE_META_LENGTH] == '10.000000'
+    assert video[bfr.FILE_META_VIDEO_BITRATE] == 4.8